@@ -0,0 +1,95 @@
+"""
+Shared moto setup for the benchmarks.
+
+Creates the orders table with the same keys and indexes as infra/dynamodb.tf.
+"""
+import os
+import sys
+import zlib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../src')))
+
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+os.environ.setdefault('AWS_DEFAULT_REGION', 'eu-west-1')
+
+TABLE_NAME = 'bench-orders-table'
+
+
+def create_orders_table(table_name: str = TABLE_NAME):
+    """Create the orders table inside an active moto mock"""
+    import boto3
+
+    dynamodb = boto3.resource('dynamodb', region_name=os.environ['AWS_DEFAULT_REGION'])
+    return dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[{'AttributeName': 'order_id', 'KeyType': 'HASH'}],
+        AttributeDefinitions=[
+            {'AttributeName': 'order_id', 'AttributeType': 'S'},
+            {'AttributeName': 'customer_id', 'AttributeType': 'S'},
+            {'AttributeName': 'created_at', 'AttributeType': 'S'},
+            {'AttributeName': 'gsi_status', 'AttributeType': 'S'}
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'CustomerIndex',
+                'KeySchema': [
+                    {'AttributeName': 'customer_id', 'KeyType': 'HASH'},
+                    {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            },
+            {
+                'IndexName': 'StatusIndex',
+                'KeySchema': [
+                    {'AttributeName': 'gsi_status', 'KeyType': 'HASH'},
+                    {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+                ],
+                'Projection': {'ProjectionType': 'ALL'}
+            }
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+
+
+def segment_scan(scan, latency: float = 0.0):
+    """Wrap a client scan to behave like a segmented DynamoDB scan.
+
+    moto 4 ignores Segment/TotalSegments and re-reads the whole table for
+    every page, which would swamp what we want to measure. The wrapper reads
+    the table from moto once, splits it by key hash like DynamoDB does and
+    then serves each page in constant time after a simulated network delay.
+    """
+    import time
+
+    items, params = [], {'TableName': TABLE_NAME}
+    while True:
+        response = scan(**params)
+        items.extend(response['Items'])
+        if 'LastEvaluatedKey' not in response:
+            break
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    segments = {}
+
+    def load(total_segments):
+        if total_segments not in segments:
+            segments[total_segments] = [[] for _ in range(total_segments)]
+            for item in items:
+                segments[total_segments][zlib.crc32(item['order_id'].encode()) % total_segments].append(item)
+        return segments[total_segments]
+
+    def wrapper(**params):
+        total_segments = params.get('TotalSegments', 1)
+        items = load(total_segments)[params.get('Segment', 0)]
+        start = int(params.get('ExclusiveStartKey', {}).get('_offset', 0))
+        end = start + params.get('Limit', len(items))
+        if latency:
+            time.sleep(latency)
+
+        response = {'Items': items[start:end], 'Count': len(items[start:end])}
+        if end < len(items):
+            response['LastEvaluatedKey'] = {'_offset': end}
+        return response
+
+    return wrapper
@@ -0,0 +1,89 @@
+"""
+Per-item encode/decode cost of the boto3 TypeSerializer path vs codec.py.
+
+Pure CPU: no table involved, each side converts the same orders between
+Order objects and AttributeValue maps, as the repositories do per item.
+
+Usage:
+    python benchmarks/bench_codec.py --orders 2000 --lines 3 --repeat 5
+"""
+import argparse
+import json
+import time
+from decimal import Decimal
+
+import _moto  # noqa: F401  (puts src/ on sys.path)
+
+from orders.codec import order_to_item, item_to_order
+from orders.models import Order, OrderStatus, OrderItem
+from orders.table import DynamoTable
+from orders.repository import OrderRepository
+
+
+def build_orders(count: int, lines: int) -> list:
+    return [
+        Order(
+            f"order-{i:07d}", f"customer-{i % 500}", Decimal("59.97"), OrderStatus.PENDING,
+            items=[OrderItem(f"prod-{n}", n + 1, Decimal("19.99")) for n in range(lines)]
+        )
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, func, values: list) -> float:
+    """Best wall time in microseconds per value"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for value in values:
+            func(value)
+        best = min(best, time.perf_counter() - start)
+    return best / len(values) * 1e6
+
+
+def run(count: int, lines: int, repeat: int) -> list:
+    orders = build_orders(count, lines)
+    table = DynamoTable(client=None, table_name='unused')
+
+    def boto3_encode(order):
+        return table.serialize(OrderRepository._order_to_item(order))
+
+    def boto3_decode(item):
+        return OrderRepository._item_to_order(table.deserialize(item))
+
+    items = [boto3_encode(order) for order in orders]
+    results = []
+    for name, encode, decode in (
+        ('boto3', boto3_encode, boto3_decode),
+        ('native', order_to_item, item_to_order)
+    ):
+        results.append({
+            'codec': name,
+            'encode_us': round(best_of(repeat, encode, orders), 2),
+            'decode_us': round(best_of(repeat, decode, items), 2)
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--lines', type=int, default=3, help='order lines per order')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.orders, args.lines, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    baseline = results[0]
+    print(f"{'codec':<8} {'encode us':>10} {'decode us':>10} {'encode x':>9} {'decode x':>9}")
+    for row in results:
+        print(f"{row['codec']:<8} {row['encode_us']:>10.2f} {row['decode_us']:>10.2f} "
+              f"{baseline['encode_us'] / row['encode_us']:>8.2f}x {baseline['decode_us'] / row['decode_us']:>8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
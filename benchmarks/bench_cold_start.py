@@ -0,0 +1,120 @@
+"""
+Measure cold-start cost of the Lambda handler in fresh interpreters.
+
+Each run starts a new Python process, imports handler.py the way the Lambda
+runtime does and times the first GET /v1/orders/{id} against a botocore
+Stubber, so no network or moto is involved.
+
+Usage:
+    python benchmarks/bench_cold_start.py --runs 15
+    python benchmarks/bench_cold_start.py --runs 15 --lazy --json > cold_start.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/orders'))
+
+CHILD = r'''
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {src_dir!r})
+import handler
+imported = time.perf_counter()
+
+from botocore.stub import Stubber
+
+repository = handler.get_repository()
+initialized = time.perf_counter()
+
+stub = Stubber(repository.client)
+stub.add_response('get_item', {{'Item': {{
+    'order_id': {{'S': 'order-1'}},
+    'customer_id': {{'S': 'customer-1'}},
+    'status': {{'S': 'PENDING'}},
+    'total_amount': {{'N': '19.99'}},
+    'created_at': {{'S': '2026-01-01T00:00:00'}},
+    'items': {{'L': []}},
+    'version': {{'N': '1'}}
+}}}})
+stub.activate()
+
+event = {{
+    'httpMethod': 'GET',
+    'path': '/v1/orders/order-1',
+    'pathParameters': {{'id': 'order-1'}},
+    'requestContext': {{}}
+}}
+before = time.perf_counter()
+response = handler.lambda_handler(event, None)
+invoked = time.perf_counter()
+assert response['statusCode'] == 200, response
+
+print(json.dumps({{
+    'import_ms': (imported - start) * 1000,
+    'init_ms': (initialized - imported) * 1000,
+    'first_invoke_ms': (invoked - before) * 1000,
+    'total_ms': (invoked - start) * 1000
+}}))
+'''
+
+
+def run_once(lazy: bool) -> dict:
+    env = dict(
+        os.environ,
+        AWS_ACCESS_KEY_ID='testing',
+        AWS_SECRET_ACCESS_KEY='testing',
+        AWS_DEFAULT_REGION='eu-west-1',
+        DYNAMODB_TABLE='bench-orders-table',
+        LOG_LEVEL='WARNING'
+    )
+    if lazy:
+        env.pop('AWS_LAMBDA_FUNCTION_NAME', None)
+    else:
+        # Makes handler.py build the repository at import time, as in Lambda
+        env['AWS_LAMBDA_FUNCTION_NAME'] = 'bench-orders-api'
+
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD.format(src_dir=SRC_DIR)],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(runs: list) -> dict:
+    summary = {}
+    for key in runs[0]:
+        values = sorted(run[key] for run in runs)
+        summary[key] = {
+            'median': round(statistics.median(values), 2),
+            'p90': round(values[int(0.9 * (len(values) - 1))], 2),
+            'min': round(values[0], 2)
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--lazy', action='store_true',
+                        help='do not simulate the Lambda init phase (repository built on first request)')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    runs = [run_once(args.lazy) for _ in range(args.runs)]
+    summary = summarize(runs)
+    if args.json:
+        print(json.dumps({'mode': 'lazy' if args.lazy else 'eager', 'runs': runs, 'summary': summary}, indent=2))
+        return
+
+    print(f"mode: {'lazy' if args.lazy else 'eager'}, {args.runs} fresh interpreters")
+    print(f"{'phase':<16} {'median ms':>10} {'p90 ms':>10} {'min ms':>10}")
+    for phase, stats in summary.items():
+        print(f"{phase:<16} {stats['median']:>10.2f} {stats['p90']:>10.2f} {stats['min']:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Compress GET /v1/orders list responses: CPU spent vs bytes saved.
+
+Encodes listings of several sizes with encoding.dumps and compresses them
+with gzip at a few levels and, when the brotli package is installed, with
+brotli. Sizes include the base64 overhead API Gateway adds to binary bodies.
+
+Usage:
+    python benchmarks/bench_compression.py --sizes 1 10 50 100
+"""
+import argparse
+import base64
+import gzip
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import _moto  # noqa: F401  (puts src/ on sys.path)
+
+from orders import compression
+from orders.encoding import dumps
+from orders.models import Order, OrderStatus, OrderItem
+
+
+def build_body(count: int) -> bytes:
+    orders = [
+        Order(
+            f"order-{i:07d}", f"customer-{i % 500}", Decimal("59.97"), OrderStatus.PENDING,
+            items=[OrderItem(f"prod-{n}", n + 1, Decimal("19.99")) for n in range(3)],
+            created_at=datetime(2026, 1, 1, 12, 0, i % 60)
+        ).to_dict()
+        for i in range(count)
+    ]
+    return dumps({'orders': orders, 'count': count, 'next_token': None}).encode()
+
+
+def codecs() -> list:
+    result = [
+        (f'gzip -{level}', lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0))
+        for level in (1, 6, 9)
+    ]
+    if compression.brotli is not None:
+        result += [
+            (f'br q{quality}', lambda data, quality=quality: compression.brotli.compress(data, quality=quality))
+            for quality in (4, 11)
+        ]
+    return result
+
+
+def best_us(repeat: int, func, data: bytes) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best * 1_000_000
+
+
+def run(sizes: list, repeat: int) -> list:
+    results = []
+    for size in sizes:
+        body = build_body(size)
+        for name, compress in codecs():
+            wire = len(base64.b64encode(compress(body)))
+            results.append({
+                'orders': size,
+                'codec': name,
+                'bytes': len(body),
+                'wire_bytes': wire,
+                'ratio': round(wire / len(body), 3),
+                'us': round(best_us(repeat, compress, body), 1)
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 50, 100])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'orders':>7} {'codec':<9} {'bytes':>8} {'on wire':>8} {'ratio':>6} {'us':>9}")
+    for row in results:
+        print(f"{row['orders']:>7} {row['codec']:<9} {row['bytes']:>8} {row['wire_bytes']:>8} "
+              f"{row['ratio']:>6.3f} {row['us']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
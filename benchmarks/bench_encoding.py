@@ -0,0 +1,85 @@
+"""
+Encode GET /v1/orders list responses with each JSON encoder.
+
+Compares the previous json.dumps(default=str) with encoding.dumps_stdlib
+and, when orjson is installed, encoding.dumps_orjson.
+
+Usage:
+    python benchmarks/bench_encoding.py --sizes 50 500 5000
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+
+import _moto  # noqa: F401  (puts src/ on sys.path)
+
+from orders import encoding
+from orders.models import Order, OrderStatus, OrderItem
+
+
+def build_response(count: int) -> dict:
+    orders = [
+        Order(
+            f"order-{i:07d}", f"customer-{i % 500}", Decimal("59.97"), OrderStatus.PENDING,
+            items=[OrderItem(f"prod-{n}", n + 1, Decimal("19.99")) for n in range(3)],
+            created_at=datetime(2026, 1, 1, 12, 0, 0)
+        ).to_dict()
+        for i in range(count)
+    ]
+    return {'orders': orders, 'count': count, 'next_token': None}
+
+
+def best_ms(repeat: int, func, data: dict) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(sizes: list, repeat: int) -> list:
+    encoders = [
+        ('json default=str', lambda data: json.dumps(data, default=str)),
+        ('stdlib', encoding.dumps_stdlib)
+    ]
+    if encoding.orjson is not None:
+        encoders.append(('orjson', encoding.dumps_orjson))
+
+    results = []
+    for size in sizes:
+        data = build_response(size)
+        for name, dumps in encoders:
+            results.append({
+                'orders': size,
+                'encoder': name,
+                'ms': round(best_ms(repeat, dumps, data), 3),
+                'bytes': len(dumps(data).encode())
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'orders':>7} {'encoder':<18} {'ms':>9} {'bytes':>9} {'speedup':>8}")
+    baseline = {}
+    for row in results:
+        base = baseline.setdefault(row['orders'], row['ms'])
+        print(f"{row['orders']:>7} {row['encoder']:<18} {row['ms']:>9.3f} {row['bytes']:>9} "
+              f"{base / row['ms']:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Revenue by status and by day: Order objects row by row vs a columnar snapshot.
+
+Generates --orders synthetic orders as the pages scan_pages yields, exports
+them with orders.export and compares summing total_amount through
+Order.from_dict (what a scan_orders loop does) with Snapshot.group_by.
+Peak memory of the export is traced with tracemalloc in a second, untimed run.
+
+Needs numpy for the snapshot queries.
+
+Usage:
+    python benchmarks/bench_export.py --orders 1000000 --page-size 500
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+
+import _moto  # noqa: F401  (puts src/ on sys.path)
+
+from orders.analytics import Snapshot
+from orders.export import export_snapshot
+from orders.models import Order
+
+STATUSES = ('PENDING', 'CONFIRMED', 'SHIPPED', 'DELIVERED', 'CANCELLED')
+
+
+def pages(count: int, page_size: int, seed: int):
+    """Pages of EXPORT_FIELDS dicts, generated lazily like a scan"""
+    rng = random.Random(seed)
+    for start in range(0, count, page_size):
+        yield [
+            {
+                'order_id': f"order-{i:08d}",
+                'customer_id': f"customer-{rng.randrange(count // 20 + 1)}",
+                'status': rng.choice(STATUSES),
+                'total_amount': Decimal(rng.randrange(100, 50000)).scaleb(-2),
+                'created_at': f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:00:00"
+            }
+            for i in range(start, min(start + page_size, count))
+        ]
+
+
+def row_by_row(args) -> tuple:
+    by_status, by_day = {}, {}
+    for page in pages(args.orders, args.page_size, args.seed):
+        for item in page:
+            order = Order.from_dict(dict(item, items=[]))
+            by_status[order.status.value] = by_status.get(order.status.value, 0) + order.total_amount
+            day = order.created_at.date().isoformat()
+            by_day[day] = by_day.get(day, 0) + order.total_amount
+    return by_status, by_day
+
+
+def run(args) -> dict:
+    directory = tempfile.mkdtemp()
+    try:
+        path = f"{directory}/snapshot"
+        # Generating the pages is counted in both timings, subtracted below
+        start = time.perf_counter()
+        for _ in pages(args.orders, args.page_size, args.seed):
+            pass
+        generate_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        manifest = export_snapshot(pages(args.orders, args.page_size, args.seed), path)
+        export_s = time.perf_counter() - start - generate_s
+
+        # Separate run: tracemalloc slows allocation-heavy code several times over
+        tracemalloc.start()
+        export_snapshot(pages(args.orders, args.page_size, args.seed), f"{directory}/traced")
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        by_status, by_day = row_by_row(args)
+        rows_s = time.perf_counter() - start - generate_s
+
+        snapshot = Snapshot(path)
+        start = time.perf_counter()
+        status_groups = snapshot.group_by('status')
+        day_groups = snapshot.group_by('day')
+        query_s = time.perf_counter() - start
+
+        assert {k: v['total_amount'] for k, v in status_groups.items()} == by_status
+        assert {k: v['total_amount'] for k, v in day_groups.items()} == by_day
+        size = sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    finally:
+        shutil.rmtree(directory)
+
+    return {
+        'orders': args.orders,
+        'customers': manifest['customers'],
+        'snapshot_mb': round(size / 1e6, 1),
+        'export_s': round(export_s, 2),
+        'export_peak_mb': round(peak / 1e6, 1),
+        'row_by_row_ms': round(rows_s * 1000, 1),
+        'snapshot_ms': round(query_s * 1000, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--orders', type=int, default=1_000_000)
+    parser.add_argument('--page-size', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{result['orders']} orders, {result['customers']} customers, snapshot {result['snapshot_mb']} MB")
+    print(f"export:       {result['export_s']} s, peak {result['export_peak_mb']} MB traced")
+    print(f"row by row:   {result['row_by_row_ms']} ms (status + day)")
+    print(f"group_by:     {result['snapshot_ms']} ms (status + day)")
+
+
+if __name__ == '__main__':
+    main()
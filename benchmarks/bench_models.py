@@ -0,0 +1,115 @@
+"""
+Microbenchmarks for the Order/OrderItem models.
+
+Measures Order.from_dict, Order.to_dict and Order.validate throughput and
+the memory retained per hydrated order, and compares them with the stored
+baseline in benchmarks/baselines/bench_models.json.
+
+Usage:
+    python benchmarks/bench_models.py --orders 1000 --lines 10
+    python benchmarks/bench_models.py --orders 1000 --lines 10 --save-baseline
+"""
+import argparse
+import gc
+import json
+import os
+import time
+import tracemalloc
+from decimal import Decimal
+
+import _moto  # noqa: F401  (puts src/ on sys.path)
+
+from orders.models import Order, OrderStatus, OrderItem
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baselines', 'bench_models.json')
+
+
+def build_dicts(count: int, lines: int) -> list:
+    """Order dicts shaped like the items the repository reads"""
+    return [
+        Order(
+            f"order-{i:07d}", f"customer-{i % 500}", Decimal("59.97"), OrderStatus.PENDING,
+            items=[OrderItem(f"prod-{n}", n + 1, Decimal("19.99")) for n in range(lines)],
+            created_at="2026-01-01T12:00:00.000000"
+        ).to_dict()
+        for i in range(count)
+    ]
+
+
+def ops_per_second(repeat: int, func, values: list) -> float:
+    """Best of `repeat` passes, with the GC off like timeit"""
+    best = float('inf')
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for value in values:
+                func(value)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return len(values) / best
+
+
+def bytes_per_order(dicts: list) -> float:
+    """Memory retained by the hydrated orders, per order"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    orders = [Order.from_dict(data) for data in dicts]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del orders
+    return (after - before) / len(dicts)
+
+
+def run(count: int, lines: int, repeat: int) -> dict:
+    dicts = build_dicts(count, lines)
+    orders = [Order.from_dict(data) for data in dicts]
+    return {
+        'orders': count,
+        'lines': lines,
+        'from_dict_ops': round(ops_per_second(repeat, Order.from_dict, dicts)),
+        'to_dict_ops': round(ops_per_second(repeat, Order.to_dict, orders)),
+        'validate_ops': round(ops_per_second(repeat, Order.validate, orders)),
+        'bytes_per_order': round(bytes_per_order(dicts))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--orders', type=int, default=1000)
+    parser.add_argument('--lines', type=int, default=10, help='order lines per order')
+    parser.add_argument('--repeat', type=int, default=15)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true', help='store this run as the new baseline')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    result = run(args.orders, args.lines, args.repeat)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(result, f, indent=2)
+            f.write('\n')
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{args.orders} orders x {args.lines} lines")
+    print(f"{'metric':<16} {'current':>12} {'baseline':>12} {'change':>8}")
+    for metric in ('from_dict_ops', 'to_dict_ops', 'validate_ops', 'bytes_per_order'):
+        current = result[metric]
+        previous = baseline.get(metric)
+        change = f"{(current / previous - 1) * 100:+.1f}%" if previous else '-'
+        print(f"{metric:<16} {current:>12} {previous if previous else '-':>12} {change:>8}")
+
+
+if __name__ == '__main__':
+    main()
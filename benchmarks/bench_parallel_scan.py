@@ -0,0 +1,72 @@
+"""
+Benchmark OrderRepository.scan_orders against moto for different segment counts.
+
+Usage:
+    python benchmarks/bench_parallel_scan.py --orders 5000 --segments 1 2 4 8 --latency-ms 20
+"""
+import argparse
+import json
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+from _moto import TABLE_NAME, create_orders_table, segment_scan
+
+from moto import mock_dynamodb
+
+from orders.models import Order, OrderStatus
+from orders.repository import OrderRepository
+
+
+def run(orders: int, segments: list, latency_ms: float, page_size: int) -> list:
+    results = []
+    with mock_dynamodb():
+        create_orders_table()
+        repository = OrderRepository(table_name=TABLE_NAME)
+        repository.create_orders([
+            Order(f"order-{i:07d}", f"customer-{i % 500}", Decimal("19.99"), OrderStatus.PENDING)
+            for i in range(orders)
+        ])
+
+        client = repository.table
+        scan = segment_scan(client.scan, latency_ms / 1000)
+        with patch.object(client, 'scan', side_effect=scan):
+            for total_segments in segments:
+                start = time.perf_counter()
+                count = sum(1 for _ in repository.scan_orders(
+                    total_segments=total_segments, page_size=page_size
+                ))
+                elapsed = time.perf_counter() - start
+                results.append({
+                    'segments': total_segments,
+                    'orders': count,
+                    'seconds': round(elapsed, 4),
+                    'orders_per_second': round(count / elapsed, 1)
+                })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--segments', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--latency-ms', type=float, default=20.0,
+                        help='simulated round-trip latency per Scan call')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.orders, args.segments, args.latency_ms, args.page_size)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    baseline = results[0]['seconds']
+    print(f"{'segments':>8} {'orders':>8} {'seconds':>9} {'orders/s':>10} {'speedup':>8}")
+    for row in results:
+        print(f"{row['segments']:>8} {row['orders']:>8} {row['seconds']:>9.3f} "
+              f"{row['orders_per_second']:>10.1f} {baseline / row['seconds']:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Routing microbenchmark: Router.resolve vs a linear scan of route patterns.
+
+The linear scan stands in for an if/elif chain, which tests routes one by
+one. Synthetic tables with more routes show how each lookup scales.
+
+Usage:
+    python benchmarks/bench_router.py --routes 3 30 300
+"""
+import argparse
+import json
+import re
+import time
+
+import _moto  # noqa: F401  (puts src/ on sys.path)
+
+from orders.router import Router
+
+
+def handler(event, params):
+    return params
+
+
+def build_templates(count: int) -> list:
+    templates = ['/v1/orders', '/v1/orders:batch', '/v1/orders/{id}']
+    for i in range(count - len(templates)):
+        templates.append(f'/v1/resource{i}/{{id}}')
+    return templates[:count]
+
+
+def linear_table(templates: list) -> list:
+    table = []
+    for template in templates:
+        pattern = '/'.join(
+            f'(?P<{segment[1:-1]}>[^/]+)' if segment.startswith('{') else re.escape(segment)
+            for segment in template.split('/')
+        )
+        table.append((re.compile(f'^{pattern}$'), template))
+    return table
+
+
+def linear_resolve(table: list, path: str):
+    for pattern, template in table:
+        match = pattern.match(path)
+        if match:
+            return template, match.groupdict()
+    return None
+
+
+def per_call_ns(func, *args, number: int = 50000, repeat: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e9
+
+
+def run(route_counts: list) -> list:
+    results = []
+    for count in route_counts:
+        templates = build_templates(count)
+        router = Router()
+        for template in templates:
+            router.add(template, {'GET': handler})
+        table = linear_table(templates)
+
+        # Worst case for the linear scan: the last registered route
+        path = templates[-1].replace('{id}', 'abc-123')
+        assert router.resolve(path)[0].template == linear_resolve(table, path)[0]
+        results.append({
+            'routes': count,
+            'path': path,
+            'router_path_ns': round(per_call_ns(router.resolve, path)),
+            'router_resource_ns': round(per_call_ns(router.resolve, path, templates[-1])),
+            'linear_ns': round(per_call_ns(linear_resolve, table, path))
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--routes', type=int, nargs='+', default=[3, 30, 300])
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.routes)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'routes':>7} {'router path ns':>15} {'router resource ns':>19} {'linear ns':>10}")
+    for row in results:
+        print(f"{row['routes']:>7} {row['router_path_ns']:>15} {row['router_resource_ns']:>19} {row['linear_ns']:>10}")
+
+
+if __name__ == '__main__':
+    main()
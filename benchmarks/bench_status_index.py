@@ -0,0 +1,158 @@
+"""
+Listing orders of one status: scan + client-side filter vs StatusIndex.
+
+Seeds a moto table where most orders already reached a terminal status
+(left out of the sparse index) and fetches every order in --status both
+ways, page by page through OrderRepository.list_orders_page.
+
+moto reports a flat ConsumedCapacity, so read capacity is estimated from
+the items each call read: ceil(bytes / 4 KB) * 0.5 RCU per page, as for an
+eventually consistent Scan/Query.
+
+Usage:
+    python benchmarks/bench_status_index.py --orders 2000 --open-fraction 0.2 --status PENDING
+"""
+import argparse
+import json
+import math
+import random
+import time
+from decimal import Decimal
+
+from _moto import TABLE_NAME, create_orders_table
+
+from moto import mock_dynamodb
+
+OPEN_STATUSES = ('PENDING', 'CONFIRMED', 'PROCESSING', 'SHIPPED')
+TERMINAL_STATUSES = ('DELIVERED', 'CANCELLED', 'COMPLETED')
+
+
+def item_size(value) -> int:
+    """Approximate DynamoDB size in bytes of an AttributeValue"""
+    kind, inner = next(iter(value.items()))
+    if kind == 'S':
+        return len(inner.encode())
+    if kind == 'N':
+        return len(inner.lstrip('-').replace('.', '')) // 2 + 1
+    if kind == 'L':
+        return 3 + sum(item_size(entry) + 1 for entry in inner)
+    if kind == 'M':
+        return 3 + sum(len(name.encode()) + item_size(entry) + 1 for name, entry in inner.items())
+    return 1
+
+
+class ReadMeter:
+    """Wraps the low-level client to count calls, items and estimated RCU"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.items = 0
+        self.rcu = 0.0
+
+    def wrap(self, method):
+        def call(**params):
+            response = method(**params)
+            items = response.get('Items', [])
+            size = sum(
+                sum(len(name.encode()) + item_size(value) for name, value in item.items())
+                for item in items
+            )
+            self.calls += 1
+            self.items += len(items)
+            self.rcu += max(math.ceil(size / 4096), 1) * 0.5
+            return response
+        return call
+
+
+def seed(repository, count: int, open_fraction: float, rng: random.Random) -> dict:
+    from orders.models import Order, OrderStatus, OrderItem
+
+    counts = {}
+    orders = []
+    for i in range(count):
+        statuses = OPEN_STATUSES if rng.random() < open_fraction else TERMINAL_STATUSES
+        status = rng.choice(statuses)
+        counts[status] = counts.get(status, 0) + 1
+        orders.append(Order(
+            f"order-{i:07d}", f"customer-{i % 500}", Decimal("59.97"), OrderStatus(status),
+            items=[OrderItem(f"prod-{n}", n + 1, Decimal("19.99")) for n in range(3)],
+            created_at=f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:00:00.{i:06d}"
+        ))
+    repository.create_orders(orders)
+    return counts
+
+
+def walk(repository, status: str, page_size: int, use_index: bool) -> int:
+    matched, token = 0, None
+    while True:
+        if use_index:
+            page, token = repository.list_orders_page(limit=page_size, next_token=token, status=status)
+            matched += len(page)
+        else:
+            page, token = repository.list_orders_page(limit=page_size, next_token=token)
+            matched += sum(1 for order in page if order.status.value == status)
+        if not token:
+            return matched
+
+
+def run(args) -> dict:
+    from orders.repository import OrderRepository
+
+    with mock_dynamodb():
+        create_orders_table()
+        repository = OrderRepository(table_name=TABLE_NAME)
+        counts = seed(repository, args.orders, args.open_fraction, random.Random(args.seed))
+
+        meter = ReadMeter()
+        repository.client.scan = meter.wrap(repository.client.scan)
+        repository.client.query = meter.wrap(repository.client.query)
+
+        results = []
+        for name, use_index in (('scan + filter', False), ('StatusIndex', True)):
+            best = float('inf')
+            for _ in range(args.repeat):
+                meter.reset()
+                start = time.perf_counter()
+                matched = walk(repository, args.status, args.page_size, use_index)
+                best = min(best, time.perf_counter() - start)
+            results.append({
+                'path': name,
+                'matched': matched,
+                'calls': meter.calls,
+                'items_read': meter.items,
+                'estimated_rcu': meter.rcu,
+                'ms': round(best * 1000, 1)
+            })
+
+    return {'orders': args.orders, 'statuses': counts, 'status': args.status, 'results': results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--open-fraction', type=float, default=0.2,
+                        help='fraction of orders in a non-terminal status')
+    parser.add_argument('--status', default='PENDING')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    result = run(args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{args.orders} orders, {result['statuses'].get(args.status, 0)} in {args.status}")
+    print(f"{'path':<15} {'matched':>8} {'calls':>6} {'items read':>11} {'est. RCU':>9} {'ms':>9}")
+    for row in result['results']:
+        print(f"{row['path']:<15} {row['matched']:>8} {row['calls']:>6} {row['items_read']:>11} "
+              f"{row['estimated_rcu']:>9.1f} {row['ms']:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
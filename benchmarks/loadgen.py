@@ -0,0 +1,309 @@
+"""
+End-to-end load generator for lambda_handler against a moto table, or
+against the in-memory/SQLite stores (--store) to profile the handler alone.
+
+Builds API Gateway proxy events for a configurable mix of create/get/list/
+update/delete requests, with customers picked from a Zipf distribution
+(--skew 0 is uniform), and invokes handler.lambda_handler in-process at a
+target rate. Reports latency percentiles, throughput and where the time
+went (harness phases and endpoint/repository/DynamoDB breakdown from the
+handler's EMF metrics).
+
+Usage:
+    python benchmarks/loadgen.py --requests 2000 --mix create=20,get=40,list=20,update=10,delete=10
+    python benchmarks/loadgen.py --rate 200 --skew 1.2 --output results/run-a.json
+    python benchmarks/loadgen.py --output results/run-b.json --compare results/run-a.json
+    python benchmarks/loadgen.py --store memory --requests 20000
+"""
+import argparse
+import bisect
+import json
+import os
+import random
+import statistics
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from decimal import Decimal
+from itertools import accumulate
+
+from _moto import TABLE_NAME, create_orders_table
+
+os.environ.setdefault('DYNAMODB_TABLE', TABLE_NAME)
+
+from moto import mock_dynamodb
+
+OPERATIONS = ('create', 'get', 'list', 'update', 'delete')
+STATUSES = ('CONFIRMED', 'PROCESSING', 'SHIPPED', 'DELIVERED')
+
+
+def parse_mix(value: str) -> dict:
+    """Parse "create=20,get=40" into relative weights per operation"""
+    mix = {}
+    for entry in value.split(','):
+        name, _, weight = entry.partition('=')
+        if name.strip() not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}, expected one of {OPERATIONS}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+class EventFactory:
+    """Builds API Gateway proxy events and tracks which orders exist"""
+
+    def __init__(self, customers: int, skew: float, rng: random.Random):
+        self.rng = rng
+        self.customers = [f"customer-{i:05d}" for i in range(customers)]
+        # Zipf-like weights: customer i gets 1 / (i + 1) ** skew of the traffic
+        self._cumulative = list(accumulate(1 / (rank + 1) ** skew for rank in range(customers)))
+        self.orders = defaultdict(list)
+
+    def customer(self) -> str:
+        point = self.rng.random() * self._cumulative[-1]
+        return self.customers[bisect.bisect(self._cumulative, point)]
+
+    def event(self, operation: str) -> tuple:
+        """(operation actually built, event)"""
+        customer_id = self.customer()
+        owned = self.orders[customer_id]
+        if operation in ('get', 'update', 'delete') and not owned:
+            # Nothing to read or change yet for this customer
+            operation = 'create'
+        builder = getattr(self, f'_{operation}')
+        return operation, builder(customer_id, owned)
+
+    def _base(self, method: str, path: str, resource: str, customer_id: str) -> dict:
+        return {
+            'httpMethod': method,
+            'path': path,
+            'resource': resource,
+            'headers': {'Content-Type': 'application/json', 'Authorization': 'Bearer load-test'},
+            'queryStringParameters': None,
+            'pathParameters': None,
+            'body': None,
+            'requestContext': {'authorizer': {'claims': {'sub': customer_id}}}
+        }
+
+    def _create(self, customer_id: str, owned: list) -> dict:
+        lines = [
+            {'product_id': f"prod-{self.rng.randrange(1000)}", 'quantity': self.rng.randint(1, 3),
+             'price': f"{self.rng.randint(100, 9999) / 100:.2f}"}
+            for _ in range(self.rng.randint(1, 5))
+        ]
+        total = sum(float(line['price']) * line['quantity'] for line in lines)
+        event = self._base('POST', '/v1/orders', '/v1/orders', customer_id)
+        event['body'] = json.dumps({'customer_id': customer_id, 'total_amount': round(total, 2), 'items': lines})
+        return event
+
+    def _by_id(self, method: str, customer_id: str, order_id: str) -> dict:
+        event = self._base(method, f'/v1/orders/{order_id}', '/v1/orders/{id}', customer_id)
+        event['pathParameters'] = {'id': order_id}
+        return event
+
+    def _get(self, customer_id: str, owned: list) -> dict:
+        return self._by_id('GET', customer_id, self.rng.choice(owned))
+
+    def _list(self, customer_id: str, owned: list) -> dict:
+        event = self._base('GET', '/v1/orders', '/v1/orders', customer_id)
+        event['queryStringParameters'] = {'customer_id': customer_id, 'limit': '20'}
+        return event
+
+    def _update(self, customer_id: str, owned: list) -> dict:
+        event = self._by_id('PUT', customer_id, self.rng.choice(owned))
+        event['body'] = json.dumps({'status': self.rng.choice(STATUSES)})
+        return event
+
+    def _delete(self, customer_id: str, owned: list) -> dict:
+        order_id = owned.pop(self.rng.randrange(len(owned)))
+        return self._by_id('DELETE', customer_id, order_id)
+
+    def track(self, operation: str, event: dict, response: dict) -> None:
+        """Remember orders the API created so later requests can target them"""
+        if operation == 'create' and response['statusCode'] == 201:
+            order = json.loads(response['body'])
+            self.orders[order['customer_id']].append(order['order_id'])
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: list) -> dict:
+    values = sorted(latencies)
+    return {
+        'count': len(values),
+        'mean_ms': round(statistics.fmean(values), 3) if values else 0.0,
+        'p50_ms': round(percentile(values, 50), 3),
+        'p95_ms': round(percentile(values, 95), 3),
+        'p99_ms': round(percentile(values, 99), 3),
+        'max_ms': round(values[-1], 3) if values else 0.0
+    }
+
+
+def breakdown(emf_lines: list) -> dict:
+    """Mean latency per EMF operation, grouped by layer"""
+    latencies = defaultdict(list)
+    for line in emf_lines:
+        entry = json.loads(line)
+        latencies[entry['Operation']].extend(entry.get('Latency', []))
+    layers = {'endpoint': {}, 'repository': {}, 'dynamodb': {}, 'cache': {}}
+    for operation, values in sorted(latencies.items()):
+        if operation.startswith('DynamoDB.'):
+            layer = 'dynamodb'
+        elif operation.startswith('OrderRepository.'):
+            layer = 'repository'
+        elif operation.startswith('OrderCache.'):
+            layer = 'cache'
+        else:
+            layer = 'endpoint'
+        layers[layer][operation] = {
+            'count': len(values),
+            'mean_ms': round(statistics.fmean(values), 3),
+            'total_ms': round(sum(values), 1)
+        }
+    return layers
+
+
+def run(args) -> dict:
+    from orders import handler
+    from orders.metrics import MetricsRecorder
+    from orders.models import Order, OrderStatus
+
+    rng = random.Random(args.seed)
+    factory = EventFactory(args.customers, args.skew, rng)
+    operations, weights = zip(*args.mix.items())
+    phases = {}
+
+    with mock_dynamodb() if args.store == 'dynamodb' else nullcontext():
+        start = time.perf_counter()
+        if args.store == 'dynamodb':
+            create_orders_table()
+        emf_lines = []
+        handler._metrics = MetricsRecorder('loadgen', write=emf_lines.append)
+        handler.ORDER_STORE = args.store
+        handler._repository = None
+        repository = handler.get_repository()
+        seeded, _ = repository.create_orders([
+            Order(f"seed-{i:07d}", factory.customer(), Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(args.seed_orders)
+        ])
+        for order in seeded:
+            factory.orders[order.customer_id].append(order.order_id)
+        phases['setup_s'] = round(time.perf_counter() - start, 3)
+
+        start = time.perf_counter()
+        for _ in range(args.warmup):
+            operation, event = factory.event(rng.choices(operations, weights)[0])
+            factory.track(operation, event, handler.lambda_handler(event, None))
+        phases['warmup_s'] = round(time.perf_counter() - start, 3)
+        emf_lines.clear()
+
+        latencies, service = defaultdict(list), defaultdict(list)
+        statuses = defaultdict(lambda: defaultdict(int))
+        interval = 1 / args.rate if args.rate else 0.0
+        start = time.perf_counter()
+        for index in range(args.requests):
+            operation, event = factory.event(rng.choices(operations, weights)[0])
+            # Open loop: latency counts from the intended send time, so a
+            # slow request also charges the ones queued behind it
+            scheduled = start + index * interval
+            now = time.perf_counter()
+            if scheduled > now:
+                time.sleep(scheduled - now)
+            sent = time.perf_counter()
+            response = handler.lambda_handler(event, None)
+            done = time.perf_counter()
+
+            factory.track(operation, event, response)
+            latencies[operation].append((done - (scheduled if interval else sent)) * 1000)
+            service[operation].append((done - sent) * 1000)
+            statuses[operation][response['statusCode']] += 1
+        elapsed = time.perf_counter() - start
+        phases['measure_s'] = round(elapsed, 3)
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        'config': {
+            'requests': args.requests, 'rate': args.rate, 'mix': args.mix, 'customers': args.customers,
+            'skew': args.skew, 'seed_orders': args.seed_orders, 'warmup': args.warmup, 'seed': args.seed,
+            'store': args.store, 'codec': handler.DYNAMODB_CODEC
+        },
+        'phases': phases,
+        'throughput_rps': round(args.requests / elapsed, 1),
+        'latency': summarize(all_latencies),
+        'service_time': summarize([value for values in service.values() for value in values]),
+        'operations': {
+            operation: dict(summarize(values), statuses=dict(statuses[operation]))
+            for operation, values in sorted(latencies.items())
+        },
+        'breakdown': breakdown(emf_lines)
+    }
+
+
+def print_report(result: dict, previous: dict = None) -> None:
+    def delta(current, before):
+        return f" ({(current / before - 1) * 100:+.1f}%)" if before else ''
+
+    latency = result['latency']
+    before = (previous or {}).get('latency', {})
+    print(f"throughput: {result['throughput_rps']} req/s"
+          f"{delta(result['throughput_rps'], (previous or {}).get('throughput_rps'))}")
+    print("phases: " + ', '.join(f"{name} {value}" for name, value in result['phases'].items()))
+    print(f"{'operation':<10} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}  statuses")
+    rows = list(result['operations'].items()) + [('all', latency)]
+    for name, stats in rows:
+        statuses = ' '.join(f"{code}x{count}" for code, count in sorted(stats.get('statuses', {}).items()))
+        print(f"{name:<10} {stats['count']:>6} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} "
+              f"{stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}  {statuses}")
+    if before:
+        print("vs previous: " + ', '.join(
+            f"{key} {latency[key]:.3f}{delta(latency[key], before.get(key))}" for key in ('p50_ms', 'p95_ms', 'p99_ms')
+        ))
+    print("mean ms per call:")
+    for layer, operations in result['breakdown'].items():
+        for operation, stats in operations.items():
+            print(f"  {layer:<10} {operation:<40} {stats['mean_ms']:>8.3f} x{stats['count']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--store', choices=('dynamodb', 'memory', 'sqlite'), default='dynamodb',
+                        help='order store behind the handler (dynamodb runs on moto)')
+    parser.add_argument('--rate', type=float, default=0.0, help='target requests per second (0 = as fast as possible)')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix('create=20,get=40,list=20,update=10,delete=10'))
+    parser.add_argument('--customers', type=int, default=200)
+    parser.add_argument('--skew', type=float, default=1.0, help='Zipf exponent for customer popularity (0 = uniform)')
+    parser.add_argument('--seed-orders', type=int, default=1000, help='orders written before the run')
+    parser.add_argument('--warmup', type=int, default=100, help='requests sent before measuring')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--log-level', default='WARNING')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', help='previous results JSON to compare against')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    os.environ['LOG_LEVEL'] = args.log_level
+    result = run(args)
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+            f.write('\n')
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_report(result, previous)
+
+
+if __name__ == '__main__':
+    main()
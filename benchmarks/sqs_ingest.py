@@ -0,0 +1,164 @@
+"""
+Local harness for handler.sqs_handler: fake SQS batches in, partial batch
+failures out.
+
+Generates order payloads (a fraction of them invalid), packs them into SQS
+events like the Lambda event source mapping does and plays the queue: the
+messages reported in batchItemFailures are delivered again, up to
+--max-receive-count times, after which they count as moved to the DLQ.
+Runs against a moto table or the in-memory/SQLite stores (--store).
+
+Usage:
+    python benchmarks/sqs_ingest.py --messages 5000 --batch-size 100 --invalid-fraction 0.02
+    python benchmarks/sqs_ingest.py --store memory --messages 50000
+"""
+import argparse
+import json
+import os
+import random
+import time
+import uuid
+from contextlib import nullcontext
+
+from _moto import TABLE_NAME, create_orders_table
+
+os.environ.setdefault('DYNAMODB_TABLE', TABLE_NAME)
+
+from moto import mock_dynamodb
+
+QUEUE_ARN = 'arn:aws:sqs:eu-west-1:123456789012:orders-ingest'
+
+# Ways a partner payload can be wrong, all rejected by Order validation
+INVALID_PAYLOADS = (
+    lambda payload: 'not json',
+    lambda payload: dict(payload, total_amount=0),
+    lambda payload: {key: value for key, value in payload.items() if key != 'customer_id'},
+    lambda payload: dict(payload, status='LOST'),
+)
+
+
+def generate_payloads(count: int, invalid_fraction: float, rng: random.Random) -> list:
+    """Order payloads as partners send them, some of them invalid"""
+    payloads = []
+    for i in range(count):
+        items = [
+            {'product_id': f'prod-{rng.randrange(1000)}', 'quantity': rng.randint(1, 3), 'price': 19.99}
+            for _ in range(rng.randint(1, 4))
+        ]
+        payload = {
+            'customer_id': f'customer-{rng.randrange(500):05d}',
+            'total_amount': round(sum(item['quantity'] * item['price'] for item in items), 2),
+            'items': items
+        }
+        if rng.random() < invalid_fraction:
+            payload = rng.choice(INVALID_PAYLOADS)(payload)
+        payloads.append(payload)
+    return payloads
+
+
+def message(payload, receive_count: int = 1, message_id: str = None) -> dict:
+    """One SQS record as the event source mapping delivers it"""
+    return {
+        'messageId': message_id or str(uuid.uuid4()),
+        'receiptHandle': uuid.uuid4().hex,
+        'body': payload if isinstance(payload, str) else json.dumps(payload),
+        'attributes': {
+            'ApproximateReceiveCount': str(receive_count),
+            'SentTimestamp': str(int(time.time() * 1000))
+        },
+        'messageAttributes': {},
+        'md5OfBody': '',
+        'eventSource': 'aws:sqs',
+        'eventSourceARN': QUEUE_ARN,
+        'awsRegion': 'eu-west-1'
+    }
+
+
+def sqs_event(records: list) -> dict:
+    return {'Records': records}
+
+
+def run(args) -> dict:
+    from orders import handler
+
+    rng = random.Random(args.seed)
+    queue = [message(payload) for payload in generate_payloads(args.messages, args.invalid_fraction, rng)]
+
+    with mock_dynamodb() if args.store == 'dynamodb' else nullcontext():
+        if args.store == 'dynamodb':
+            create_orders_table()
+        handler.ORDER_STORE = args.store
+        handler._repository = None
+        repository = handler.get_repository()
+
+        invocations, redeliveries, dead_letters = 0, 0, []
+        batch_ms = []
+        start = time.perf_counter()
+        while queue:
+            batch, queue = queue[:args.batch_size], queue[args.batch_size:]
+            sent = time.perf_counter()
+            response = handler.sqs_handler(sqs_event(batch), None)
+            batch_ms.append((time.perf_counter() - sent) * 1000)
+            invocations += 1
+
+            failed = {failure['itemIdentifier'] for failure in response['batchItemFailures']}
+            for record in batch:
+                if record['messageId'] not in failed:
+                    continue
+                receive_count = int(record['attributes']['ApproximateReceiveCount'])
+                if receive_count >= args.max_receive_count:
+                    dead_letters.append(record['messageId'])
+                    continue
+                # Same message id on every delivery, as in SQS
+                queue.append(message(record['body'], receive_count + 1, record['messageId']))
+                redeliveries += 1
+        elapsed = time.perf_counter() - start
+
+        # One segment: moto ignores Segment and would count every order once per segment
+        stored = sum(1 for _ in repository.scan_orders(total_segments=1))
+
+    batch_ms.sort()
+    return {
+        'config': {
+            'messages': args.messages, 'batch_size': args.batch_size, 'invalid_fraction': args.invalid_fraction,
+            'max_receive_count': args.max_receive_count, 'store': args.store, 'seed': args.seed
+        },
+        'invocations': invocations,
+        'redeliveries': redeliveries,
+        'dead_letters': len(dead_letters),
+        'orders_stored': stored,
+        'messages_per_s': round(args.messages / elapsed, 1),
+        'batch_ms': {
+            'p50': round(batch_ms[len(batch_ms) // 2], 2),
+            'max': round(batch_ms[-1], 2)
+        } if batch_ms else {}
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--messages', type=int, default=5000)
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--invalid-fraction', type=float, default=0.02)
+    parser.add_argument('--max-receive-count', type=int, default=3)
+    parser.add_argument('--store', choices=('dynamodb', 'memory', 'sqlite'), default='dynamodb')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--log-level', default='ERROR', help='rejected messages log at WARNING')
+    parser.add_argument('--json', action='store_true', help='print results as JSON')
+    args = parser.parse_args()
+
+    os.environ['LOG_LEVEL'] = args.log_level
+    result = run(args)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"{args.messages} messages in {result['invocations']} batches of up to {args.batch_size} ({args.store})")
+    print(f"stored {result['orders_stored']} orders, {result['redeliveries']} redeliveries, "
+          f"{result['dead_letters']} to the DLQ")
+    print(f"{result['messages_per_s']} messages/s, batch p50 {result['batch_ms'].get('p50')} ms, "
+          f"max {result['batch_ms'].get('max')} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,10 @@ resource "aws_api_gateway_rest_api" "main" {
     types = ["REGIONAL"]
   }
 
+  # Lets the Lambda return gzip/br bodies (isBase64Encoded); request
+  # bodies then also reach the Lambda base64-encoded
+  binary_media_types = ["*/*"]
+
   tags = {
     Name = "${local.resource_prefix}-api"
   }
@@ -34,6 +38,13 @@ resource "aws_api_gateway_resource" "orders" {
   path_part   = "orders"
 }
 
+# /v1/orders:batch resource
+resource "aws_api_gateway_resource" "orders_batch" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.v1.id
+  path_part   = "orders:batch"
+}
+
 # /v1/orders/{id} resource
 resource "aws_api_gateway_resource" "order_id" {
   rest_api_id = aws_api_gateway_rest_api.main.id
@@ -77,6 +88,24 @@ resource "aws_api_gateway_integration" "get_orders" {
   uri                     = aws_lambda_function.orders_api.invoke_arn
 }
 
+# POST /v1/orders:batch
+resource "aws_api_gateway_method" "post_orders_batch" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.orders_batch.id
+  http_method   = "POST"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "post_orders_batch" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.orders_batch.id
+  http_method             = aws_api_gateway_method.post_orders_batch.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.orders_api.invoke_arn
+}
+
 # GET /v1/orders/{id}
 resource "aws_api_gateway_method" "get_order" {
   rest_api_id   = aws_api_gateway_rest_api.main.id
@@ -131,24 +160,68 @@ resource "aws_api_gateway_integration" "delete_order" {
   uri                     = aws_lambda_function.orders_api.invoke_arn
 }
 
+# /v1/customers/{id}/summary resource
+resource "aws_api_gateway_resource" "customers" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.v1.id
+  path_part   = "customers"
+}
+
+resource "aws_api_gateway_resource" "customer_id" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.customers.id
+  path_part   = "{id}"
+}
+
+resource "aws_api_gateway_resource" "customer_summary" {
+  rest_api_id = aws_api_gateway_rest_api.main.id
+  parent_id   = aws_api_gateway_resource.customer_id.id
+  path_part   = "summary"
+}
+
+# GET /v1/customers/{id}/summary
+resource "aws_api_gateway_method" "get_customer_summary" {
+  rest_api_id   = aws_api_gateway_rest_api.main.id
+  resource_id   = aws_api_gateway_resource.customer_summary.id
+  http_method   = "GET"
+  authorization = "COGNITO_USER_POOLS"
+  authorizer_id = aws_api_gateway_authorizer.cognito.id
+}
+
+resource "aws_api_gateway_integration" "get_customer_summary" {
+  rest_api_id             = aws_api_gateway_rest_api.main.id
+  resource_id             = aws_api_gateway_resource.customer_summary.id
+  http_method             = aws_api_gateway_method.get_customer_summary.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.orders_api.invoke_arn
+}
+
 # API Gateway Deployment
 resource "aws_api_gateway_deployment" "main" {
   rest_api_id = aws_api_gateway_rest_api.main.id
 
   triggers = {
     redeployment = sha1(jsonencode([
+      aws_api_gateway_rest_api.main.binary_media_types,
       aws_api_gateway_resource.orders.id,
       aws_api_gateway_resource.order_id.id,
+      aws_api_gateway_resource.orders_batch.id,
+      aws_api_gateway_resource.customer_summary.id,
       aws_api_gateway_method.post_orders.id,
+      aws_api_gateway_method.post_orders_batch.id,
       aws_api_gateway_method.get_orders.id,
       aws_api_gateway_method.get_order.id,
       aws_api_gateway_method.put_order.id,
       aws_api_gateway_method.delete_order.id,
+      aws_api_gateway_method.get_customer_summary.id,
       aws_api_gateway_integration.post_orders.id,
+      aws_api_gateway_integration.post_orders_batch.id,
       aws_api_gateway_integration.get_orders.id,
       aws_api_gateway_integration.get_order.id,
       aws_api_gateway_integration.put_order.id,
       aws_api_gateway_integration.delete_order.id,
+      aws_api_gateway_integration.get_customer_summary.id,
     ]))
   }
 
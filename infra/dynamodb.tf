@@ -2,7 +2,11 @@ resource "aws_dynamodb_table" "orders" {
   name           = "${local.resource_prefix}-orders"
   billing_mode   = var.dynamodb_billing_mode
   hash_key       = "order_id"
-  
+
+  # Feeds the customer summaries (handler.stream_handler)
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+
   attribute {
     name = "order_id"
     type = "S"
@@ -18,6 +22,11 @@ resource "aws_dynamodb_table" "orders" {
     type = "S"
   }
 
+  attribute {
+    name = "gsi_status"
+    type = "S"
+  }
+
   # GSI for querying by customer
   global_secondary_index {
     name            = "CustomerIndex"
@@ -26,6 +35,15 @@ resource "aws_dynamodb_table" "orders" {
     projection_type = "ALL"
   }
 
+  # Sparse GSI for listing by status: gsi_status is only written for
+  # statuses that are indexed (see var.status_index_terminal)
+  global_secondary_index {
+    name            = "StatusIndex"
+    hash_key        = "gsi_status"
+    range_key       = "created_at"
+    projection_type = "ALL"
+  }
+
   # Enable point-in-time recovery
   point_in_time_recovery {
     enabled = var.environment == "prod" ? true : false
@@ -46,3 +64,56 @@ resource "aws_dynamodb_table" "orders" {
     Name = "${local.resource_prefix}-orders"
   }
 }
+
+# Idempotency-Key records for POST /v1/orders: the stored response is
+# replayed to retries until DynamoDB TTL removes it (expires_at)
+resource "aws_dynamodb_table" "idempotency" {
+  name         = "${local.resource_prefix}-idempotency"
+  billing_mode = var.dynamodb_billing_mode
+  hash_key     = "idempotency_key"
+
+  attribute {
+    name = "idempotency_key"
+    type = "S"
+  }
+
+  server_side_encryption {
+    enabled = true
+  }
+
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name = "${local.resource_prefix}-idempotency"
+  }
+}
+
+# Per-customer aggregates (CUSTOMER#<id>) kept from the orders stream, plus
+# one EVENT#<eventID> marker per applied stream record so replays are skipped
+resource "aws_dynamodb_table" "customer_summaries" {
+  name         = "${local.resource_prefix}-customer-summaries"
+  billing_mode = var.dynamodb_billing_mode
+  hash_key     = "pk"
+
+  attribute {
+    name = "pk"
+    type = "S"
+  }
+
+  server_side_encryption {
+    enabled = true
+  }
+
+  # Only the event markers carry expires_at
+  ttl {
+    attribute_name = "expires_at"
+    enabled        = true
+  }
+
+  tags = {
+    Name = "${local.resource_prefix}-customer-summaries"
+  }
+}
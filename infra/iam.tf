@@ -38,16 +38,51 @@ resource "aws_iam_role_policy" "dynamodb_access" {
         Effect = "Allow"
         Action = [
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:PutItem",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
+          "dynamodb:BatchWriteItem",
           "dynamodb:Query",
           "dynamodb:Scan"
         ]
         Resource = [
           aws_dynamodb_table.orders.arn,
-          "${aws_dynamodb_table.orders.arn}/index/*"
+          "${aws_dynamodb_table.orders.arn}/index/*",
+          aws_dynamodb_table.idempotency.arn,
+          aws_dynamodb_table.customer_summaries.arn
         ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:DescribeStream",
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:ListStreams"
+        ]
+        Resource = aws_dynamodb_table.orders.stream_arn
+      }
+    ]
+  })
+}
+
+# SQS ingest queue, consumed by the orders_ingest event source mapping
+resource "aws_iam_role_policy" "sqs_ingest" {
+  name = "${local.resource_prefix}-sqs-ingest-policy"
+  role = aws_iam_role.lambda_execution.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = aws_sqs_queue.ingest.arn
       }
     ]
   })
@@ -5,6 +5,38 @@ data "archive_file" "lambda_zip" {
   output_path = "${path.module}/lambda_function.zip"
 }
 
+# Secret used to sign pagination tokens (next_token)
+resource "random_password" "pagination_token_secret" {
+  length  = 48
+  special = false
+}
+
+# Environment shared by the API and the SQS ingest functions
+locals {
+  lambda_environment = {
+    DYNAMODB_TABLE    = aws_dynamodb_table.orders.name
+    IDEMPOTENCY_TABLE = aws_dynamodb_table.idempotency.name
+    SUMMARY_TABLE     = aws_dynamodb_table.customer_summaries.name
+    ENVIRONMENT       = var.environment
+    LOG_LEVEL         = var.environment == "prod" ? "INFO" : "DEBUG"
+
+    # In prod only 10% of requests log INFO lines and 1% dump their
+    # (redacted) event; 5xx requests are always logged in full
+    LOG_SAMPLE_RATES      = var.environment == "prod" ? "INFO=0.1" : ""
+    LOG_EVENT_SAMPLE_RATE = var.environment == "prod" ? "0.01" : "1"
+
+    PAGINATION_TOKEN_SECRET = random_password.pagination_token_secret.result
+    MAX_BATCH_ORDERS        = "100"
+    ORDER_CACHE_MAX_ENTRIES = tostring(var.order_cache_max_entries)
+    ORDER_CACHE_TTL_SECONDS = tostring(var.order_cache_ttl_seconds)
+    DYNAMODB_CODEC          = "native"
+    STATUS_INDEX_TERMINAL   = tostring(var.status_index_terminal)
+
+    # Per-operation latency and capacity as Embedded Metric Format log lines
+    METRICS_NAMESPACE = "OrdersApi/${var.environment}"
+  }
+}
+
 # Lambda Function
 resource "aws_lambda_function" "orders_api" {
   filename         = data.archive_file.lambda_zip.output_path
@@ -16,12 +48,11 @@ resource "aws_lambda_function" "orders_api" {
   timeout         = 30
   memory_size     = 256
 
+  # Optional dependencies (orjson) come from layers, the zip only has src/orders
+  layers = var.lambda_layer_arns
+
   environment {
-    variables = {
-      DYNAMODB_TABLE = aws_dynamodb_table.orders.name
-      ENVIRONMENT    = var.environment
-      LOG_LEVEL      = var.environment == "prod" ? "INFO" : "DEBUG"
-    }
+    variables = local.lambda_environment
   }
 
   # Enable X-Ray tracing in production
@@ -52,3 +83,131 @@ resource "aws_lambda_permission" "api_gateway" {
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${aws_api_gateway_rest_api.main.execution_arn}/*/*"
 }
+
+# Asynchronous bulk ingestion: partners send one order per SQS message and
+# handler.sqs_handler writes each batch with BatchWriteItem
+resource "aws_sqs_queue" "ingest_dlq" {
+  name                      = "${local.resource_prefix}-orders-ingest-dlq"
+  message_retention_seconds = 1209600
+
+  tags = {
+    Name = "${local.resource_prefix}-orders-ingest-dlq"
+  }
+}
+
+resource "aws_sqs_queue" "ingest" {
+  name = "${local.resource_prefix}-orders-ingest"
+  # AWS recommends 6x the function timeout, so retries of a batch still
+  # in flight do not overlap with it
+  visibility_timeout_seconds = 6 * aws_lambda_function.orders_ingest.timeout
+  message_retention_seconds  = 345600
+  sqs_managed_sse_enabled    = true
+
+  # Invalid payloads fail on every attempt and end up here
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.ingest_dlq.arn
+    maxReceiveCount     = var.ingest_max_receive_count
+  })
+
+  tags = {
+    Name = "${local.resource_prefix}-orders-ingest"
+  }
+}
+
+resource "aws_lambda_function" "orders_ingest" {
+  filename         = data.archive_file.lambda_zip.output_path
+  function_name    = "${local.resource_prefix}-orders-ingest"
+  role             = aws_iam_role.lambda_execution.arn
+  handler          = "handler.sqs_handler"
+  source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+  runtime          = "python3.11"
+  timeout          = 60
+  memory_size      = 256
+  layers           = var.lambda_layer_arns
+
+  environment {
+    variables = local.lambda_environment
+  }
+
+  tracing_config {
+    mode = var.environment == "prod" ? "Active" : "PassThrough"
+  }
+
+  tags = {
+    Name = "${local.resource_prefix}-orders-ingest"
+  }
+}
+
+resource "aws_cloudwatch_log_group" "ingest_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.orders_ingest.function_name}"
+  retention_in_days = var.environment == "prod" ? 30 : 7
+
+  tags = {
+    Name = "${local.resource_prefix}-ingest-logs"
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "ingest" {
+  event_source_arn = aws_sqs_queue.ingest.arn
+  function_name    = aws_lambda_function.orders_ingest.arn
+
+  # Batches above 10 messages need a batching window; each batch becomes
+  # ceil(n / 25) BatchWriteItem calls
+  batch_size                         = var.ingest_batch_size
+  maximum_batching_window_in_seconds = 1
+
+  # The handler returns batchItemFailures: only those messages are retried
+  function_response_types = ["ReportBatchItemFailures"]
+
+  # Caps the write rate the queue can put on the table
+  scaling_config {
+    maximum_concurrency = var.ingest_max_concurrency
+  }
+}
+
+# Per-customer summaries: handler.stream_handler applies every change on
+# the orders table to the customer_summaries table
+resource "aws_lambda_function" "orders_aggregates" {
+  filename         = data.archive_file.lambda_zip.output_path
+  function_name    = "${local.resource_prefix}-orders-aggregates"
+  role             = aws_iam_role.lambda_execution.arn
+  handler          = "handler.stream_handler"
+  source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+  runtime          = "python3.11"
+  timeout          = 60
+  memory_size      = 256
+  layers           = var.lambda_layer_arns
+
+  environment {
+    variables = local.lambda_environment
+  }
+
+  tracing_config {
+    mode = var.environment == "prod" ? "Active" : "PassThrough"
+  }
+
+  tags = {
+    Name = "${local.resource_prefix}-orders-aggregates"
+  }
+}
+
+resource "aws_cloudwatch_log_group" "aggregates_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.orders_aggregates.function_name}"
+  retention_in_days = var.environment == "prod" ? 30 : 7
+
+  tags = {
+    Name = "${local.resource_prefix}-aggregates-logs"
+  }
+}
+
+resource "aws_lambda_event_source_mapping" "aggregates" {
+  event_source_arn  = aws_dynamodb_table.orders.stream_arn
+  function_name     = aws_lambda_function.orders_aggregates.arn
+  starting_position = "TRIM_HORIZON"
+  batch_size        = 100
+
+  # The handler reports the first record it could not apply; the retry
+  # starts there and earlier records are not sent again
+  function_response_types = ["ReportBatchItemFailures"]
+  maximum_retry_attempts  = 10
+}
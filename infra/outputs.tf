@@ -13,6 +13,26 @@ output "dynamodb_table_name" {
   value       = aws_dynamodb_table.orders.name
 }
 
+output "idempotency_table_name" {
+  description = "DynamoDB table for Idempotency-Key records"
+  value       = aws_dynamodb_table.idempotency.name
+}
+
+output "ingest_queue_url" {
+  description = "SQS queue for asynchronous bulk order ingestion"
+  value       = aws_sqs_queue.ingest.url
+}
+
+output "ingest_dlq_url" {
+  description = "Dead-letter queue for ingest messages that kept failing"
+  value       = aws_sqs_queue.ingest_dlq.url
+}
+
+output "customer_summaries_table_name" {
+  description = "DynamoDB table with the per-customer order summaries"
+  value       = aws_dynamodb_table.customer_summaries.name
+}
+
 output "lambda_function_name" {
   description = "Lambda function name"
   value       = aws_lambda_function.orders_api.function_name
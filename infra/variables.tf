@@ -33,6 +33,48 @@ variable "api_throttle_rate_limit" {
   default     = 50
 }
 
+variable "order_cache_max_entries" {
+  description = "Max orders kept in the per-container read cache (0 disables it)"
+  type        = number
+  default     = 0
+}
+
+variable "order_cache_ttl_seconds" {
+  description = "Seconds a cached order stays fresh"
+  type        = number
+  default     = 5
+}
+
+variable "lambda_layer_arns" {
+  description = "Extra Lambda layers, e.g. one with orjson for faster JSON responses"
+  type        = list(string)
+  default     = []
+}
+
+variable "status_index_terminal" {
+  description = "Also index DELIVERED/CANCELLED/COMPLETED orders in StatusIndex (false keeps it sparse)"
+  type        = bool
+  default     = false
+}
+
+variable "ingest_batch_size" {
+  description = "SQS messages (orders) per ingest Lambda invocation"
+  type        = number
+  default     = 100
+}
+
+variable "ingest_max_concurrency" {
+  description = "Max concurrent ingest Lambda invocations (2-1000)"
+  type        = number
+  default     = 5
+}
+
+variable "ingest_max_receive_count" {
+  description = "Deliveries of an ingest message before it moves to the DLQ"
+  type        = number
+  default     = 3
+}
+
 variable "tags" {
   description = "Common tags for all resources"
   type        = map(string)
@@ -0,0 +1,164 @@
+import logging
+import os
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, Dict, Any, Callable
+
+from botocore.exceptions import ClientError
+
+try:
+    from orders.models import Order, OrderStatus
+    from orders.table import DynamoTable, create_client
+    from orders.metrics import MetricsRecorder
+    from orders import codec
+except ImportError:
+    # For Lambda execution environment
+    from models import Order, OrderStatus
+    from table import DynamoTable, create_client
+    from metrics import MetricsRecorder
+    import codec
+
+logger = logging.getLogger()
+
+# The summary table holds two kinds of items under its "pk" key: one summary
+# per customer and one marker per applied stream record
+SUMMARY_KEY_PREFIX = 'CUSTOMER#'
+EVENT_KEY_PREFIX = 'EVENT#'
+
+# Stream records are kept 24h, markers outlive every possible replay
+EVENT_MARKER_TTL_SECONDS = 2 * 86400
+
+# Orders that count towards the number of orders but not towards spend
+UNSPENT_STATUSES = frozenset({OrderStatus.CANCELLED})
+
+
+def order_contribution(order: Order) -> Dict[str, Decimal]:
+    """What one stored order adds to its customer's summary"""
+    contribution = {'order_count': Decimal(1), f'status_{order.status.value}': Decimal(1)}
+    if order.status not in UNSPENT_STATUSES:
+        contribution['total_spend'] = order.total_amount
+    return contribution
+
+
+def stream_deltas(record: Dict[str, Any]) -> Dict[str, Dict[str, Decimal]]:
+    """
+    Change a stream record makes to each customer's summary: the new image's
+    contribution minus the old one's. INSERT, MODIFY and REMOVE (and an order
+    moving to another customer) all fall out of the same subtraction.
+    """
+    images = record['dynamodb']
+    deltas: Dict[str, Dict[str, Decimal]] = {}
+    for image, sign in ((images.get('OldImage'), -1), (images.get('NewImage'), 1)):
+        if not image:
+            continue
+        order = codec.item_to_partial_order(image)
+        delta = deltas.setdefault(order.customer_id, {})
+        for name, value in order_contribution(order).items():
+            delta[name] = delta.get(name, Decimal(0)) + sign * value
+
+    # Updates that touch neither status nor amount (e.g. items) change nothing
+    return {
+        customer_id: {name: value for name, value in delta.items() if value}
+        for customer_id, delta in deltas.items()
+        if any(delta.values())
+    }
+
+
+class CustomerSummaryStore:
+    """
+    Per-customer order aggregates kept up to date from the orders stream.
+
+    Each stream record is applied in one TransactWriteItems: a conditional
+    Put of a marker for its eventID plus an ADD on every affected summary.
+    A replayed record finds its marker and the whole transaction is
+    cancelled, so nothing is counted twice.
+    """
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        client=None,
+        metrics: Optional[MetricsRecorder] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.table_name = table_name or os.getenv('SUMMARY_TABLE')
+        if not self.table_name:
+            raise ValueError("table_name must be provided or SUMMARY_TABLE environment variable must be set")
+        self.table = DynamoTable(client or create_client(), self.table_name, metrics=metrics)
+        self._clock = clock
+
+    def get_summary(self, customer_id: str) -> Dict[str, Any]:
+        """Summary of a customer in a single GetItem, zeros when there is none yet"""
+        item = self.table.get_item(Key={'pk': SUMMARY_KEY_PREFIX + customer_id}).get('Item') or {}
+        return {
+            'customer_id': customer_id,
+            'order_count': int(item.get('order_count', 0)),
+            'total_spend': item.get('total_spend', Decimal(0)),
+            'orders_by_status': {
+                status.value: int(item[f'status_{status.value}'])
+                for status in OrderStatus
+                if item.get(f'status_{status.value}')
+            },
+            'last_order_at': item.get('last_order_at'),
+            'updated_at': item.get('updated_at')
+        }
+
+    def apply_record(self, record: Dict[str, Any]) -> bool:
+        """Apply one stream record, False when it had already been applied"""
+        new_image = record['dynamodb'].get('NewImage')
+        if record['eventName'] == 'INSERT' and new_image:
+            # Idempotent by itself (a max), so it runs outside the transaction
+            self._advance_last_order(new_image['customer_id']['S'], new_image['created_at']['S'])
+
+        deltas = stream_deltas(record)
+        if not deltas:
+            return True
+        return self._apply(record['eventID'], deltas)
+
+    def _apply(self, event_id: str, deltas: Dict[str, Dict[str, Decimal]]) -> bool:
+        now = int(self._clock())
+        updated_at = datetime.utcfromtimestamp(now).isoformat()
+        actions = [{'Put': {
+            'Item': {'pk': EVENT_KEY_PREFIX + event_id, 'expires_at': now + EVENT_MARKER_TTL_SECONDS},
+            'ConditionExpression': 'attribute_not_exists(pk)'
+        }}]
+        for customer_id, delta in deltas.items():
+            names = {f'#a{i}': name for i, name in enumerate(delta)}
+            values = {f':a{i}': value for i, value in enumerate(delta.values())}
+            actions.append({'Update': {
+                'Key': {'pk': SUMMARY_KEY_PREFIX + customer_id},
+                'UpdateExpression': (
+                    f"ADD {', '.join(f'#a{i} :a{i}' for i in range(len(delta)))} "
+                    "SET customer_id = :customer_id, updated_at = :updated_at"
+                ),
+                'ExpressionAttributeNames': names,
+                'ExpressionAttributeValues': dict(values, **{
+                    ':customer_id': customer_id,
+                    ':updated_at': updated_at
+                })
+            }})
+
+        try:
+            self.table.transact_write_items(TransactItems=actions)
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TransactionCanceledException':
+                raise
+            reasons = e.response.get('CancellationReasons') or []
+            if not reasons or reasons[0].get('Code') != 'ConditionalCheckFailed':
+                raise
+            logger.info("Stream record %s already applied", event_id)
+            return False
+        return True
+
+    def _advance_last_order(self, customer_id: str, created_at: str) -> None:
+        try:
+            self.table.update_item(
+                Key={'pk': SUMMARY_KEY_PREFIX + customer_id},
+                UpdateExpression='SET last_order_at = :created_at',
+                ConditionExpression='attribute_not_exists(last_order_at) OR last_order_at < :created_at',
+                ExpressionAttributeValues={':created_at': created_at}
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
@@ -0,0 +1,34 @@
+"""
+One-off backfill of the StatusIndex key (gsi_status).
+
+Orders written before StatusIndex existed have no gsi_status and are missing
+from GET /v1/orders?status=...; run this once after deploying the index, and
+again after changing STATUS_INDEX_TERMINAL. It is safe to re-run and to run
+while the API takes traffic.
+
+Usage:
+    python -m orders.backfill --table orders-prod --segments 8
+"""
+import argparse
+from typing import Optional, List
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    try:
+        from orders.repository import CodecOrderRepository
+    except ImportError:
+        # For Lambda execution environment
+        from repository import CodecOrderRepository
+
+    parser = argparse.ArgumentParser(description="Backfill the StatusIndex key on existing orders")
+    parser.add_argument('--table', help='table name (default: DYNAMODB_TABLE)')
+    parser.add_argument('--segments', type=int, help='parallel scan segments (default: SCAN_SEGMENTS)')
+    args = parser.parse_args(argv)
+
+    counts = CodecOrderRepository(table_name=args.table).backfill_status_index(total_segments=args.segments)
+    print(f"Scanned {counts['scanned']} orders: {counts['updated']} updated, "
+          f"{counts['skipped']} changed meanwhile and skipped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Callable, Dict, Any
+
+
+class OrderCache:
+    """Bounded LRU cache with a TTL, kept per warm Lambda container"""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than 0")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> Optional['OrderCache']:
+        """Build a cache from ORDER_CACHE_* env vars, None when disabled"""
+        max_entries = int(os.getenv("ORDER_CACHE_MAX_ENTRIES", "0"))
+        if max_entries <= 0:
+            return None
+        return cls(
+            max_entries=max_entries,
+            ttl_seconds=float(os.getenv("ORDER_CACHE_TTL_SECONDS", "5"))
+        )
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        self._entries[key] = (self._clock() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for logs and metrics"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries)
+        }
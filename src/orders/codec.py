@@ -0,0 +1,117 @@
+import os
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+from boto3.dynamodb.types import TypeSerializer
+
+try:
+    from orders.models import Order, OrderItem, OrderStatus, TERMINAL_STATUSES, _format_timestamp
+except ImportError:
+    # For Lambda execution environment
+    from models import Order, OrderItem, OrderStatus, TERMINAL_STATUSES, _format_timestamp
+
+# Fallback for values the codec has no fast path for (legacy dict items)
+_serializer = TypeSerializer()
+
+# Hash key of StatusIndex. Items without it are not in the index, so leaving
+# it off terminal orders keeps the index down to the orders still in flight
+STATUS_INDEX_ATTRIBUTE = 'gsi_status'
+STATUS_INDEX_TERMINAL = os.getenv("STATUS_INDEX_TERMINAL", "false").lower() == "true"
+
+
+def status_index_key(status: Any) -> Optional[str]:
+    """Value of the StatusIndex key for a status, None when it is not indexed"""
+    status = OrderStatus(status)
+    if status in TERMINAL_STATUSES and not STATUS_INDEX_TERMINAL:
+        return None
+    return status.value
+
+
+def order_to_item(order: Order) -> Dict[str, Dict[str, Any]]:
+    """Encode an Order straight into a DynamoDB AttributeValue map.
+
+    Produces the same wire format as TypeSerializer over Order.to_dict(),
+    so both repositories can read each other's items.
+    """
+    item = {
+        'order_id': {'S': order.order_id},
+        'customer_id': {'S': order.customer_id},
+        'status': {'S': order.status.value if isinstance(order.status, OrderStatus) else order.status},
+        'total_amount': {'N': str(order.total_amount)},
+        # The raw values, as Order.to_dict does: the properties would parse and
+        # re-format every timestamp and rewrite 'Z' suffixes
+        'created_at': {'S': _format_timestamp(order._created_at)},
+        'updated_at': {'S': _format_timestamp(order._updated_at)},
+        'items': {'L': [_encode_line(item) for item in order.items]},
+        'version': {'N': str(order.version)}
+    }
+    index_key = status_index_key(order.status)
+    if index_key is not None:
+        item[STATUS_INDEX_ATTRIBUTE] = {'S': index_key}
+    return item
+
+
+def item_to_order(item: Dict[str, Dict[str, Any]]) -> Order:
+    """Decode a DynamoDB AttributeValue map straight into an Order"""
+    updated_at = item.get('updated_at')
+    return Order(
+        order_id=item['order_id']['S'],
+        customer_id=item['customer_id']['S'],
+        total_amount=Decimal(item['total_amount']['N']),
+        status=OrderStatus(item['status']['S']),
+        items=[_decode_line(entry['M']) for entry in item.get('items', {}).get('L', ())],
+        # Order parses timestamps lazily, hand over the stored strings
+        created_at=item['created_at']['S'],
+        updated_at=updated_at['S'] if updated_at else None,
+        # Items written before versioning have no version attribute
+        version=int(item['version']['N']) if 'version' in item else 0
+    )
+
+
+def item_to_partial_order(item: Dict[str, Dict[str, Any]]) -> Order:
+    """Decode a projected AttributeValue map into a partial Order"""
+    data = {}
+    for name, value in item.items():
+        if name == 'items':
+            data[name] = [_decode_line(entry['M']) for entry in value['L']]
+        elif 'S' in value:
+            data[name] = value['S']
+        elif 'N' in value:
+            data[name] = value['N']
+    return Order.from_partial(data)
+
+
+def item_to_values(item: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Decode the scalar attributes of an AttributeValue map (S as str, N as Decimal)"""
+    values = {}
+    for name, value in item.items():
+        if 'S' in value:
+            values[name] = value['S']
+        elif 'N' in value:
+            values[name] = Decimal(value['N'])
+    return values
+
+
+def item_order_id(item: Dict[str, Dict[str, Any]]) -> str:
+    """Read the order_id of an encoded item"""
+    return item['order_id']['S']
+
+
+def _encode_line(item: Any) -> Dict[str, Any]:
+    if not isinstance(item, OrderItem):
+        return _serializer.serialize(item)
+    # OrderItem.to_dict() stores the price as a string, keep that format
+    return {'M': {
+        'product_id': {'S': item.product_id},
+        'quantity': {'N': str(item.quantity)},
+        'price': {'S': str(item.price)}
+    }}
+
+
+def _decode_line(line: Dict[str, Dict[str, Any]]) -> OrderItem:
+    price = line['price']
+    return OrderItem(
+        product_id=line['product_id']['S'],
+        quantity=int(line['quantity']['N']),
+        price=Decimal(price['S'] if 'S' in price else price['N'])
+    )
@@ -0,0 +1,110 @@
+import base64
+import gzip
+import os
+from typing import Any, Dict, Optional
+
+# brotli is optional, like orjson: used when the Lambda has it (e.g. from a
+# layer), otherwise clients that accept gzip get gzip
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Smaller bodies are sent as they are: compressing them saves little and
+# base64 eats part of the gain
+MIN_COMPRESS_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# Fast settings: the Lambda pays the CPU on every response
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+# Preferred first when the client accepts several with the same weight
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Parse "gzip, br;q=0.8" into {coding: q}"""
+    weights = {}
+    for entry in (header or '').split(','):
+        coding, _, params = entry.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights
+
+
+def choose_encoding(header: Optional[str]) -> Optional[str]:
+    """Best content coding the client accepts, None for identity"""
+    weights = parse_accept_encoding(header)
+    wildcard = weights.get('*', 0.0)
+    best, best_q = None, 0.0
+    for coding in ENCODINGS:
+        q = weights.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output stable for identical bodies
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(
+    response: Dict[str, Any],
+    accept_encoding: Optional[str],
+    min_bytes: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Compress an API Gateway proxy response body when the client accepts it
+    and the body is large enough, returned base64 with isBase64Encoded.
+    """
+    body = response.get('body')
+    if not body or response.get('isBase64Encoded'):
+        return response
+
+    raw = body.encode()
+    if len(raw) < (MIN_COMPRESS_BYTES if min_bytes is None else min_bytes):
+        return response
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return response
+
+    compressed = compress(raw, encoding)
+    if len(compressed) >= len(raw):
+        return response
+
+    headers = dict(response.get('headers') or {})
+    headers['Content-Encoding'] = encoding
+    # Caches must key on Accept-Encoding
+    headers['Vary'] = 'Accept-Encoding'
+    return dict(
+        response,
+        headers=headers,
+        body=base64.b64encode(compressed).decode(),
+        isBase64Encoded=True
+    )
+
+
+def request_body(event: Dict[str, Any], default: Optional[str] = None) -> Optional[str]:
+    """
+    Request body as text. With binary media types enabled API Gateway
+    passes bodies base64-encoded, flagged by isBase64Encoded.
+    """
+    if 'body' not in event:
+        return default
+    body = event['body']
+    if body and event.get('isBase64Encoded'):
+        return base64.b64decode(body).decode()
+    return body
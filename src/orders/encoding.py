@@ -0,0 +1,78 @@
+import json
+import re
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+
+# orjson is optional: it is used when the Lambda has it (e.g. from a layer,
+# see lambda_layer_arns), otherwise responses go through the stdlib encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.Fragment (3.9+) embeds pre-encoded JSON, used for exact Decimals;
+# older orjson releases cannot do that and are not used
+_FRAGMENT = getattr(orjson, 'Fragment', None)
+if _FRAGMENT is None:
+    orjson = None
+
+ENCODER = 'orjson' if orjson is not None else 'json'
+
+# Both encoders write a Decimal as a JSON number with exactly its digits
+# (str(Decimal), e.g. 19.90 or 12345678901234567.89), never through float.
+# The stdlib encoder has no raw-number hook: Decimals are encoded as marked
+# strings and the marks are stripped afterwards
+_MARK = '\x00'
+_MARKED_NUMBER = re.compile(r'"\\u0000(-?[0-9][0-9.E+-]*)"')
+
+
+def _default(value: Any, number) -> Any:
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError(f"Cannot encode non-finite Decimal {value}")
+        return number(str(value))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    # Same last resort as the previous json.dumps(default=str)
+    return str(value)
+
+
+def _orjson_default(value: Any) -> Any:
+    return _default(value, _FRAGMENT)
+
+
+def dumps_stdlib(data: Any) -> str:
+    """Encode with the stdlib json module"""
+    mark, pattern = _MARK, _MARKED_NUMBER
+    while True:
+        count = 0
+
+        def number(text: str) -> str:
+            nonlocal count
+            count += 1
+            return mark + text
+
+        encoded = json.dumps(data, default=lambda value: _default(value, number), separators=(',', ':'))
+        if not count:
+            return encoded
+        encoded, found = pattern.subn(r'\1', encoded)
+        if found == count:
+            return encoded
+        # A string in the data looked like a marked number: retry with a
+        # mark no string in it contains
+        mark = f'\x00{uuid.uuid4().hex}'
+        pattern = re.compile(r'"\\u0000' + mark[1:] + r'(-?[0-9][0-9.E+-]*)"')
+
+
+def dumps_orjson(data: Any) -> str:
+    """Encode with orjson, which must be installed"""
+    return orjson.dumps(data, default=_orjson_default).decode()
+
+
+# Encoder used for API responses
+dumps = dumps_orjson if orjson is not None else dumps_stdlib
@@ -0,0 +1,42 @@
+class OrderNotFoundError(Exception):
+    """Raised when a write targets an order that does not exist"""
+
+    def __init__(self, order_id: str):
+        super().__init__(f"Order not found: {order_id}")
+        self.order_id = order_id
+
+
+class OrderConflictError(Exception):
+    """Raised when a conditional write loses against a newer version"""
+
+    def __init__(self, order_id: str, expected_version: int, current_version: int):
+        super().__init__(
+            f"Order {order_id} is at version {current_version}, expected {expected_version}"
+        )
+        self.order_id = order_id
+        self.expected_version = expected_version
+        self.current_version = current_version
+
+
+class RepositoryThrottledError(Exception):
+    """Raised when DynamoDB throttles a request after the SDK retries"""
+
+    def __init__(self, operation: str):
+        super().__init__(f"DynamoDB throttled {operation}")
+        self.operation = operation
+
+
+class IdempotencyKeyReusedError(Exception):
+    """Raised when an Idempotency-Key comes back with a different request body"""
+
+    def __init__(self, key: str):
+        super().__init__(f"Idempotency key {key} was used with a different request")
+        self.key = key
+
+
+class IdempotencyInProgressError(Exception):
+    """Raised when the first request with an Idempotency-Key has not finished yet"""
+
+    def __init__(self, key: str):
+        super().__init__(f"Request with idempotency key {key} is still in progress")
+        self.key = key
@@ -0,0 +1,187 @@
+"""
+Columnar snapshot export of the orders table.
+
+A snapshot is a directory with one flat binary array per column, written
+page by page as the scan streams in, so memory stays flat whatever the
+table size (the customer dictionary grows with distinct customers only):
+
+    amount_cents.bin    int64   total_amount in cents
+    created_at_us.bin   int64   created_at as UTC epoch microseconds
+    status.bin          uint8   index into manifest["statuses"]
+    customer.bin        uint32  index into customers.json
+    customers.json      customer ids, in code order
+    manifest.json       row count, column dtypes, statuses, created_at range
+
+Only the stdlib is needed to write one; orders.analytics reads them with
+NumPy.
+
+Usage:
+    python -m orders.export --output snapshots/2024-06-01 --table orders-prod
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+from array import array
+from datetime import datetime, timezone
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Optional, Dict, Any, Iterable, List
+
+try:
+    from orders.models import OrderStatus
+except ImportError:
+    # For Lambda execution environment
+    from models import OrderStatus
+
+FORMAT_VERSION = 1
+
+# Attributes the export reads, everything else stays out of the scan
+EXPORT_FIELDS = ('order_id', 'customer_id', 'status', 'total_amount', 'created_at')
+
+# Column -> (file, array typecode, NumPy dtype without byte order)
+COLUMNS = {
+    'amount_cents': ('amount_cents.bin', 'q', 'i8'),
+    'created_at_us': ('created_at_us.bin', 'q', 'i8'),
+    'status': ('status.bin', 'B', 'u1'),
+    'customer': ('customer.bin', 'I', 'u4')
+}
+
+STATUSES = tuple(status.value for status in OrderStatus)
+
+_EPOCH = datetime(1970, 1, 1)
+_CENT = Decimal('0.01')
+
+
+def epoch_us(value: str) -> int:
+    """ISO-8601 timestamp as UTC epoch microseconds, naive ones taken as UTC"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = parsed - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def amount_cents(value: Any) -> int:
+    """total_amount in whole cents (banker's rounding below a cent)"""
+    amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    return int(amount.quantize(_CENT, rounding=ROUND_HALF_EVEN).scaleb(2))
+
+
+class SnapshotWriter:
+    """
+    Appends pages of order dicts to a snapshot directory.
+
+    Files are written to "<path>.partial" and moved into place by close(),
+    so an interrupted export never leaves a snapshot that looks complete.
+    """
+
+    def __init__(self, path: str):
+        if os.path.exists(path):
+            raise FileExistsError(f"Snapshot already exists: {path}")
+        self.path = path
+        self._partial = f"{path}.partial"
+        shutil.rmtree(self._partial, ignore_errors=True)
+        os.makedirs(self._partial)
+        self._files = {
+            name: open(os.path.join(self._partial, filename), 'wb')
+            for name, (filename, _, _) in COLUMNS.items()
+        }
+        self._status_codes = {status: code for code, status in enumerate(STATUSES)}
+        self._customer_codes: Dict[str, int] = {}
+        self.rows = 0
+        self._created_min: Optional[int] = None
+        self._created_max: Optional[int] = None
+
+    def append(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Write one page of orders (dicts with EXPORT_FIELDS)"""
+        columns = {name: array(typecode) for name, (_, typecode, _) in COLUMNS.items()}
+        customer_codes = self._customer_codes
+        for item in items:
+            customer_id = item['customer_id']
+            code = customer_codes.get(customer_id)
+            if code is None:
+                code = customer_codes[customer_id] = len(customer_codes)
+            columns['customer'].append(code)
+            columns['status'].append(self._status_codes[item['status']])
+            columns['amount_cents'].append(amount_cents(item['total_amount']))
+            columns['created_at_us'].append(epoch_us(item['created_at']))
+
+        created = columns['created_at_us']
+        if created:
+            low, high = min(created), max(created)
+            self._created_min = low if self._created_min is None else min(self._created_min, low)
+            self._created_max = high if self._created_max is None else max(self._created_max, high)
+        for name, values in columns.items():
+            values.tofile(self._files[name])
+        self.rows += len(created)
+
+    def close(self) -> Dict[str, Any]:
+        """Write the dictionary and manifest and publish the snapshot"""
+        for file in self._files.values():
+            file.close()
+
+        byte_order = '<' if sys.byteorder == 'little' else '>'
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'exported_at': datetime.utcnow().isoformat(),
+            'rows': self.rows,
+            'columns': {
+                name: {'file': filename, 'dtype': byte_order + dtype}
+                for name, (filename, _, dtype) in COLUMNS.items()
+            },
+            'statuses': list(STATUSES),
+            'customers': len(self._customer_codes),
+            'created_at_us': {'min': self._created_min, 'max': self._created_max}
+        }
+        with open(os.path.join(self._partial, 'customers.json'), 'w') as f:
+            # dicts keep insertion order, which is code order
+            json.dump(list(self._customer_codes), f)
+        with open(os.path.join(self._partial, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        os.rename(self._partial, self.path)
+        return manifest
+
+    def abort(self) -> None:
+        """Drop a snapshot that will not be completed"""
+        for file in self._files.values():
+            file.close()
+        shutil.rmtree(self._partial, ignore_errors=True)
+
+
+def export_snapshot(pages: Iterable[List[Dict[str, Any]]], path: str) -> Dict[str, Any]:
+    """Write pages of orders (e.g. OrderRepository.scan_pages) as a snapshot, returns the manifest"""
+    writer = SnapshotWriter(path)
+    try:
+        for page in pages:
+            writer.append(page)
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    try:
+        from orders.repository import CodecOrderRepository
+    except ImportError:
+        # For Lambda execution environment
+        from repository import CodecOrderRepository
+
+    parser = argparse.ArgumentParser(description="Export the orders table as a columnar snapshot")
+    parser.add_argument('--output', required=True, help='snapshot directory to create')
+    parser.add_argument('--table', help='table name (default: DYNAMODB_TABLE)')
+    parser.add_argument('--segments', type=int, help='parallel scan segments (default: SCAN_SEGMENTS)')
+    args = parser.parse_args(argv)
+
+    # The codec repository hands over AttributeValues without TypeDeserializer
+    repository = CodecOrderRepository(table_name=args.table)
+    manifest = export_snapshot(
+        repository.scan_pages(EXPORT_FIELDS, total_segments=args.segments), args.output
+    )
+    print(f"Exported {manifest['rows']} orders of {manifest['customers']} customers to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,116 +1,365 @@
 import json
 import os
 import logging
-from datetime import datetime
-from decimal import Decimal
+import time
 import uuid
-from typing import Dict, Any
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
 
 try:
-    from orders.models import Order, OrderStatus
-    from orders.repository import OrderRepository
+    from orders.models import Order, OrderStatus, ORDER_FIELDS, ETAG_FIELDS
+    from orders.exceptions import (
+        OrderNotFoundError, OrderConflictError, RepositoryThrottledError,
+        IdempotencyKeyReusedError, IdempotencyInProgressError
+    )
+    from orders.repository import OrderRepository, CodecOrderRepository
+    from orders.cache import OrderCache
+    from orders.encoding import dumps
+    from orders.compression import compress_response, request_body
+    from orders.router import Router
+    from orders import codec, logs
+    from orders.metrics import MetricsRecorder, measure
 except ImportError:
     # For Lambda execution environment
-    from models import Order, OrderStatus
-    from repository import OrderRepository
-
-# Configure logging
+    from models import Order, OrderStatus, ORDER_FIELDS, ETAG_FIELDS
+    from exceptions import (
+        OrderNotFoundError, OrderConflictError, RepositoryThrottledError,
+        IdempotencyKeyReusedError, IdempotencyInProgressError
+    )
+    from repository import OrderRepository, CodecOrderRepository
+    from cache import OrderCache
+    from encoding import dumps
+    from compression import compress_response, request_body
+    from router import Router
+    import codec
+    import logs
+    from metrics import MetricsRecorder, measure
+
+# Configure logging (LOG_LEVEL, LOG_SAMPLE_RATES, LOG_EVENT_SAMPLE_RATE)
 logger = logging.getLogger()
-logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+logs.configure()
 
 # Repository will be initialized on first use
 _repository = None
 
+# Per-customer summaries (SUMMARY_TABLE), built on first use
+_summary_store = None
+
+# Idempotency-Key store, built on first use (False = disabled, no IDEMPOTENCY_TABLE)
+_idempotency_store = None
+
+# Order cache survives across invocations in a warm container (None = disabled)
+_order_cache = OrderCache.from_env()
+
+# EMF metrics, flushed at the end of every invocation (None = disabled)
+_metrics = MetricsRecorder.from_env()
+
+# Page sizes for GET /v1/orders
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+# Maximum number of orders accepted by POST /v1/orders:batch
+MAX_BATCH_ORDERS = int(os.getenv("MAX_BATCH_ORDERS", "100"))
+
+# Maximum number of ids accepted by GET /v1/orders?ids=
+MAX_BATCH_GET_IDS = 100
+
+# Namespace of the order_ids derived from SQS message ids (uuid5)
+INGEST_ORDER_NAMESPACE = uuid.UUID('6c1f3b1e-2f3a-4d55-9a37-0c7d2b8e4a10')
+
+# Longest Idempotency-Key accepted by POST /v1/orders
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+# Item codec: "native" maps AttributeValues to Orders directly, "boto3" uses TypeSerializer
+REPOSITORY_CLASSES = {
+    'boto3': OrderRepository,
+    'native': CodecOrderRepository
+}
+DYNAMODB_CODEC = os.getenv("DYNAMODB_CODEC", "boto3")
+
+
+def _memory_store():
+    try:
+        from orders.memory_store import InMemoryOrderRepository
+    except ImportError:
+        # For Lambda execution environment
+        from memory_store import InMemoryOrderRepository
+    return InMemoryOrderRepository(metrics=_metrics)
+
+
+def _sqlite_store():
+    try:
+        from orders.sqlite_store import SqliteOrderRepository
+    except ImportError:
+        # For Lambda execution environment
+        from sqlite_store import SqliteOrderRepository
+    return SqliteOrderRepository(metrics=_metrics)
+
+
+# Storage backend: "dynamodb" in every deployed stage, "memory" and "sqlite"
+# for local load tests and profiling without DynamoDB emulation. The local
+# backends are only imported when selected, keeping them off the cold start
+ORDER_STORES = {
+    'dynamodb': lambda: REPOSITORY_CLASSES[DYNAMODB_CODEC](cache=_order_cache, metrics=_metrics),
+    'memory': _memory_store,
+    'sqlite': _sqlite_store
+}
+ORDER_STORE = os.getenv("ORDER_STORE", "dynamodb")
+
+# Response headers are built once and copied per response, since some
+# handlers add their own (e.g. Retry-After)
+SUCCESS_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': (
+        'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token,If-Match,If-None-Match,Idempotency-Key'
+    ),
+    'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS',
+    'Access-Control-Expose-Headers': 'ETag'
+}
+BASE_HEADERS = {
+    'Content-Type': 'application/json',
+    'Access-Control-Allow-Origin': '*'
+}
+
 
 def get_repository():
     """Get or create repository instance (lazy initialization)"""
     global _repository
     if _repository is None:
-        _repository = OrderRepository()
+        if ORDER_STORE not in ORDER_STORES:
+            raise ValueError(f"Unknown ORDER_STORE: {ORDER_STORE}")
+        _repository = ORDER_STORES[ORDER_STORE]()
     return _repository
 
 
+def get_idempotency_store() -> Optional['IdempotencyStore']:
+    """Get or create the Idempotency-Key store, None when disabled"""
+    global _idempotency_store
+    if _idempotency_store is None:
+        try:
+            from orders.idempotency import IdempotencyStore
+        except ImportError:
+            # For Lambda execution environment
+            from idempotency import IdempotencyStore
+        _idempotency_store = IdempotencyStore.from_env(metrics=_metrics) or False
+    return _idempotency_store or None
+
+
+def get_summary_store() -> 'CustomerSummaryStore':
+    """Get or create the customer summary store (lazy initialization)"""
+    global _summary_store
+    if _summary_store is None:
+        try:
+            from orders.aggregates import CustomerSummaryStore
+        except ImportError:
+            # For Lambda execution environment
+            from aggregates import CustomerSummaryStore
+        _summary_store = CustomerSummaryStore(metrics=_metrics)
+    return _summary_store
+
+
+# Inside Lambda, build the client during the init phase: it runs with a full
+# CPU allocation before the first request instead of on its critical path
+if os.getenv("AWS_LAMBDA_FUNCTION_NAME") and os.getenv("DYNAMODB_TABLE"):
+    try:
+        get_repository()
+    except Exception as e:
+        # Fall back to lazy initialization on the first request
+        logger.warning("Eager repository initialization failed: %s", e)
+
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     Main Lambda handler for Orders API
     Handles all CRUD operations based on HTTP method and path
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    logs.sampler.start(getattr(context, 'aws_request_id', None))
+    start = time.perf_counter()
+    try:
+        response = dispatch(event)
+        # Compressed here, once, rather than in every success_response call
+        response = compress_response(response, get_header(event, 'Accept-Encoding'))
+    finally:
+        if _metrics is not None:
+            _metrics.flush()
+    logs.log_request(logger, event, response['statusCode'], (time.perf_counter() - start) * 1000)
+    return response
 
-    # Get repository instance
-    repository = get_repository()
 
+def sqs_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    SQS entry point for bulk ingestion. Each message body is one order
+    payload as for POST /v1/orders, customer_id included. Only the messages
+    that failed are returned in batchItemFailures, so SQS redelivers just
+    those (ReportBatchItemFailures on the event source mapping).
+    """
+    logs.sampler.start(getattr(context, 'aws_request_id', None))
+    records = event.get('Records') or []
     try:
-        http_method = event['httpMethod']
-        path = event['path']
-        path_parameters = event.get('pathParameters') or {}
-        query_parameters = event.get('queryStringParameters') or {}
-
-        # Get customer_id from JWT claims
-        customer_id = None
-        if 'requestContext' in event and 'authorizer' in event['requestContext']:
-            claims = event['requestContext']['authorizer'].get('claims', {})
-            customer_id = claims.get('sub')  # Cognito user ID
-
-        # Route to appropriate handler
-        if path == '/v1/orders':
-            if http_method == 'POST':
-                return handle_create_order(event, customer_id)
-            elif http_method == 'GET':
-                return handle_list_orders(event, query_parameters)
-            else:
-                return error_response(405, "Method not allowed")
-
-        elif path.startswith('/v1/orders/'):
-            order_id = path_parameters.get('id')
-            if not order_id:
-                return error_response(400, "Order ID is required")
-
-            if http_method == 'GET':
-                return handle_get_order(order_id)
-            elif http_method == 'PUT':
-                return handle_update_order(order_id, event)
-            elif http_method == 'DELETE':
-                return handle_delete_order(order_id)
-            else:
-                return error_response(405, "Method not allowed")
+        with measure(_metrics, "SQS ingest"):
+            failed = ingest_orders(records)
+    finally:
+        if _metrics is not None:
+            _metrics.flush()
+    logger.info("Ingested %s of %s messages", len(records) - len(failed), len(records))
+    return {'batchItemFailures': [{'itemIdentifier': message_id} for message_id in failed]}
+
+
+def ingest_orders(records: List[Dict[str, Any]]) -> List[str]:
+    """Validate and write the orders of an SQS batch, returns the failed message ids"""
+    failed = []
+    orders_by_message = {}
+    for record in records:
+        message_id = record['messageId']
+        try:
+            order = Order.from_request(json.loads(record['body']))
+            # Redeliveries keep the message id, so a retried message
+            # overwrites its own order instead of creating a second one
+            order.order_id = str(uuid.uuid5(INGEST_ORDER_NAMESPACE, message_id))
+            errors = order.validate()
+        except ValueError as e:
+            # Includes malformed JSON; retried until the queue moves it to the DLQ
+            errors = [str(e)]
+        if errors:
+            logger.warning("Rejected message %s: %s", message_id, ', '.join(errors))
+            failed.append(message_id)
+        else:
+            orders_by_message[message_id] = order
+
+    if orders_by_message:
+        try:
+            _, not_written = get_repository().create_orders(list(orders_by_message.values()))
+        except Exception as e:
+            logger.error("Error writing ingested orders: %s", e)
+            return [record['messageId'] for record in records]
+        not_written_ids = {order.order_id for order in not_written}
+        failed.extend(
+            message_id for message_id, order in orders_by_message.items()
+            if order.order_id in not_written_ids
+        )
+    return failed
 
-        return error_response(404, "Endpoint not found")
+
+def stream_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    DynamoDB Streams entry point keeping the per-customer summaries. Records
+    of a shard are applied in order; on the first failure the rest of the
+    batch is left for the retry, which starts from that record.
+    """
+    logs.sampler.start(getattr(context, 'aws_request_id', None))
+    records = event.get('Records') or []
+    failures = []
+    applied = 0
+    try:
+        store = get_summary_store()
+        with measure(_metrics, "Stream aggregates"):
+            for record in records:
+                try:
+                    store.apply_record(record)
+                    applied += 1
+                except Exception as e:
+                    logger.error("Error applying stream record %s: %s", record.get('eventID'), e)
+                    failures.append({'itemIdentifier': record['dynamodb']['SequenceNumber']})
+                    break
+    finally:
+        if _metrics is not None:
+            _metrics.flush()
+    logger.info("Applied %s of %s stream records", applied, len(records))
+    return {'batchItemFailures': failures}
+
+
+def dispatch(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Route an API Gateway event to its handler"""
+    try:
+        http_method = event['httpMethod']
+        match = ROUTER.resolve(event['path'], event.get('resource'))
+        if match is None:
+            return error_response(404, "Endpoint not found")
+
+        route, params = match
+        handler = route.handlers.get(http_method)
+        if handler is None:
+            response = error_response(405, "Method not allowed")
+            response['headers']['Allow'] = route.allow
+            return response
+
+        # API Gateway already URL-decodes pathParameters, prefer them
+        params.update(event.get('pathParameters') or {})
+        for name in route.param_names:
+            if not params.get(name):
+                return error_response(400, f"Path parameter '{name}' is required")
+
+        # Per-endpoint latency, charged with the capacity of its DynamoDB calls
+        with measure(_metrics, f"{http_method} {route.template}"):
+            return handler(event, params)
 
     except Exception as e:
-        logger.error(f"Unhandled error: {str(e)}", exc_info=True)
+        logger.error("Unhandled error: %s", e, exc_info=True)
         return error_response(500, "Internal server error")
 
 
+def get_customer_id(event: Dict[str, Any]) -> Optional[str]:
+    """Get customer_id from the Cognito JWT claims"""
+    authorizer = (event.get('requestContext') or {}).get('authorizer') or {}
+    return (authorizer.get('claims') or {}).get('sub')  # Cognito user ID
+
+
 def handle_create_order(event: Dict[str, Any], customer_id: str) -> Dict[str, Any]:
-    """Handle POST /v1/orders"""
-    repository = get_repository()
+    """Handle POST /v1/orders, replaying the stored response for a repeated Idempotency-Key"""
+    key = get_header(event, 'Idempotency-Key')
+    store = get_idempotency_store() if key else None
+    if store is None:
+        return create_order(event, customer_id)
+
+    if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        return error_response(400, f"Idempotency-Key must be at most {MAX_IDEMPOTENCY_KEY_LENGTH} characters")
+    # Keys are per customer, two customers may pick the same one
+    key = f"{customer_id}#{key}"
     try:
-        body = json.loads(event.get('body', '{}'))
+        from orders.idempotency import fingerprint
+    except ImportError:
+        # For Lambda execution environment
+        from idempotency import fingerprint
+    request_hash = fingerprint(request_body(event))
+    try:
+        response = store.replay(key, request_hash)
+    except IdempotencyKeyReusedError:
+        return error_response(422, "Idempotency-Key was already used with a different request")
+    except IdempotencyInProgressError:
+        response = error_response(409, "A request with this Idempotency-Key is still in progress")
+        response['headers']['Retry-After'] = '1'
+        return response
+    except Exception as e:
+        logger.error("Error reading idempotency record: %s", e)
+        return error_response(500, "Failed to create order")
 
-        # Generate order ID
-        order_id = str(uuid.uuid4())
+    if response is not None:
+        response['headers']['Idempotent-Replayed'] = 'true'
+        return response
 
-        # Validate required fields
-        if 'total_amount' not in body:
-            return error_response(400, "Missing required field: total_amount")
+    response = create_order(event, customer_id)
+    try:
+        # Client errors are final for this body, server errors may be retried
+        if response['statusCode'] >= 500:
+            store.release(key)
+        else:
+            store.complete(key, request_hash, response)
+    except Exception as e:
+        # The order exists: report it, a retry will be told to wait until the lock expires
+        logger.error("Error storing idempotency record: %s", e)
+    return response
 
-        # Use authenticated customer_id or from body
-        customer_id = customer_id or body.get('customer_id')
-        if not customer_id:
-            return error_response(400, "customer_id is required")
 
-        # Create order object
-        order = Order(
-            order_id=order_id,
-            customer_id=customer_id,
-            status=OrderStatus(body.get('status', 'PENDING')),
-            total_amount=Decimal(str(body.get('total_amount', 0))),
-            created_at=datetime.utcnow().isoformat(),
-            items=body.get('items', [])
-        )
+def create_order(event: Dict[str, Any], customer_id: str) -> Dict[str, Any]:
+    """Validate and store the order of a POST /v1/orders"""
+    repository = get_repository()
+    try:
+        body = json.loads(request_body(event, '{}'))
 
-        # Validate order
+        # Build and validate order
+        order = Order.from_request(body, customer_id)
         errors = order.validate()
         if errors:
             return error_response(400, f"Validation errors: {', '.join(errors)}")
@@ -118,29 +367,117 @@ def handle_create_order(event: Dict[str, Any], customer_id: str) -> Dict[str, An
         # Save to DynamoDB
         created_order = repository.create_order(order)
 
-        logger.info(f"Order created: {order_id}")
+        logger.info("Order created: %s", order.order_id)
         return success_response(201, created_order.to_dict())
 
     except ValueError as e:
         return error_response(400, f"Invalid input: {str(e)}")
     except Exception as e:
-        logger.error(f"Error creating order: {str(e)}")
+        logger.error("Error creating order: %s", e)
         return error_response(500, "Failed to create order")
 
 
-def handle_get_order(order_id: str) -> Dict[str, Any]:
-    """Handle GET /v1/orders/{id}"""
+def handle_create_orders_batch(event: Dict[str, Any], customer_id: str) -> Dict[str, Any]:
+    """Handle POST /v1/orders:batch"""
     repository = get_repository()
     try:
-        order = repository.get_order(order_id)
+        body = json.loads(request_body(event) or '{}')
+        payloads = body.get('orders') if isinstance(body, dict) else None
+        if not isinstance(payloads, list) or not payloads:
+            return error_response(400, "orders must be a non-empty list")
+        if len(payloads) > MAX_BATCH_ORDERS:
+            return error_response(400, f"A batch can contain at most {MAX_BATCH_ORDERS} orders")
+
+        # Validate every order up front, only valid ones are written
+        results = []
+        valid_orders = []
+        for index, payload in enumerate(payloads):
+            try:
+                order = Order.from_request(payload, customer_id)
+                errors = order.validate()
+            except ValueError as e:
+                order, errors = None, [str(e)]
+
+            if errors:
+                results.append({'index': index, 'status': 'FAILED', 'error': ', '.join(errors)})
+            else:
+                results.append({'index': index, 'order_id': order.order_id, 'status': 'CREATED'})
+                valid_orders.append(order)
+
+        failed_ids = set()
+        orders_by_id = {}
+        if valid_orders:
+            created, failed = repository.create_orders(valid_orders)
+            failed_ids = {order.order_id for order in failed}
+            orders_by_id = {order.order_id: order for order in created}
+
+        for result in results:
+            order_id = result.get('order_id')
+            if order_id in failed_ids:
+                result['status'] = 'FAILED'
+                result['error'] = "Failed to write order"
+            elif order_id:
+                result['order'] = orders_by_id[order_id].to_dict()
+
+        created_count = sum(1 for result in results if result['status'] == 'CREATED')
+        logger.info("Batch created %s of %s orders", created_count, len(results))
+        return success_response(201 if created_count == len(results) else 207, {
+            'results': results,
+            'created': created_count,
+            'failed': len(results) - created_count
+        })
+
+    except ValueError as e:
+        return error_response(400, f"Invalid input: {str(e)}")
+    except Exception as e:
+        logger.error("Error creating orders batch: %s", e)
+        return error_response(500, "Failed to create orders")
+
+
+def handle_get_order(
+    order_id: str,
+    query_params: Optional[Dict[str, str]] = None,
+    event: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Handle GET /v1/orders/{id}, answering 304 when If-None-Match still matches"""
+    repository = get_repository()
+    try:
+        fields = parse_fields((query_params or {}).get('fields'))
+
+        if_none_match = get_header(event or {}, 'If-None-Match')
+        if if_none_match:
+            # Polling clients mostly revalidate: read only the version first
+            # and skip the full read and serialization when it did not change
+            current = repository.get_order(order_id, fields=ETAG_FIELDS)
+            if not current:
+                return error_response(404, "Order not found")
+            etag = representation_etag(current, fields)
+            if etag_matches(if_none_match, etag):
+                headers = BASE_HEADERS.copy()
+                headers['ETag'] = etag
+                return {
+                    'statusCode': 304,
+                    'headers': headers,
+                    'body': ''
+                }
+
+        if fields is None:
+            order = repository.get_order(order_id)
+        else:
+            # The ETag needs the version even when the client did not ask for it
+            order = repository.get_order(order_id, fields=set(fields).union(ETAG_FIELDS))
 
         if not order:
             return error_response(404, "Order not found")
 
-        return success_response(200, order.to_dict())
+        response = success_response(200, order.to_dict(fields))
+        response['headers']['ETag'] = representation_etag(order, fields)
+        return response
 
+    except ValueError as e:
+        return error_response(400, f"Invalid input: {str(e)}")
     except Exception as e:
-        logger.error(f"Error getting order: {str(e)}")
+        logger.error("Error getting order: %s", e)
         return error_response(500, "Failed to get order")
 
 
@@ -148,94 +485,279 @@ def handle_list_orders(event: Dict[str, Any], query_params: Dict[str, str]) -> D
     """Handle GET /v1/orders"""
     repository = get_repository()
     try:
-        customer_id = query_params.get('customer_id')
-        limit = int(query_params.get('limit', 50))
+        if query_params.get('ids'):
+            order_ids = [order_id.strip() for order_id in query_params['ids'].split(',') if order_id.strip()]
+            return handle_get_orders(order_ids)
 
-        orders = repository.list_orders(customer_id=customer_id, limit=limit)
+        customer_id = query_params.get('customer_id')
+        limit = int(query_params.get('limit', DEFAULT_PAGE_SIZE))
+        if limit < 1 or limit > MAX_PAGE_SIZE:
+            return error_response(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+
+        # Only validate here, the repository decides index or scan
+        status = query_params.get('status')
+        if status:
+            status = OrderStatus(status.upper()).value
+
+        created_from = parse_time_bound(query_params.get('from'))
+        created_to = parse_time_bound(query_params.get('to'), end=True)
+        indexed = customer_id or (status and codec.status_index_key(status) is not None)
+        if (created_from or created_to) and not indexed:
+            # Without an index the range would be a filtered full scan; terminal
+            # statuses are only in StatusIndex with STATUS_INDEX_TERMINAL
+            return error_response(400, "from/to require customer_id or a status in StatusIndex")
+        if created_from and created_to and created_from > created_to:
+            return error_response(400, "from must not be after to")
+
+        fields = parse_fields(query_params.get('fields'))
+
+        sort_order = query_params.get('order', 'desc').lower()
+        if sort_order not in ('asc', 'desc'):
+            return error_response(400, "order must be 'asc' or 'desc'")
+
+        orders, next_token = repository.list_orders_page(
+            customer_id=customer_id,
+            limit=limit,
+            next_token=query_params.get('next_token'),
+            status=status,
+            created_from=created_from,
+            created_to=created_to,
+            ascending=sort_order == 'asc',
+            fields=fields
+        )
 
         return success_response(200, {
-            'orders': [order.to_dict() for order in orders],
-            'count': len(orders)
+            'orders': [order.to_dict(fields) for order in orders],
+            'count': len(orders),
+            'next_token': next_token
         })
 
+    except ValueError as e:
+        return error_response(400, f"Invalid input: {str(e)}")
     except Exception as e:
-        logger.error(f"Error listing orders: {str(e)}")
+        logger.error("Error listing orders: %s", e)
         return error_response(500, "Failed to list orders")
 
 
-def handle_update_order(order_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
-    """Handle PUT /v1/orders/{id}"""
+def parse_fields(value: Optional[str]) -> Optional[tuple]:
+    """
+    Parse fields=status,total_amount into the attributes to return, None
+    for the whole order. order_id is always included.
+    """
+    if value is None:
+        return None
+    fields = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = fields.difference(ORDER_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in ORDER_FIELDS if name in fields or name == 'order_id')
+
+
+def parse_time_bound(value: Optional[str], end: bool = False) -> Optional[str]:
+    """
+    Turn a from/to query value into the format created_at is stored in
+    (naive UTC ISO-8601), so it can be compared as a string. Offsets are
+    converted to UTC, and a bare date as `to` covers that whole day.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and 'T' not in value:
+        parsed = parsed.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return parsed.isoformat()
+
+
+def handle_get_orders(order_ids: List[str]) -> Dict[str, Any]:
+    """Handle GET /v1/orders?ids=a,b,c"""
     repository = get_repository()
     try:
-        body = json.loads(event.get('body', '{}'))
-
-        # Check if order exists
-        existing_order = repository.get_order(order_id)
-        if not existing_order:
-            return error_response(404, "Order not found")
+        if len(order_ids) > MAX_BATCH_GET_IDS:
+            return error_response(400, f"At most {MAX_BATCH_GET_IDS} ids can be requested at once")
 
-        # Update order fields
-        if 'status' in body:
-            existing_order.status = OrderStatus(body['status'])
-        if 'total_amount' in body:
-            existing_order.total_amount = Decimal(str(body['total_amount']))
-        if 'items' in body:
-            existing_order.items = body['items']
+        results = repository.get_orders(order_ids)
 
-        # Update timestamp
-        existing_order.updated_at = datetime.utcnow()
+        orders = [order.to_dict() for order in results.values() if order]
+        return success_response(200, {
+            'orders': orders,
+            'missing': [order_id for order_id, order in results.items() if not order],
+            'count': len(orders)
+        })
 
-        # Save updated order
-        updated_order = repository.update_order(existing_order)
+    except Exception as e:
+        logger.error("Error getting orders: %s", e)
+        return error_response(500, "Failed to get orders")
 
-        logger.info(f"Order updated: {order_id}")
-        return success_response(200, updated_order.to_dict())
 
+def handle_update_order(order_id: str, event: Dict[str, Any]) -> Dict[str, Any]:
+    """Handle PUT /v1/orders/{id}"""
+    repository = get_repository()
+    try:
+        body = json.loads(request_body(event) or '{}')
+        if not isinstance(body, dict):
+            return error_response(400, "Invalid input: body must be a JSON object")
+
+        updates = parse_order_updates(body)
+        if not updates:
+            return error_response(400, "Nothing to update: send status, total_amount or items")
+
+        # Optimistic concurrency: If-Match header or version in the body
+        if_match = get_header(event, 'If-Match')
+        expected_version = None
+        if if_match is not None and if_match.strip() != '*':
+            # If-Match uses the strong comparison, a weak tag never matches
+            if if_match.strip().startswith('W/'):
+                return error_response(412, "If-Match needs a strong ETag")
+            expected_version = etag_version(if_match)
+        elif if_match is None and body.get('version') is not None:
+            expected_version = etag_version(str(body['version']))
+        # If-Match: * only needs the order to exist, which the update checks
+
+        # Single conditional write, no pre-read
+        updated_order = repository.update_order_fields(order_id, updates, expected_version=expected_version)
+
+        logger.info("Order updated: %s", order_id)
+        response = success_response(200, updated_order.to_dict())
+        response['headers']['ETag'] = updated_order.etag
+        return response
+
+    except OrderNotFoundError:
+        return error_response(404, "Order not found")
+    except OrderConflictError as e:
+        return error_response(409, f"Order was modified concurrently, current version is {e.current_version}")
     except ValueError as e:
         return error_response(400, f"Invalid input: {str(e)}")
     except Exception as e:
-        logger.error(f"Error updating order: {str(e)}")
+        logger.error("Error updating order: %s", e)
         return error_response(500, "Failed to update order")
 
 
-def handle_delete_order(order_id: str) -> Dict[str, Any]:
+def parse_order_updates(body: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate the updatable fields of a PUT body"""
+    updates = {}
+    if 'status' in body:
+        updates['status'] = Order.status_from_request(body['status'])
+    if 'total_amount' in body:
+        updates['total_amount'] = Order.amount_from_request(body['total_amount'])
+        if updates['total_amount'] <= 0:
+            raise ValueError("total_amount must be greater than 0")
+    if 'items' in body:
+        updates['items'] = Order.items_from_request(body['items'])
+    return updates
+
+
+def handle_delete_order(order_id: str, event: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """Handle DELETE /v1/orders/{id}"""
     repository = get_repository()
     try:
-        # Check if order exists
-        existing_order = repository.get_order(order_id)
-        if not existing_order:
-            return error_response(404, "Order not found")
-
-        # Delete order
-        repository.delete_order(order_id)
-
-        logger.info(f"Order deleted: {order_id}")
+        # Prefer: return=representation asks for the deleted order back
+        return_order = 'return=representation' in (get_header(event or {}, 'Prefer') or '')
+
+        # Conditional delete, a missing order comes back as OrderNotFoundError
+        if return_order:
+            deleted_order = repository.delete_order(order_id, return_order=True)
+        else:
+            repository.delete_order(order_id)
+
+        logger.info("Order deleted: %s", order_id)
+        if return_order:
+            return success_response(200, deleted_order.to_dict())
         return {
             'statusCode': 204,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*'
-            },
+            'headers': BASE_HEADERS.copy(),
             'body': ''
         }
 
+    except OrderNotFoundError:
+        return error_response(404, "Order not found")
+    except RepositoryThrottledError:
+        response = error_response(503, "Service busy, retry later")
+        response['headers']['Retry-After'] = '1'
+        return response
     except Exception as e:
-        logger.error(f"Error deleting order: {str(e)}")
+        logger.error("Error deleting order: %s", e)
         return error_response(500, "Failed to delete order")
 
 
+def handle_get_customer_summary(customer_id: str) -> Dict[str, Any]:
+    """Handle GET /v1/customers/{id}/summary"""
+    try:
+        return success_response(200, get_summary_store().get_summary(customer_id))
+    except Exception as e:
+        logger.error("Error getting customer summary: %s", e)
+        return error_response(500, "Failed to get customer summary")
+
+
+# Route table: path template -> HTTP method -> handler(event, path_params)
+ROUTER = Router()
+ROUTER.add('/v1/orders', {
+    'GET': lambda event, params: handle_list_orders(event, event.get('queryStringParameters') or {}),
+    'POST': lambda event, params: handle_create_order(event, get_customer_id(event))
+})
+ROUTER.add('/v1/orders:batch', {
+    'POST': lambda event, params: handle_create_orders_batch(event, get_customer_id(event))
+})
+ROUTER.add('/v1/orders/{id}', {
+    'GET': lambda event, params: handle_get_order(
+        params['id'], event.get('queryStringParameters') or {}, event
+    ),
+    'PUT': lambda event, params: handle_update_order(params['id'], event),
+    'DELETE': lambda event, params: handle_delete_order(params['id'], event)
+})
+ROUTER.add('/v1/customers/{id}/summary', {
+    'GET': lambda event, params: handle_get_customer_summary(params['id'])
+})
+
+
+def get_header(event: Dict[str, Any], name: str) -> Optional[str]:
+    """Case-insensitive request header lookup"""
+    headers = event.get('headers') or {}
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def etag_version(value: str) -> int:
+    """Version in an If-Match value: a strong ETag from a GET/PUT or a bare number"""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        value = value[1:-1].split('-')[0]
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError("If-Match must be an ETag or a version number")
+
+
+def representation_etag(order: Order, fields: Optional[tuple] = None) -> str:
+    """
+    ETag of a GET response: the order's, plus a hash of the fieldset for
+    sparse responses, since each fieldset is a different representation.
+    The version stays first so the ETag still works as If-Match.
+    """
+    if fields is None:
+        return order.etag
+    return f'{order.etag[:-1]}-{zlib.crc32(",".join(fields).encode()):08x}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check, with the weak comparison RFC 9110 asks for"""
+    if if_none_match.strip() == '*':
+        return True
+    return any(
+        candidate.strip().removeprefix('W/') == etag
+        for candidate in if_none_match.split(',')
+    )
+
+
 def success_response(status_code: int, data: Dict[str, Any]) -> Dict[str, Any]:
     """Build a successful API Gateway response"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*',
-            'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
-            'Access-Control-Allow-Methods': 'GET,POST,PUT,DELETE,OPTIONS'
-        },
-        'body': json.dumps(data, default=str)
+        'headers': SUCCESS_HEADERS.copy(),
+        'body': dumps(data)
     }
 
 
@@ -243,11 +765,8 @@ def error_response(status_code: int, message: str) -> Dict[str, Any]:
     """Build an error API Gateway response"""
     return {
         'statusCode': status_code,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'body': json.dumps({
+        'headers': BASE_HEADERS.copy(),
+        'body': dumps({
             'error': message,
             'timestamp': datetime.utcnow().isoformat()
         })
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Optional, Dict, Any, Callable
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+try:
+    from orders.exceptions import IdempotencyKeyReusedError, IdempotencyInProgressError
+    from orders.table import DynamoTable, create_client
+    from orders.metrics import MetricsRecorder
+except ImportError:
+    # For Lambda execution environment
+    from exceptions import IdempotencyKeyReusedError, IdempotencyInProgressError
+    from table import DynamoTable, create_client
+    from metrics import MetricsRecorder
+
+logger = logging.getLogger()
+
+IN_PROGRESS = 'IN_PROGRESS'
+COMPLETED = 'COMPLETED'
+
+# How long a stored response is replayed (DynamoDB TTL on expires_at)
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+
+# How long an in-progress record blocks retries: the Lambda timeout, after
+# which the first request can no longer complete it
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "30"))
+
+
+def fingerprint(body: Optional[str]) -> str:
+    """Hash of a request body, to detect a key reused for another request"""
+    return hashlib.sha256((body or '').encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Idempotency records in their own DynamoDB table, one per key.
+
+    The first request takes the key with a conditional PutItem (IN_PROGRESS),
+    runs and stores its response (COMPLETED). Retries read the record and get
+    the stored response back without running the handler again.
+    """
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        client=None,
+        metrics: Optional[MetricsRecorder] = None,
+        ttl_seconds: int = IDEMPOTENCY_TTL_SECONDS,
+        lock_seconds: int = IDEMPOTENCY_LOCK_SECONDS,
+        clock: Callable[[], float] = time.time
+    ):
+        self.table_name = table_name or os.getenv('IDEMPOTENCY_TABLE')
+        if not self.table_name:
+            raise ValueError("table_name must be provided or IDEMPOTENCY_TABLE environment variable must be set")
+        self.table = DynamoTable(client or create_client(), self.table_name, metrics=metrics)
+        self.ttl_seconds = ttl_seconds
+        self.lock_seconds = lock_seconds
+        self._clock = clock
+
+    @classmethod
+    def from_env(cls, metrics: Optional[MetricsRecorder] = None) -> Optional['IdempotencyStore']:
+        """Build a store from IDEMPOTENCY_TABLE, None when disabled"""
+        if not os.getenv('IDEMPOTENCY_TABLE'):
+            return None
+        return cls(metrics=metrics)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Live record of a key, None when there is none or it expired"""
+        item = self.table.get_item(Key={'idempotency_key': key}).get('Item')
+        # TTL deletes lag behind expires_at, so check it here
+        if item is None or item['expires_at'] <= int(self._clock()):
+            return None
+        return item
+
+    def lock(self, key: str, request_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Take a key for a new request. Returns None when taken, or the live
+        record of whoever holds it.
+        """
+        now = int(self._clock())
+        try:
+            self.table.put_item(
+                Item={
+                    'idempotency_key': key,
+                    'state': IN_PROGRESS,
+                    'fingerprint': request_hash,
+                    'expires_at': now + self.lock_seconds
+                },
+                ConditionExpression=Attr('idempotency_key').not_exists() | Attr('expires_at').lte(now),
+                ReturnValuesOnConditionCheckFailure='ALL_OLD'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            current = e.response.get('Item')
+            return self.table.deserialize(current) if current else self.get(key)
+        return None
+
+    def complete(self, key: str, request_hash: str, response: Dict[str, Any]) -> None:
+        """Store the response retries get back"""
+        self.table.put_item(Item={
+            'idempotency_key': key,
+            'state': COMPLETED,
+            'fingerprint': request_hash,
+            'response': json.dumps(response, separators=(',', ':')),
+            'expires_at': int(self._clock()) + self.ttl_seconds
+        })
+
+    def release(self, key: str) -> None:
+        """Drop a key whose request failed, so a retry runs it again"""
+        self.table.delete_item(Key={'idempotency_key': key})
+
+    def replay(self, key: str, request_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored response for a key, None when the caller now holds the key
+        and must run the request and complete() or release() it.
+
+        Raises IdempotencyKeyReusedError when the key belongs to another
+        request and IdempotencyInProgressError when its first request is
+        still running.
+        """
+        # Retries are served by this single read
+        record = self.get(key) or self.lock(key, request_hash)
+        if record is None:
+            return None
+        if record['fingerprint'] != request_hash:
+            raise IdempotencyKeyReusedError(key)
+        if record['state'] != COMPLETED:
+            raise IdempotencyInProgressError(key)
+        return json.loads(record['response'])
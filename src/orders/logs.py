@@ -0,0 +1,194 @@
+import logging
+import os
+import random
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Optional
+
+try:
+    from orders.encoding import dumps
+except ImportError:
+    # For Lambda execution environment
+    from encoding import dumps
+
+REDACTED = '[REDACTED]'
+
+# Headers never written to the logs (compared lowercase)
+SENSITIVE_HEADERS = frozenset({
+    'authorization', 'cookie', 'set-cookie', 'x-api-key', 'x-amz-security-token'
+})
+
+# JWT claims kept in event dumps, everything else (email, groups...) is dropped
+KEPT_CLAIMS = frozenset({'sub'})
+
+# Attributes every LogRecord has, anything else came in through extra=
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def parse_sample_rates(value: Optional[str]) -> Dict[int, float]:
+    """Parse "DEBUG=0.01,INFO=0.1" into {level number: rate}"""
+    rates = {}
+    for entry in (value or '').split(','):
+        if not entry.strip():
+            continue
+        name, _, rate = entry.partition('=')
+        level = logging.getLevelName(name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"Unknown log level in sample rates: {name!r}")
+        rates[level] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class RequestSampler:
+    """
+    Decides once per invocation which log levels a request emits.
+
+    A single random draw is compared against every level's rate, so a
+    request logged at DEBUG (low rate) is also logged at INFO (higher rate)
+    and its lines are never half sampled.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[int, float]] = None,
+        event_rate: float = 0.0,
+        random_source: Callable[[], float] = random.random
+    ):
+        self.rates = rates or {}
+        self.event_rate = event_rate
+        self._random = random_source
+        self.request_id: Optional[str] = None
+        self.draw = 0.0
+
+    def start(self, request_id: Optional[str] = None) -> None:
+        """Start a new invocation"""
+        self.request_id = request_id
+        self.draw = self._random()
+
+    def sampled(self, levelno: int) -> bool:
+        return self.draw < self.rates.get(levelno, 1.0)
+
+    @property
+    def event_sampled(self) -> bool:
+        return self.draw < self.event_rate
+
+
+class SamplingFilter(logging.Filter):
+    """Drop records of unsampled requests and tag the rest with the request id"""
+
+    def __init__(self, sampler: RequestSampler):
+        super().__init__()
+        self.sampler = sampler
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = self.sampler.request_id
+        # Records logged with extra={'sampled': True} were sampled already
+        return getattr(record, 'sampled', False) or self.sampler.sampled(record.levelno)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with extra= fields as top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'logger': record.name or 'root'
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return dumps(entry)
+
+
+def redact_headers(headers: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not headers:
+        return headers
+    return {
+        name: REDACTED if name.lower() in SENSITIVE_HEADERS else value
+        for name, value in headers.items()
+    }
+
+
+def redact_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of an API Gateway event that is safe to log"""
+    redacted = dict(event)
+    redacted['headers'] = redact_headers(event.get('headers'))
+    redacted['multiValueHeaders'] = redact_headers(event.get('multiValueHeaders'))
+    if event.get('body') is not None:
+        redacted['body'] = f"{REDACTED} ({len(event['body'])} chars)"
+
+    request_context = event.get('requestContext')
+    claims = ((request_context or {}).get('authorizer') or {}).get('claims')
+    if claims:
+        redacted['requestContext'] = dict(request_context, authorizer=dict(
+            request_context['authorizer'],
+            claims={name: value for name, value in claims.items() if name in KEPT_CLAIMS}
+        ))
+    return redacted
+
+
+# Shared by the handler: one sampler per container, restarted per invocation
+sampler = RequestSampler()
+
+
+def configure(
+    level: Optional[str] = None,
+    sample_rates: Optional[str] = None,
+    event_sample_rate: Optional[str] = None,
+    handlers: Optional[Iterable[logging.Handler]] = None
+) -> RequestSampler:
+    """
+    Configure the root logger from LOG_LEVEL, LOG_SAMPLE_RATES and
+    LOG_EVENT_SAMPLE_RATE.
+
+    The JSON formatter goes on `handlers`, by default the root handlers
+    when running in Lambda (locally and in tests output is left alone).
+    """
+    root = logging.getLogger()
+    root.setLevel(level or os.getenv("LOG_LEVEL", "INFO"))
+
+    sampler.rates = parse_sample_rates(
+        sample_rates if sample_rates is not None else os.getenv("LOG_SAMPLE_RATES")
+    )
+    sampler.event_rate = float(
+        event_sample_rate if event_sample_rate is not None else os.getenv("LOG_EVENT_SAMPLE_RATE", "0")
+    )
+
+    # Logger filters only see records logged on that logger, which is the
+    # root logger for every module here
+    for existing in [f for f in root.filters if isinstance(f, SamplingFilter)]:
+        root.removeFilter(existing)
+    root.addFilter(SamplingFilter(sampler))
+
+    if handlers is None:
+        handlers = root.handlers if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else ()
+    for handler in handlers:
+        handler.setFormatter(JsonFormatter())
+    return sampler
+
+
+def log_request(
+    logger: logging.Logger,
+    event: Dict[str, Any],
+    status_code: int,
+    duration_ms: float
+) -> None:
+    """
+    One summary line per request. The redacted event is only included for
+    sampled requests and server errors, which are always logged.
+    """
+    fields = {
+        'method': event.get('httpMethod'),
+        'path': event.get('path'),
+        'status': status_code,
+        'duration_ms': round(duration_ms, 2)
+    }
+    if status_code >= 500:
+        logger.error("Request failed", extra=dict(fields, event=redact_event(event), sampled=True))
+    elif sampler.event_sampled:
+        logger.info("Request", extra=dict(fields, event=redact_event(event), sampled=True))
+    else:
+        logger.info("Request", extra=fields)
@@ -0,0 +1,250 @@
+import bisect
+import itertools
+import logging
+import threading
+from typing import Optional, List, Tuple, Dict, Iterator, Iterable, Union, Any
+
+try:
+    from orders.models import Order, OrderStatus
+    from orders.exceptions import OrderNotFoundError, OrderConflictError
+    from orders.pagination import encode_token, decode_token
+    from orders.metrics import MetricsRecorder, timed
+    from orders.store import OrderStore, apply_updates, page_scope
+except ImportError:
+    # For Lambda execution environment
+    from models import Order, OrderStatus
+    from exceptions import OrderNotFoundError, OrderConflictError
+    from pagination import encode_token, decode_token
+    from metrics import MetricsRecorder, timed
+    from store import OrderStore, apply_updates, page_scope
+
+logger = logging.getLogger()
+
+# Sorts after every order_id, bounds (created_at, order_id) index lookups
+_MAX_ID = '\U0010ffff'
+
+
+class InMemoryOrderRepository(OrderStore):
+    """
+    Order store kept in process memory, for local load tests and profiling.
+
+    Orders are stored as to_dict() records so callers never share objects
+    with the store. Sorted (created_at, order_id) indexes per customer and
+    per status mirror CustomerIndex and StatusIndex, and a sorted list of
+    ids stands in for the scan order, so pages resume with a bisect
+    instead of a full pass.
+    """
+
+    def __init__(self, metrics: Optional[MetricsRecorder] = None):
+        self.metrics = metrics
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._ids: List[str] = []
+        self._by_customer: Dict[str, List[Tuple[str, str]]] = {}
+        self._by_status: Dict[str, List[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+
+    def _put(self, record: Dict[str, Any]) -> None:
+        order_id = record['order_id']
+        previous = self._records.get(order_id)
+        if previous is None:
+            bisect.insort(self._ids, order_id)
+        else:
+            self._unindex(previous)
+        self._records[order_id] = record
+        for index, value in self._index_values(record):
+            bisect.insort(index.setdefault(value, []), _index_key(record))
+
+    def _unindex(self, record: Dict[str, Any]) -> None:
+        for index, value in self._index_values(record):
+            entries = index.get(value, [])
+            position = bisect.bisect_left(entries, _index_key(record))
+            if position < len(entries) and entries[position] == _index_key(record):
+                del entries[position]
+
+    def _index_values(self, record: Dict[str, Any]) -> Tuple[tuple, tuple]:
+        return (self._by_customer, record['customer_id']), (self._by_status, record['status'])
+
+    @timed
+    def create_order(self, order: Order) -> Order:
+        """Create a new order"""
+        with self._lock:
+            self._put(order.to_dict())
+        logger.info("Created order: %s", order.order_id)
+        return order
+
+    @timed
+    def create_orders(self, orders: List[Order]) -> Tuple[List[Order], List[Order]]:
+        """Create orders in bulk, returns (created, failed)"""
+        with self._lock:
+            for order in orders:
+                self._put(order.to_dict())
+        logger.info("Created %s orders in bulk, 0 failed", len(orders))
+        return list(orders), []
+
+    @timed
+    def get_order(self, order_id: str, fields: Optional[Iterable[str]] = None) -> Optional[Order]:
+        """Get order by ID, always whole (fields only trims the response)"""
+        record = self._records.get(order_id)
+        if record is None:
+            logger.warning("Order not found: %s", order_id)
+            return None
+        return Order.from_dict(record)
+
+    @timed
+    def get_orders(self, order_ids: List[str]) -> Dict[str, Optional[Order]]:
+        """Get many orders by ID, keyed in request order with None for misses"""
+        results: Dict[str, Optional[Order]] = dict.fromkeys(order_ids)
+        for order_id in results:
+            record = self._records.get(order_id)
+            if record is not None:
+                results[order_id] = Order.from_dict(record)
+        return results
+
+    @timed
+    def list_orders_page(
+        self,
+        customer_id: Optional[str] = None,
+        limit: int = 50,
+        next_token: Optional[str] = None,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        ascending: bool = False,
+        fields: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Order], Optional[str]]:
+        """List one page of orders and the token to fetch the next one"""
+        # Same token scope as the DynamoDB repository
+        scope = page_scope(customer_id, status, created_from, created_to, ascending)
+        records, last_key = self._page(
+            limit, decode_token(next_token, scope),
+            customer_id=customer_id, status=status,
+            created_from=created_from, created_to=created_to, ascending=ascending
+        )
+        orders = [Order.from_dict(record) for record in records]
+        logger.info("Listed %s orders", len(orders))
+        return orders, encode_token(last_key, scope)
+
+    def _page(
+        self,
+        limit: int,
+        start_key: Optional[Dict[str, Any]],
+        customer_id: Optional[str] = None,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        ascending: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Records of one page and the key of the last one, None on the last page"""
+        status = OrderStatus(status).value if status else None
+
+        def matches(record: Dict[str, Any]) -> bool:
+            created_at = record['created_at']
+            return (
+                (status is None or record['status'] == status)
+                and (not created_from or created_at >= created_from)
+                and (not created_to or created_at <= created_to)
+            )
+
+        with self._lock:
+            if customer_id or status:
+                # The created_at range and the token become positions in the
+                # sorted index, then it is walked in either direction
+                entries = self._by_customer.get(customer_id, []) if customer_id else self._by_status.get(status, [])
+                low = bisect.bisect_left(entries, (created_from,)) if created_from else 0
+                high = bisect.bisect_right(entries, (created_to, _MAX_ID)) if created_to else len(entries)
+                if start_key:
+                    key = (start_key['created_at'], start_key['order_id'])
+                    if ascending:
+                        low = max(low, bisect.bisect_right(entries, key))
+                    else:
+                        high = min(high, bisect.bisect_left(entries, key))
+                positions = range(low, high) if ascending else range(high - 1, low - 1, -1)
+                candidates = (entries[position][1] for position in positions)
+            else:
+                start = bisect.bisect_right(self._ids, start_key['order_id']) if start_key else 0
+                candidates = itertools.islice(self._ids, start, None)
+
+            records, has_more = [], False
+            for order_id in candidates:
+                record = self._records[order_id]
+                if not matches(record):
+                    continue
+                if len(records) == limit:
+                    has_more = True
+                    break
+                records.append(record)
+
+        if not (has_more and records):
+            return records, None
+        last = records[-1]
+        return records, {'order_id': last['order_id'], 'created_at': last['created_at']}
+
+    def scan_orders(self, *args, **kwargs) -> Iterator[Order]:
+        """Yield every order, segment options are accepted and ignored"""
+        with self._lock:
+            records = list(self._records.values())
+        for record in records:
+            yield Order.from_dict(record)
+
+    @timed
+    def update_order(self, order: Order) -> Order:
+        """Update an order"""
+        with self._lock:
+            self._put(order.to_dict())
+        logger.info("Updated order: %s", order.order_id)
+        return order
+
+    @timed
+    def update_order_fields(
+        self,
+        order_id: str,
+        updates: dict,
+        expected_version: Optional[int] = None
+    ) -> Order:
+        """Update specific fields of an order, checking the version"""
+        try:
+            with self._lock:
+                record = apply_updates(order_id, self._records.get(order_id), updates, expected_version)
+                self._put(record)
+        except (OrderNotFoundError, OrderConflictError) as e:
+            logger.warning("%s", e)
+            raise
+
+        order = Order.from_dict(record)
+        logger.info("Updated order: %s to version %s", order_id, order.version)
+        return order
+
+    @timed
+    def delete_order(self, order_id: str, return_order: bool = False) -> Union[bool, Order]:
+        """Delete an order, optionally returning what was deleted"""
+        with self._lock:
+            record = self._records.pop(order_id, None)
+            if record is not None:
+                del self._ids[bisect.bisect_left(self._ids, order_id)]
+                self._unindex(record)
+
+        if record is None:
+            logger.warning("Order not found: %s", order_id)
+            raise OrderNotFoundError(order_id)
+
+        logger.info("Deleted order: %s", order_id)
+        return Order.from_dict(record) if return_order else True
+
+    @timed
+    def get_orders_by_customer(
+        self,
+        customer_id: str,
+        limit: int = 100,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> list:
+        """Get the orders of a customer, optionally only those created in a range"""
+        records, _ = self._page(
+            limit, None, customer_id=customer_id, created_from=created_from, created_to=created_to
+        )
+        logger.info("Retrieved %s orders for customer: %s", len(records), customer_id)
+        return [Order.from_dict(record) for record in records]
+
+
+def _index_key(record: Dict[str, Any]) -> Tuple[str, str]:
+    return record['created_at'], record['order_id']
@@ -0,0 +1,178 @@
+import functools
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+try:
+    from orders.encoding import dumps
+except ImportError:
+    # For Lambda execution environment
+    from encoding import dumps
+
+# Metric name -> CloudWatch unit, in the order they are written
+METRIC_UNITS = {
+    'Latency': 'Milliseconds',
+    'ConsumedCapacity': 'Count',
+    'ItemCount': 'Count',
+    'CacheHit': 'Count'
+}
+
+# EMF accepts at most 100 values per metric and line
+MAX_VALUES_PER_LINE = 100
+
+
+class Measurement:
+    """Values of one timed operation, filled in by the code being timed"""
+
+    __slots__ = ('operation', 'capacity', 'items', 'cache_hit')
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.capacity: Optional[float] = None
+        self.items: Optional[int] = None
+        self.cache_hit: Optional[bool] = None
+
+
+class MetricsRecorder:
+    """
+    Buffers per-operation measurements and writes them as CloudWatch
+    Embedded Metric Format lines, one line per operation and flush.
+
+    CloudWatch extracts the metrics from the log lines, so no PutMetricData
+    calls are made from the request path.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        write: Callable[[str], Any] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.namespace = namespace
+        self._write = write or self._stdout
+        self._clock = clock
+        self._values: Dict[str, Dict[str, List[float]]] = {}
+        # Running total of DynamoDB capacity, operations that wrap DynamoDB
+        # calls (repository methods, endpoints) are charged the difference
+        self.total_capacity = 0.0
+
+    @classmethod
+    def from_env(cls) -> Optional['MetricsRecorder']:
+        """Build a recorder from METRICS_NAMESPACE, None when it is not set"""
+        namespace = os.getenv("METRICS_NAMESPACE")
+        return cls(namespace) if namespace else None
+
+    @staticmethod
+    def _stdout(line: str) -> None:
+        sys.stdout.write(line + '\n')
+
+    def add_capacity(self, units: float) -> None:
+        self.total_capacity += units
+
+    def record(self, measurement: Measurement, latency_ms: float) -> None:
+        values = self._values.setdefault(measurement.operation, {})
+        values.setdefault('Latency', []).append(round(latency_ms, 3))
+        if measurement.capacity is not None:
+            values.setdefault('ConsumedCapacity', []).append(measurement.capacity)
+        if measurement.items is not None:
+            values.setdefault('ItemCount', []).append(measurement.items)
+        if measurement.cache_hit is not None:
+            values.setdefault('CacheHit', []).append(1 if measurement.cache_hit else 0)
+
+    def flush(self) -> int:
+        """Write buffered values as EMF lines, returns the number of lines"""
+        timestamp = int(self._clock() * 1000)
+        lines = 0
+        for operation, values in self._values.items():
+            for chunk in _chunks(values):
+                self._write(dumps({
+                    '_aws': {
+                        'Timestamp': timestamp,
+                        'CloudWatchMetrics': [{
+                            'Namespace': self.namespace,
+                            'Dimensions': [['Operation']],
+                            'Metrics': [
+                                {'Name': name, 'Unit': unit}
+                                for name, unit in METRIC_UNITS.items() if name in chunk
+                            ]
+                        }]
+                    },
+                    'Operation': operation,
+                    **chunk
+                }))
+                lines += 1
+        self._values = {}
+        return lines
+
+
+def _chunks(values: Dict[str, List[float]]) -> Iterator[Dict[str, List[float]]]:
+    longest = max(len(series) for series in values.values())
+    for start in range(0, longest, MAX_VALUES_PER_LINE):
+        chunk = {
+            name: series[start:start + MAX_VALUES_PER_LINE]
+            for name, series in values.items()
+        }
+        yield {name: series for name, series in chunk.items() if series}
+
+
+@contextmanager
+def measure(recorder: Optional[MetricsRecorder], operation: str) -> Iterator[Measurement]:
+    """
+    Time a block; the block may fill in capacity, items and cache_hit.
+
+    Unless the block sets it, capacity is whatever DynamoDB calls inside
+    the block consumed.
+    """
+    measurement = Measurement(operation)
+    capacity_before = recorder.total_capacity if recorder is not None else 0.0
+    start = time.perf_counter()
+    try:
+        yield measurement
+    finally:
+        if recorder is not None:
+            if measurement.capacity is None and recorder.total_capacity > capacity_before:
+                measurement.capacity = recorder.total_capacity - capacity_before
+            recorder.record(measurement, (time.perf_counter() - start) * 1000)
+
+
+def timed(method: Callable) -> Callable:
+    """
+    Record a repository method as OrderRepository.<name>, counting the
+    items it returned. No-op unless the instance has a metrics recorder.
+    """
+    operation = f'OrderRepository.{method.__name__}'
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.metrics is None:
+            return method(self, *args, **kwargs)
+        with measure(self.metrics, operation) as measurement:
+            result = method(self, *args, **kwargs)
+            measurement.items = _count(result)
+            return result
+    return wrapper
+
+
+def _count(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, tuple):
+        # (orders, next_token) and (created, failed)
+        return _count(result[0])
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return sum(1 for value in result.values() if value is not None)
+    return 1
+
+
+def consumed_capacity(response: Dict[str, Any]) -> Optional[float]:
+    """Total capacity units of a response, batch responses hold a list"""
+    consumed = response.get('ConsumedCapacity')
+    if consumed is None:
+        return None
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    return float(sum(entry.get('CapacityUnits', 0) for entry in consumed))
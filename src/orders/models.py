@@ -1,7 +1,25 @@
 from enum import Enum
-from typing import Optional, List
+from typing import Optional, List, Iterable
 from datetime import datetime
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
+import uuid
+import zlib
+
+
+def _to_decimal(value) -> Decimal:
+    """Decimal as-is, anything else through str() to avoid float artifacts"""
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+def _parse_timestamp(value):
+    """Parse ISO-8601 strings, leave datetimes and None untouched"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return value
+
+
+def _format_timestamp(value):
+    return value.isoformat() if isinstance(value, datetime) else value
 
 
 class OrderStatus(str, Enum):
@@ -15,9 +33,25 @@ class OrderStatus(str, Enum):
     COMPLETED = "COMPLETED"  # Keep for backward compatibility
 
 
+# Statuses an order does not leave once it reaches them
+TERMINAL_STATUSES = frozenset({OrderStatus.DELIVERED, OrderStatus.CANCELLED, OrderStatus.COMPLETED})
+
+# Attributes of a serialized order, in to_dict() order (also the names
+# accepted by the fields= query parameter)
+ORDER_FIELDS = (
+    'order_id', 'customer_id', 'status', 'total_amount',
+    'created_at', 'updated_at', 'items', 'version'
+)
+
+# What Order.etag is computed from, so a conditional GET can read only these
+ETAG_FIELDS = ('order_id', 'updated_at', 'version')
+
+
 class OrderItem:
     """Order item model"""
 
+    __slots__ = ('product_id', 'quantity', 'price')
+
     def __init__(self, product_id: str, quantity: int, price: Decimal):
         self.product_id = product_id
         self.quantity = quantity
@@ -37,13 +71,46 @@ class OrderItem:
         return cls(
             product_id=data["product_id"],
             quantity=data["quantity"],
-            price=Decimal(str(data["price"]))
+            price=_to_decimal(data["price"])
         )
 
+    @classmethod
+    def from_request(cls, data: dict) -> 'OrderItem':
+        """
+        Create an item from a request body, checking the JSON types: a wrong
+        type would otherwise only fail when DynamoDB rejects the write
+        """
+        if not isinstance(data, dict):
+            raise ValueError("items must be JSON objects")
+        product_id = data.get('product_id')
+        if not isinstance(product_id, str) or not product_id:
+            raise ValueError("product_id must be a non-empty string")
+        quantity = data.get('quantity')
+        if not isinstance(quantity, int) or isinstance(quantity, bool):
+            raise ValueError("quantity must be an integer")
+        price = data.get('price')
+        # Numeric strings are accepted, to_dict() returns prices as strings
+        if not isinstance(price, (int, float, Decimal, str)) or isinstance(price, bool):
+            raise ValueError("price must be a number")
+        try:
+            price = _to_decimal(price)
+        except InvalidOperation:
+            raise ValueError("price must be a number")
+        if not price.is_finite():
+            raise ValueError("price must be a finite number")
+        return cls(product_id=product_id, quantity=quantity, price=price)
+
 
 class Order:
     """Order domain model"""
 
+    # Timestamps are kept as given (ISO string or datetime) and only parsed
+    # when read, so listing and re-serializing orders never parses them
+    __slots__ = (
+        'order_id', 'customer_id', 'total_amount', 'status', 'items',
+        '_created_at', '_updated_at', 'version'
+    )
+
     def __init__(
         self,
         order_id: str,
@@ -52,7 +119,8 @@ class Order:
         status: OrderStatus,
         items: Optional[List[OrderItem]] = None,
         created_at: Optional[datetime] = None,
-        updated_at: Optional[datetime] = None
+        updated_at: Optional[datetime] = None,
+        version: int = 1
     ):
         # Validation
         if not order_id:
@@ -69,50 +137,158 @@ class Order:
         self.total_amount = total_amount
         self.status = status
         self.items = items or []
-        self.created_at = created_at or datetime.utcnow()
-        self.updated_at = updated_at or self.created_at
+        self._created_at = created_at or datetime.utcnow()
+        self._updated_at = updated_at or self._created_at
+        # Incremented on every write, used for optimistic concurrency
+        self.version = version
 
-    def to_dict(self) -> dict:
-        """Convert order to dictionary"""
+    @property
+    def created_at(self) -> datetime:
+        self._created_at = _parse_timestamp(self._created_at)
+        return self._created_at
+
+    @created_at.setter
+    def created_at(self, value) -> None:
+        self._created_at = value
+
+    @property
+    def updated_at(self) -> datetime:
+        self._updated_at = _parse_timestamp(self._updated_at)
+        return self._updated_at
+
+    @updated_at.setter
+    def updated_at(self, value) -> None:
+        self._updated_at = value
+
+    @property
+    def etag(self) -> str:
+        """
+        Strong ETag of the stored order, changing with every write: the
+        version, plus updated_at for records written before versioning.
+        Works on partial orders read with ETAG_FIELDS.
+        """
+        # Items written before versioning have none, the repositories read them as 0
+        version = getattr(self, 'version', 0)
+        updated_at = _format_timestamp(_parse_timestamp(getattr(self, '_updated_at', None))) or ''
+        return f'"{version}-{zlib.crc32(updated_at.encode()):08x}"'
+
+    def to_dict(self, fields: Optional[Iterable[str]] = None) -> dict:
+        """Convert order to dictionary, only `fields` when given"""
+        if fields is not None:
+            # Sparse fieldset: the other attributes are not serialized
+            # (nor, for partial orders, loaded at all)
+            return {name: _FIELD_SERIALIZERS[name](self) for name in ORDER_FIELDS if name in fields}
         return {
             "order_id": self.order_id,
             "customer_id": self.customer_id,
             "status": self.status.value if isinstance(self.status, OrderStatus) else self.status,
-            "total_amount": float(self.total_amount),
-            "created_at": self.created_at.isoformat() if isinstance(self.created_at, datetime) else self.created_at,
-            "updated_at": self.updated_at.isoformat() if isinstance(self.updated_at, datetime) else self.updated_at,
-            "items": [item.to_dict() if isinstance(item, OrderItem) else item for item in self.items]
+            "total_amount": self.total_amount,
+            "created_at": _format_timestamp(self._created_at),
+            "updated_at": _format_timestamp(self._updated_at),
+            "items": [item.to_dict() if isinstance(item, OrderItem) else item for item in self.items],
+            "version": self.version
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> 'Order':
         """Create order from dictionary"""
-        items_data = data.get("items", [])
-        items = []
-        for item in items_data:
-            if isinstance(item, dict):
-                items.append(OrderItem.from_dict(item))
-            elif isinstance(item, OrderItem):
-                items.append(item)
-
-        created_at = data.get("created_at")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-
-        updated_at = data.get("updated_at")
-        if isinstance(updated_at, str):
-            updated_at = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+        items = [
+            OrderItem.from_dict(item) if isinstance(item, dict) else item
+            for item in data.get("items", [])
+            if isinstance(item, (dict, OrderItem))
+        ]
 
         return cls(
             order_id=data["order_id"],
             customer_id=data["customer_id"],
-            total_amount=Decimal(str(data["total_amount"])),
+            total_amount=_to_decimal(data["total_amount"]),
             status=OrderStatus(data["status"]),
             items=items,
-            created_at=created_at,
-            updated_at=updated_at
+            created_at=data.get("created_at"),
+            updated_at=data.get("updated_at"),
+            version=int(data.get("version", 1))
+        )
+
+    @classmethod
+    def from_partial(cls, data: dict) -> 'Order':
+        """
+        Order holding only the attributes in data, e.g. a projected read.
+
+        Nothing is validated and attributes that were not read stay unset,
+        so only those may be accessed or passed to to_dict(fields).
+        """
+        order = cls.__new__(cls)
+        for name, value in data.items():
+            if name not in _FIELD_SERIALIZERS:
+                continue
+            if name == 'status':
+                value = OrderStatus(value)
+            elif name == 'total_amount':
+                value = _to_decimal(value)
+            elif name == 'items':
+                value = [OrderItem.from_dict(item) if isinstance(item, dict) else item for item in value]
+            elif name == 'version':
+                value = int(value)
+            elif name in ('created_at', 'updated_at'):
+                name = '_' + name
+            setattr(order, name, value)
+        return order
+
+    @classmethod
+    def from_request(cls, body: dict, customer_id: Optional[str] = None) -> 'Order':
+        """Create a new order from an API request body"""
+        if not isinstance(body, dict):
+            raise ValueError("order must be a JSON object")
+
+        if 'total_amount' not in body:
+            raise ValueError("Missing required field: total_amount")
+
+        # Authenticated customer_id wins over the one in the body
+        customer_id = customer_id or body.get('customer_id')
+        if not customer_id:
+            raise ValueError("customer_id is required")
+        if not isinstance(customer_id, str):
+            raise ValueError("customer_id must be a string")
+
+        return cls(
+            order_id=str(uuid.uuid4()),
+            customer_id=customer_id,
+            status=cls.status_from_request(body.get('status', 'PENDING')),
+            total_amount=cls.amount_from_request(body['total_amount']),
+            created_at=datetime.utcnow().isoformat(),
+            items=cls.items_from_request(body.get('items'))
         )
 
+    # The request field checks below are shared by POST (from_request) and PUT
+
+    @staticmethod
+    def amount_from_request(value) -> Decimal:
+        """total_amount from a request body, as JSON numbers or numeric strings"""
+        if isinstance(value, bool) or not isinstance(value, (int, float, Decimal, str)):
+            raise ValueError("total_amount must be a number")
+        try:
+            amount = Decimal(str(value))
+        except InvalidOperation:
+            raise ValueError("total_amount must be a number")
+        if not amount.is_finite():
+            raise ValueError("total_amount must be a finite number")
+        return amount
+
+    @staticmethod
+    def items_from_request(value) -> List[OrderItem]:
+        """Order items from a request body, null meaning no items"""
+        items = value or []
+        if not isinstance(items, list):
+            raise ValueError("items must be a list")
+        return [OrderItem.from_request(item) for item in items]
+
+    @staticmethod
+    def status_from_request(value) -> OrderStatus:
+        """Order status from a request body"""
+        if not isinstance(value, str):
+            raise ValueError("status must be a string")
+        return OrderStatus(value)
+
     def validate(self) -> list[str]:
         """Validate order data"""
         errors = []
@@ -130,3 +306,15 @@ class Order:
             errors.append("status is required")
 
         return errors
+
+
+_FIELD_SERIALIZERS = {
+    'order_id': lambda order: order.order_id,
+    'customer_id': lambda order: order.customer_id,
+    'status': lambda order: order.status.value if isinstance(order.status, OrderStatus) else order.status,
+    'total_amount': lambda order: order.total_amount,
+    'created_at': lambda order: _format_timestamp(order._created_at),
+    'updated_at': lambda order: _format_timestamp(order._updated_at),
+    'items': lambda order: [item.to_dict() if isinstance(item, OrderItem) else item for item in order.items],
+    'version': lambda order: order.version
+}
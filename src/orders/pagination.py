@@ -0,0 +1,49 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import secrets
+from typing import Optional, Dict, Any
+
+# Tokens are signed so clients can't forge ExclusiveStartKey values and walk
+# partitions they were never given. Without a configured secret tokens only
+# stay valid inside the current container.
+_SECRET = (os.getenv("PAGINATION_TOKEN_SECRET") or secrets.token_hex(32)).encode()
+
+
+def encode_token(last_evaluated_key: Optional[Dict[str, Any]], scope: str = "") -> Optional[str]:
+    """Turn a DynamoDB LastEvaluatedKey into an opaque, signed next_token"""
+    if not last_evaluated_key:
+        return None
+
+    payload = json.dumps(
+        {"k": last_evaluated_key, "s": scope},
+        separators=(",", ":"),
+        sort_keys=True,
+        default=str
+    ).encode()
+    signature = hmac.new(_SECRET, payload, hashlib.sha256).digest()[:16]
+    return base64.urlsafe_b64encode(signature + payload).decode().rstrip("=")
+
+
+def decode_token(token: Optional[str], scope: str = "") -> Optional[Dict[str, Any]]:
+    """Validate a next_token and return the ExclusiveStartKey it carries"""
+    if not token:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        raise ValueError("next_token is malformed")
+
+    signature, payload = raw[:16], raw[16:]
+    expected = hmac.new(_SECRET, payload, hashlib.sha256).digest()[:16]
+    if not hmac.compare_digest(signature, expected):
+        raise ValueError("next_token is invalid or expired")
+
+    data = json.loads(payload)
+    if data.get("s") != scope:
+        raise ValueError("next_token does not match the query")
+    return data["k"]
@@ -1,130 +1,537 @@
+import functools
+import operator
 import os
-import boto3
-from boto3.dynamodb.conditions import Key
-from typing import Optional, List
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from boto3.dynamodb.conditions import Key, Attr
+from botocore.exceptions import ClientError, ParamValidationError
+from typing import Optional, List, Tuple, Dict, Iterator, Iterable, Union
 from datetime import datetime
 from decimal import Decimal
 import logging
 
 try:
-    from orders.models import Order, OrderStatus
+    from orders.models import Order, OrderStatus, OrderItem, ORDER_FIELDS
+    from orders.exceptions import OrderNotFoundError, OrderConflictError, RepositoryThrottledError
+    from orders.pagination import encode_token, decode_token
+    from orders.cache import OrderCache
+    from orders.table import DynamoTable, create_client
+    from orders.metrics import MetricsRecorder, measure, timed
+    from orders.store import OrderStore, page_scope
+    from orders import codec
 except ImportError:
     # For Lambda execution environment
-    from models import Order, OrderStatus
+    from models import Order, OrderStatus, OrderItem, ORDER_FIELDS
+    from exceptions import OrderNotFoundError, OrderConflictError, RepositoryThrottledError
+    from pagination import encode_token, decode_token
+    from cache import OrderCache
+    from table import DynamoTable, create_client
+    from metrics import MetricsRecorder, measure, timed
+    from store import OrderStore, page_scope
+    import codec
 
 logger = logging.getLogger()
 logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
+# BatchWriteItem accepts at most 25 put requests and BatchGetItem 100 keys per call
+BATCH_WRITE_SIZE = 25
+BATCH_GET_SIZE = 100
+BATCH_MAX_ATTEMPTS = 5
+BATCH_BACKOFF_BASE = 0.05
 
-class OrderRepository:
+# Errors DynamoDB returns when a request is throttled
+THROTTLING_ERROR_CODES = {
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+}
+
+# Attributes each GSI projects, None for ALL (see infra/dynamodb.tf)
+INDEX_PROJECTIONS: Dict[str, Optional[frozenset]] = {
+    'CustomerIndex': None,
+    'StatusIndex': None
+}
+
+# Parallel scan defaults, SCAN_WORKERS=0 means one worker per segment
+SCAN_SEGMENTS = int(os.getenv("SCAN_SEGMENTS", "4"))
+SCAN_WORKERS = int(os.getenv("SCAN_WORKERS", "0"))
+SCAN_PAGE_SIZE = 500
+
+
+class OrderRepository(OrderStore):
     """DynamoDB repository for orders"""
 
-    def __init__(self, table_name: Optional[str] = None):
-        self.dynamodb = boto3.resource('dynamodb')
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        cache: Optional[OrderCache] = None,
+        client=None,
+        metrics: Optional[MetricsRecorder] = None
+    ):
+        # Low-level client, no resource model to load on a cold start
+        self.client = client or create_client()
+        # Optional read-through cache for get_order, shared across warm invocations
+        self.cache = cache
+        # Optional EMF recorder for per-operation latency and capacity
+        self.metrics = metrics
         self.table_name = table_name or os.getenv('DYNAMODB_TABLE')
         if not self.table_name:
             raise ValueError("table_name must be provided or DYNAMODB_TABLE environment variable must be set")
-        self.table = self.dynamodb.Table(self.table_name)
-        logger.info(f"Initialized OrderRepository with table: {self.table_name}")
+        self.table = DynamoTable(self.client, self.table_name, metrics=metrics)
+        logger.info("Initialized OrderRepository with table: %s", self.table_name)
+
+    def _invalidate(self, order_id: str) -> None:
+        """Drop an order from the read cache after a write"""
+        if self.cache:
+            self.cache.invalidate(order_id)
+
+    @staticmethod
+    def _item_to_order(item: dict) -> Order:
+        """Build an Order from a DynamoDB item"""
+        return Order.from_dict({
+            'order_id': item['order_id'],
+            'customer_id': item['customer_id'],
+            'status': item['status'],
+            'total_amount': item['total_amount'],
+            'created_at': item['created_at'],
+            'updated_at': item.get('updated_at'),
+            'items': item.get('items', []),
+            # Items written before versioning have no version attribute
+            'version': item.get('version', 0)
+        })
+
+    @staticmethod
+    def _item_to_partial_order(item: dict) -> Order:
+        """Build a partial Order from a projected DynamoDB item"""
+        return Order.from_partial(item)
+
+    @staticmethod
+    def _item_to_values(item: dict) -> dict:
+        """Plain values of a DynamoDB item (already deserialized by DynamoTable)"""
+        return item
+
+    @staticmethod
+    def _item_order_id(item: dict) -> str:
+        """Read the order_id of a DynamoDB item"""
+        return item['order_id']
+
+    @staticmethod
+    def _order_to_item(order: Order) -> dict:
+        """Build a DynamoDB item from an Order"""
+        # Convert to dict with proper serialization
+        item = order.to_dict()
+        # Ensure Decimal for DynamoDB
+        item['total_amount'] = Decimal(str(item['total_amount']))
+        index_key = codec.status_index_key(order.status)
+        if index_key is not None:
+            item[codec.STATUS_INDEX_ATTRIBUTE] = index_key
+        return item
 
+    @timed
     def create_order(self, order: Order) -> Order:
         """Create a new order"""
         try:
-            # Convert to dict with proper serialization
-            item = order.to_dict()
-            # Ensure Decimal for DynamoDB
-            item['total_amount'] = Decimal(str(item['total_amount']))
+            item = self._order_to_item(order)
 
             self.table.put_item(Item=item)
-            logger.info(f"Created order: {order.order_id}")
+            self._invalidate(order.order_id)
+            logger.info("Created order: %s", order.order_id)
             return order
         except Exception as e:
-            logger.error(f"Error creating order: {str(e)}")
+            logger.error("Error creating order: %s", e)
             raise
 
-    def get_order(self, order_id: str) -> Optional[Order]:
-        """Get order by ID"""
+    @timed
+    def create_orders(self, orders: List[Order]) -> Tuple[List[Order], List[Order]]:
+        """Create orders in bulk, returns (created, failed)"""
+        # BatchWriteItem rejects a request holding the same key twice, the
+        # last order with an ID is the one written
+        unique = list({order.order_id: order for order in orders}.values())
+        failed_ids = set()
+        for start in range(0, len(unique), BATCH_WRITE_SIZE):
+            chunk = unique[start:start + BATCH_WRITE_SIZE]
+            try:
+                requests = [{'PutRequest': {'Item': self._order_to_item(order)}} for order in chunk]
+                unprocessed = self._batch_write(requests)
+            except (ClientError, ParamValidationError) as e:
+                if isinstance(e, ClientError) and e.response['Error']['Code'] in THROTTLING_ERROR_CODES:
+                    logger.error("Error creating orders batch: %s", e)
+                    failed_ids.update(order.order_id for order in chunk)
+                    continue
+                # A single invalid item fails the whole request: write the
+                # chunk one by one so only that order fails
+                logger.warning("Orders batch rejected, writing one by one: %s", e)
+                failed_ids.update(self._put_each(chunk))
+                continue
+            except Exception as e:
+                logger.error("Error creating orders batch: %s", e)
+                failed_ids.update(order.order_id for order in chunk)
+                continue
+
+            failed_ids.update(self._item_order_id(request['PutRequest']['Item']) for request in unprocessed)
+            for order in chunk:
+                self._invalidate(order.order_id)
+
+        created = [order for order in orders if order.order_id not in failed_ids]
+        failed = [order for order in orders if order.order_id in failed_ids]
+        logger.info("Created %s orders in bulk, %s failed", len(created), len(failed))
+        return created, failed
+
+    def _put_each(self, orders: List[Order]) -> List[str]:
+        """PutItem the orders one at a time, returns the IDs that failed"""
+        failed_ids = []
+        for order in orders:
+            try:
+                self.table.put_item(Item=self._order_to_item(order))
+            except Exception as e:
+                logger.error("Error creating order %s: %s", order.order_id, e)
+                failed_ids.append(order.order_id)
+            self._invalidate(order.order_id)
+        return failed_ids
+
+    def _batch_write(self, requests: List[dict]) -> List[dict]:
+        """Run BatchWriteItem retrying UnprocessedItems, returns what is still unprocessed"""
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt:
+                # Exponential backoff with full jitter
+                time.sleep(random.uniform(0, BATCH_BACKOFF_BASE * (2 ** attempt)))
+
+            response = self.table.batch_write_item(RequestItems={self.table_name: requests})
+            requests = response.get('UnprocessedItems', {}).get(self.table_name, [])
+            if not requests:
+                return []
+
+            logger.warning("%s unprocessed items, retrying", len(requests))
+        return requests
+
+    @timed
+    def get_order(self, order_id: str, fields: Optional[Iterable[str]] = None) -> Optional[Order]:
+        """Get order by ID, only reading `fields` when given"""
         try:
+            item = None
+            if self.cache:
+                with measure(self.metrics, 'OrderCache.get') as measurement:
+                    item = self.cache.get(order_id)
+                    measurement.cache_hit = item is not None
+            if item is not None:
+                logger.debug("Cache hit for order: %s", order_id)
+                return self._item_to_order(item)
+
+            if fields is not None:
+                # Partial items are not cached, the cache only holds whole orders
+                response = self.table.get_item(Key={'order_id': order_id}, **_projection(fields))
+                if 'Item' not in response:
+                    logger.warning("Order not found: %s", order_id)
+                    return None
+                return self._item_to_partial_order(response['Item'])
+
             response = self.table.get_item(Key={'order_id': order_id})
 
             if 'Item' not in response:
-                logger.warning(f"Order not found: {order_id}")
+                logger.warning("Order not found: %s", order_id)
                 return None
 
             item = response['Item']
-            order = Order.from_dict({
-                'order_id': item['order_id'],
-                'customer_id': item['customer_id'],
-                'status': item['status'],
-                'total_amount': float(item['total_amount']),
-                'created_at': item['created_at'],
-                'updated_at': item.get('updated_at'),
-                'items': item.get('items', [])
-            })
-
-            logger.info(f"Retrieved order: {order_id}")
+            order = self._item_to_order(item)
+            if self.cache:
+                self.cache.put(order_id, item)
+
+            logger.info("Retrieved order: %s", order_id)
             return order
         except Exception as e:
-            logger.error(f"Error getting order: {str(e)}")
+            logger.error("Error getting order: %s", e)
             raise
 
-    def list_orders(self, customer_id: Optional[str] = None, limit: int = 50) -> List[Order]:
-        """List orders, optionally filtered by customer"""
+    @timed
+    def get_orders(self, order_ids: List[str]) -> Dict[str, Optional[Order]]:
+        """Get many orders by ID, keyed in request order with None for misses"""
+        # De-duplicate while keeping the order the caller asked for
+        results: Dict[str, Optional[Order]] = dict.fromkeys(order_ids)
+        unique_ids = list(results)
+
+        try:
+            for start in range(0, len(unique_ids), BATCH_GET_SIZE):
+                keys = [{'order_id': order_id} for order_id in unique_ids[start:start + BATCH_GET_SIZE]]
+                for item in self._batch_get(keys):
+                    order = self._item_to_order(item)
+                    results[order.order_id] = order
+
+            found = sum(1 for order in results.values() if order)
+            logger.info("Retrieved %s of %s orders", found, len(results))
+            return results
+        except Exception as e:
+            logger.error("Error getting orders: %s", e)
+            raise
+
+    def _batch_get(self, keys: List[dict]) -> List[dict]:
+        """Run BatchGetItem retrying UnprocessedKeys, returns the items found"""
+        items = []
+        for attempt in range(BATCH_MAX_ATTEMPTS):
+            if attempt:
+                # Exponential backoff with full jitter
+                time.sleep(random.uniform(0, BATCH_BACKOFF_BASE * (2 ** attempt)))
+
+            response = self.table.batch_get_item(RequestItems={self.table_name: {'Keys': keys}})
+            items.extend(response.get('Responses', {}).get(self.table_name, []))
+            keys = response.get('UnprocessedKeys', {}).get(self.table_name, {}).get('Keys', [])
+            if not keys:
+                return items
+
+            logger.warning("%s unprocessed keys, retrying", len(keys))
+        raise RuntimeError(f"Could not read {len(keys)} orders after {BATCH_MAX_ATTEMPTS} attempts")
+
+    @timed
+    def list_orders_page(
+        self,
+        customer_id: Optional[str] = None,
+        limit: int = 50,
+        next_token: Optional[str] = None,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        ascending: bool = False,
+        fields: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Order], Optional[str]]:
+        """List one page of orders and the token to fetch the next one"""
         try:
-            if customer_id:
-                # Query by customer using GSI
+            # Tokens are bound to the query they came from
+            scope = page_scope(customer_id, status, created_from, created_to, ascending)
+            if status:
+                status = OrderStatus(status).value
+            params = {'Limit': limit}
+            exclusive_start_key = decode_token(next_token, scope)
+            if exclusive_start_key:
+                params['ExclusiveStartKey'] = exclusive_start_key
+
+            if customer_id or (status and codec.status_index_key(status) is not None):
+                if customer_id:
+                    # Query by customer using GSI
+                    index_name = 'CustomerIndex'
+                    key_condition = Key('customer_id').eq(customer_id)
+                    if status:
+                        params['FilterExpression'] = Attr('status').eq(status)
+                else:
+                    # Sparse status index, only orders still in flight are in it
+                    index_name = 'StatusIndex'
+                    key_condition = Key(codec.STATUS_INDEX_ATTRIBUTE).eq(status)
+
+                # Date ranges go on the created_at sort key, so a range
+                # read only pays for the orders inside it
+                created_range = _created_at_range(Key, created_from, created_to)
+                if created_range is not None:
+                    key_condition = key_condition & created_range
+                if fields is not None:
+                    params.update(_projection(fields, index_name))
+
                 response = self.table.query(
-                    IndexName='CustomerIndex',
-                    KeyConditionExpression=Key('customer_id').eq(customer_id),
-                    Limit=limit,
-                    ScanIndexForward=False  # Most recent first
+                    IndexName=index_name,
+                    KeyConditionExpression=key_condition,
+                    ScanIndexForward=ascending,  # Most recent first by default
+                    **params
                 )
             else:
+                filters = []
+                if status:
+                    # Terminal statuses are left out of the index
+                    filters.append(Attr('status').eq(status))
+                created_range = _created_at_range(Attr, created_from, created_to)
+                if created_range is not None:
+                    filters.append(created_range)
+                if filters:
+                    params['FilterExpression'] = functools.reduce(operator.and_, filters)
+                if fields is not None:
+                    params.update(_projection(fields))
                 # Scan all orders (use with caution in production)
-                response = self.table.scan(Limit=limit)
+                response = self.table.scan(**params)
 
-            orders = []
-            for item in response.get('Items', []):
-                order = Order.from_dict({
-                    'order_id': item['order_id'],
-                    'customer_id': item['customer_id'],
-                    'status': item['status'],
-                    'total_amount': float(item['total_amount']),
-                    'created_at': item['created_at'],
-                    'updated_at': item.get('updated_at'),
-                    'items': item.get('items', [])
-                })
-                orders.append(order)
+            to_order = self._item_to_order if fields is None else self._item_to_partial_order
+            orders = [to_order(item) for item in response.get('Items', [])]
 
-            logger.info(f"Listed {len(orders)} orders")
-            return orders
+            logger.info("Listed %s orders", len(orders))
+            return orders, encode_token(response.get('LastEvaluatedKey'), scope)
         except Exception as e:
-            logger.error(f"Error listing orders: {str(e)}")
+            logger.error("Error listing orders: %s", e)
             raise
 
+    def scan_orders(
+        self,
+        total_segments: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        page_size: int = SCAN_PAGE_SIZE
+    ) -> Iterator[Order]:
+        """Yield every order using a parallel segmented scan"""
+        for page in self._scan_pages(self._item_to_order, total_segments, max_workers, page_size):
+            yield from page
+
+    def scan_pages(
+        self,
+        fields: Iterable[str],
+        total_segments: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        page_size: int = SCAN_PAGE_SIZE
+    ) -> Iterator[List[dict]]:
+        """
+        Yield every order as pages of plain dicts holding only `fields`, for
+        bulk exports: same parallel scan as scan_orders but without building
+        an Order per item
+        """
+        yield from self._scan_pages(
+            self._item_to_values, total_segments, max_workers, page_size, _projection(fields)
+        )
+
+    def backfill_status_index(
+        self,
+        total_segments: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Set, or remove, the StatusIndex key on every order whose gsi_status
+        does not match its status, e.g. orders written before the index
+        existed. Returns the scanned, updated and skipped counts.
+
+        Each update is conditional on the status that was scanned: an order
+        changed or deleted meanwhile is skipped, its own write already kept
+        gsi_status in step.
+        """
+        names = {'#id': 'order_id', '#status': 'status', '#gsi_status': codec.STATUS_INDEX_ATTRIBUTE}
+        projection = {'ProjectionExpression': ', '.join(names), 'ExpressionAttributeNames': names}
+        counts = {'scanned': 0, 'updated': 0, 'skipped': 0}
+
+        for page in self._scan_pages(self._item_to_values, total_segments, max_workers, SCAN_PAGE_SIZE, projection):
+            for item in page:
+                counts['scanned'] += 1
+                index_key = codec.status_index_key(item['status'])
+                if item.get(codec.STATUS_INDEX_ATTRIBUTE) == index_key:
+                    continue
+
+                params = {
+                    'Key': {'order_id': item['order_id']},
+                    'ConditionExpression': '#status = :status',
+                    'ExpressionAttributeNames': {'#status': 'status', '#gsi_status': codec.STATUS_INDEX_ATTRIBUTE},
+                    'ExpressionAttributeValues': {':status': item['status']}
+                }
+                if index_key is None:
+                    params['UpdateExpression'] = 'REMOVE #gsi_status'
+                else:
+                    params['UpdateExpression'] = 'SET #gsi_status = :gsi_status'
+                    params['ExpressionAttributeValues'][':gsi_status'] = index_key
+                try:
+                    self.table.update_item(**params)
+                    counts['updated'] += 1
+                except ClientError as e:
+                    if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                        raise
+                    counts['skipped'] += 1
+
+        logger.info(
+            "StatusIndex backfill: %s scanned, %s updated, %s skipped",
+            counts['scanned'], counts['updated'], counts['skipped']
+        )
+        return counts
+
+    def _scan_pages(
+        self,
+        convert,
+        total_segments: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        page_size: int = SCAN_PAGE_SIZE,
+        projection: Optional[dict] = None
+    ) -> Iterator[list]:
+        """Pages of converted items from a parallel segmented scan"""
+        total_segments = total_segments or SCAN_SEGMENTS
+        max_workers = min(max_workers or SCAN_WORKERS or total_segments, total_segments)
+
+        # Bounded hand-off between segment workers and the consumer keeps
+        # memory at roughly max_workers * 2 pages whatever the table size
+        pages: queue.Queue = queue.Queue(maxsize=max_workers * 2)
+        stop = threading.Event()
+
+        def put(entry) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(entry, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def scan_segment(segment: int) -> None:
+            params = {
+                'Segment': segment,
+                'TotalSegments': total_segments,
+                'Limit': page_size,
+                **(projection or {})
+            }
+            while not stop.is_set():
+                response = self.table.scan(**params)
+                put([convert(item) for item in response.get('Items', [])])
+                if 'LastEvaluatedKey' not in response:
+                    return
+                params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+        def run_segment(segment: int) -> None:
+            # None marks the end of a segment, an exception aborts the scan
+            try:
+                scan_segment(segment)
+                put(None)
+            except Exception as e:
+                put(e)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scan')
+        try:
+            for segment in range(total_segments):
+                executor.submit(run_segment, segment)
+
+            remaining = total_segments
+            while remaining:
+                entry = pages.get()
+                if entry is None:
+                    remaining -= 1
+                elif isinstance(entry, Exception):
+                    raise entry
+                else:
+                    yield entry
+
+            logger.info("Scanned orders with %s segments", total_segments)
+        except Exception as e:
+            logger.error("Error scanning orders: %s", e)
+            raise
+        finally:
+            stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @timed
     def update_order(self, order: Order) -> Order:
         """Update an order"""
         try:
-            # Convert to dict with proper serialization
-            item = order.to_dict()
-            # Ensure Decimal for DynamoDB
-            item['total_amount'] = Decimal(str(item['total_amount']))
+            item = self._order_to_item(order)
 
             self.table.put_item(Item=item)
-            logger.info(f"Updated order: {order.order_id}")
+            self._invalidate(order.order_id)
+            logger.info("Updated order: %s", order.order_id)
             return order
         except Exception as e:
-            logger.error(f"Error updating order: {str(e)}")
+            logger.error("Error updating order: %s", e)
             raise
 
-    def update_order_fields(self, order_id: str, updates: dict) -> Optional[Order]:
-        """Update specific fields of an order"""
+    @timed
+    def update_order_fields(
+        self,
+        order_id: str,
+        updates: dict,
+        expected_version: Optional[int] = None
+    ) -> Order:
+        """Update specific fields of an order in a single conditional write"""
         try:
             # Build update expression
-            update_expr = "SET "
+            set_clauses = []
             expr_attr_values = {}
             expr_attr_names = {}
 
+            remove_clauses = []
+
             for key, value in updates.items():
                 if key in ['status', 'total_amount', 'items']:
                     placeholder = f"#{key}"
@@ -133,76 +540,196 @@ class OrderRepository:
 
                     if key == 'total_amount':
                         expr_attr_values[value_placeholder] = Decimal(str(value))
+                    elif key == 'status':
+                        expr_attr_values[value_placeholder] = OrderStatus(value).value
                     else:
-                        expr_attr_values[value_placeholder] = value
+                        expr_attr_values[value_placeholder] = [
+                            item.to_dict() if isinstance(item, OrderItem) else item for item in value
+                        ]
 
-                    update_expr += f"{placeholder} = {value_placeholder}, "
+                    set_clauses.append(f"{placeholder} = {value_placeholder}")
 
-            # Add updated_at timestamp
-            update_expr += "#updated_at = :updated_at"
+            # Keep the StatusIndex key in step with the status
+            if 'status' in updates:
+                expr_attr_names["#gsi_status"] = codec.STATUS_INDEX_ATTRIBUTE
+                index_key = codec.status_index_key(updates['status'])
+                if index_key is not None:
+                    set_clauses.append("#gsi_status = :gsi_status")
+                    expr_attr_values[":gsi_status"] = index_key
+                else:
+                    remove_clauses.append("#gsi_status")
+
+            # Add updated_at timestamp and bump the version
+            set_clauses.append("#updated_at = :updated_at")
             expr_attr_names["#updated_at"] = "updated_at"
             expr_attr_values[":updated_at"] = datetime.utcnow().isoformat()
+            expr_attr_names["#version"] = "version"
+            expr_attr_values[":one"] = 1
 
-            response = self.table.update_item(
-                Key={'order_id': order_id},
-                UpdateExpression=update_expr,
-                ExpressionAttributeNames=expr_attr_names,
-                ExpressionAttributeValues=expr_attr_values,
-                ReturnValues='ALL_NEW'
-            )
+            # The order must exist and, when asked, still be at the expected version
+            condition = "attribute_exists(order_id)"
+            if expected_version is not None:
+                if expected_version == 0:
+                    condition += " AND attribute_not_exists(#version)"
+                else:
+                    condition += " AND #version = :expected_version"
+                    expr_attr_values[":expected_version"] = expected_version
+
+            update_expression = f"SET {', '.join(set_clauses)}"
+            if remove_clauses:
+                update_expression += f" REMOVE {', '.join(remove_clauses)}"
+
+            try:
+                response = self.table.update_item(
+                    Key={'order_id': order_id},
+                    UpdateExpression=f"{update_expression} ADD #version :one",
+                    ConditionExpression=condition,
+                    ExpressionAttributeNames=expr_attr_names,
+                    ExpressionAttributeValues=expr_attr_values,
+                    ReturnValues='ALL_NEW',
+                    ReturnValuesOnConditionCheckFailure='ALL_OLD'
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                    raise
+                # The old item is only returned when the order exists
+                current = e.response.get('Item')
+                if not current:
+                    raise OrderNotFoundError(order_id)
+                current_version = int(current.get('version', {}).get('N', 0))
+                raise OrderConflictError(order_id, expected_version, current_version)
+            finally:
+                self._invalidate(order_id)
 
             item = response['Attributes']
-            order = Order.from_dict({
-                'order_id': item['order_id'],
-                'customer_id': item['customer_id'],
-                'status': item['status'],
-                'total_amount': float(item['total_amount']),
-                'created_at': item['created_at'],
-                'updated_at': item.get('updated_at'),
-                'items': item.get('items', [])
-            })
-
-            logger.info(f"Updated order: {order_id}")
+            order = self._item_to_order(item)
+
+            logger.info("Updated order: %s to version %s", order_id, order.version)
             return order
+        except (OrderNotFoundError, OrderConflictError) as e:
+            logger.warning("%s", e)
+            raise
         except Exception as e:
-            logger.error(f"Error updating order: {str(e)}")
+            logger.error("Error updating order: %s", e)
             raise
 
-    def delete_order(self, order_id: str) -> bool:
-        """Delete an order"""
+    @timed
+    def delete_order(self, order_id: str, return_order: bool = False) -> Union[bool, Order]:
+        """Delete an order, optionally returning what was deleted"""
         try:
-            self.table.delete_item(Key={'order_id': order_id})
-            logger.info(f"Deleted order: {order_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error deleting order: {str(e)}")
-            return False
+            # Existence check and delete in one round trip
+            response = self.table.delete_item(
+                Key={'order_id': order_id},
+                ConditionExpression='attribute_exists(order_id)',
+                ReturnValues='ALL_OLD' if return_order else 'NONE'
+            )
+        except ClientError as e:
+            code = e.response['Error']['Code']
+            if code == 'ConditionalCheckFailedException':
+                logger.warning("Order not found: %s", order_id)
+                raise OrderNotFoundError(order_id)
+            logger.error("Error deleting order: %s", e)
+            if code in THROTTLING_ERROR_CODES:
+                raise RepositoryThrottledError('DeleteItem')
+            raise
+        finally:
+            self._invalidate(order_id)
+
+        logger.info("Deleted order: %s", order_id)
+        if return_order:
+            return self._item_to_order(response['Attributes'])
+        return True
 
-    def get_orders_by_customer(self, customer_id: str, limit: int = 100) -> list:
-        """Get all orders for a specific customer"""
+    @timed
+    def get_orders_by_customer(
+        self,
+        customer_id: str,
+        limit: int = 100,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> list:
+        """Get the orders of a customer, optionally only those created in a range"""
         try:
+            key_condition = Key('customer_id').eq(customer_id)
+            created_range = _created_at_range(Key, created_from, created_to)
+            if created_range is not None:
+                key_condition = key_condition & created_range
+
             response = self.table.query(
                 IndexName='CustomerIndex',
-                KeyConditionExpression='customer_id = :customer_id',
-                ExpressionAttributeValues={':customer_id': customer_id},
+                KeyConditionExpression=key_condition,
                 Limit=limit
             )
 
             orders = []
             for item in response.get('Items', []):
-                order = Order.from_dict({
-                    'order_id': item['order_id'],
-                    'customer_id': item['customer_id'],
-                    'status': item['status'],
-                    'total_amount': float(item['total_amount']),
-                    'created_at': item['created_at'],
-                    'updated_at': item.get('updated_at'),
-                    'items': item.get('items', [])
-                })
+                order = self._item_to_order(item)
                 orders.append(order)
 
-            logger.info(f"Retrieved {len(orders)} orders for customer: {customer_id}")
+            logger.info("Retrieved %s orders for customer: %s", len(orders), customer_id)
             return orders
         except Exception as e:
-            logger.error(f"Error getting orders by customer: {str(e)}")
+            logger.error("Error getting orders by customer: %s", e)
             return []
+
+
+def _projection(fields: Iterable[str], index_name: Optional[str] = None) -> dict:
+    """
+    ProjectionExpression for a sparse fieldset, order_id always included.
+
+    Fewer attributes means smaller responses and less to deserialize;
+    DynamoDB still charges reads on the full item size. GSI reads can only
+    return what the index projects.
+    """
+    names = ['order_id'] + [name for name in ORDER_FIELDS if name in fields and name != 'order_id']
+    projected = INDEX_PROJECTIONS.get(index_name)
+    if projected is not None and not projected.issuperset(names):
+        missing = ', '.join(name for name in names if name not in projected)
+        raise ValueError(f"{index_name} does not project: {missing}")
+    placeholders = {f'#p{position}': name for position, name in enumerate(names)}
+    return {
+        'ProjectionExpression': ', '.join(placeholders),
+        'ExpressionAttributeNames': placeholders
+    }
+
+
+def _created_at_range(attribute, created_from: Optional[str], created_to: Optional[str]):
+    """
+    Inclusive created_at bounds as a Key (key condition) or Attr (filter)
+    condition, None when unbounded. A sort key takes a single condition,
+    hence between rather than gte & lte.
+    """
+    if created_from and created_to:
+        return attribute('created_at').between(created_from, created_to)
+    if created_from:
+        return attribute('created_at').gte(created_from)
+    if created_to:
+        return attribute('created_at').lte(created_to)
+    return None
+
+
+class CodecOrderRepository(OrderRepository):
+    """
+    OrderRepository that encodes and decodes items with the hand-written
+    codec in codec.py instead of TypeSerializer/TypeDeserializer.
+
+    Items go straight between AttributeValue maps and Order objects with no
+    intermediate dict and no float round trip. The wire format is the same,
+    so both implementations can share a table.
+    """
+
+    def __init__(
+        self,
+        table_name: Optional[str] = None,
+        cache: Optional[OrderCache] = None,
+        client=None,
+        metrics: Optional[MetricsRecorder] = None
+    ):
+        super().__init__(table_name=table_name, cache=cache, client=client, metrics=metrics)
+        self.table = DynamoTable(self.client, self.table_name, raw_items=True, metrics=metrics)
+
+    _item_to_order = staticmethod(codec.item_to_order)
+    _item_to_partial_order = staticmethod(codec.item_to_partial_order)
+    _item_to_values = staticmethod(codec.item_to_values)
+    _order_to_item = staticmethod(codec.order_to_item)
+    _item_order_id = staticmethod(codec.item_order_id)
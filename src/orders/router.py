@@ -0,0 +1,80 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+
+PARAM_KEY = '{}'
+
+
+class Route:
+    """A path template with one handler per HTTP method"""
+
+    __slots__ = ('template', 'handlers', 'allow', 'param_names')
+
+    def __init__(self, template: str, handlers: Dict[str, Callable], param_names: Tuple[str, ...]):
+        self.template = template
+        self.handlers = {method.upper(): handler for method, handler in handlers.items()}
+        # Value of the Allow header on 405 responses
+        self.allow = ', '.join(sorted(self.handlers))
+        self.param_names = param_names
+
+
+class Router:
+    """
+    Precompiled route table.
+
+    Templates like /v1/orders/{id} are compiled into a segment tree, so a
+    lookup is one dict access per path segment however many routes exist.
+    API Gateway proxy events also carry the matched template in `resource`,
+    which resolves with a single dict access.
+    """
+
+    def __init__(self):
+        self._by_template: Dict[str, Route] = {}
+        self._tree: Dict[str, Any] = {}
+
+    def add(self, template: str, handlers: Dict[str, Callable]) -> Route:
+        """Register the handlers of a path template, keyed by HTTP method"""
+        if template in self._by_template:
+            raise ValueError(f"Route already registered: {template}")
+
+        node = self._tree
+        param_names = []
+        for segment in self._segments(template):
+            if segment.startswith('{') and segment.endswith('}'):
+                param_names.append(segment[1:-1])
+                segment = PARAM_KEY
+            node = node.setdefault(segment, {})
+
+        route = Route(template, handlers, tuple(param_names))
+        node[None] = route
+        self._by_template[template] = route
+        return route
+
+    def resolve(self, path: str, resource: Optional[str] = None) -> Optional[Tuple[Route, Dict[str, str]]]:
+        """Find the route of a request, with the path parameters it captured"""
+        if resource:
+            route = self._by_template.get(resource)
+            if route is not None:
+                return route, {}
+
+        node = self._tree
+        values = []
+        for segment in self._segments(path):
+            child = node.get(segment)
+            if child is None:
+                # Literal segments win over parameters (/v1/orders:batch)
+                # An empty segment still fills a parameter, so /v1/orders/
+                # reaches /v1/orders/{id} and is rejected for the missing id
+                child = node.get(PARAM_KEY)
+                if child is None:
+                    return None
+                values.append(segment)
+            node = child
+
+        route = node.get(None)
+        if route is None:
+            return None
+        return route, dict(zip(route.param_names, values))
+
+    @staticmethod
+    def _segments(path: str) -> list:
+        # Empty segments are kept: /v1/orders/ is not /v1/orders
+        return path[1:].split('/') if path.startswith('/') else path.split('/')
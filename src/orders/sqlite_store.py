@@ -0,0 +1,285 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from typing import Optional, List, Tuple, Dict, Iterator, Iterable, Union, Any
+
+try:
+    from orders.models import Order, OrderStatus
+    from orders.exceptions import OrderNotFoundError, OrderConflictError
+    from orders.pagination import encode_token, decode_token
+    from orders.metrics import MetricsRecorder, timed
+    from orders.store import OrderStore, apply_updates, page_scope
+except ImportError:
+    # For Lambda execution environment
+    from models import Order, OrderStatus
+    from exceptions import OrderNotFoundError, OrderConflictError
+    from pagination import encode_token, decode_token
+    from metrics import MetricsRecorder, timed
+    from store import OrderStore, apply_updates, page_scope
+
+logger = logging.getLogger()
+
+# Stays under SQLITE_MAX_VARIABLE_NUMBER on old SQLite builds (999)
+SQLITE_IN_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    order_id TEXT PRIMARY KEY,
+    customer_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS orders_customer_created
+    ON orders (customer_id, created_at, order_id);
+CREATE INDEX IF NOT EXISTS orders_status_created
+    ON orders (status, created_at, order_id);
+"""
+
+_UPSERT = (
+    "INSERT OR REPLACE INTO orders (order_id, customer_id, status, created_at, version, data) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+class SqliteOrderRepository(OrderStore):
+    """
+    Order store on the stdlib sqlite3 module, for local load tests.
+
+    Each order is one row: the key columns used by lookups and the
+    (customer_id, created_at) and (status, created_at) indexes, plus the
+    to_dict() record as JSON.
+    Defaults to an in-memory database, ORDER_STORE_PATH points it at a file.
+    """
+
+    def __init__(self, path: Optional[str] = None, metrics: Optional[MetricsRecorder] = None):
+        self.metrics = metrics
+        self.path = path or os.getenv("ORDER_STORE_PATH") or ":memory:"
+        # One connection shared by every thread, serialized by the lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        self._conn.executescript(SCHEMA)
+        logger.info("Initialized SqliteOrderRepository at: %s", self.path)
+
+    @staticmethod
+    def _row(record: Dict[str, Any]) -> tuple:
+        # Decimals (total_amount) are stored as their exact string
+        return (
+            record['order_id'],
+            record['customer_id'],
+            record['status'],
+            record['created_at'],
+            record['version'],
+            json.dumps(record, default=str, separators=(',', ':'))
+        )
+
+    @staticmethod
+    def _to_order(data: str) -> Order:
+        return Order.from_dict(json.loads(data))
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_UPSERT, [self._row(record) for record in records])
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    @timed
+    def create_order(self, order: Order) -> Order:
+        """Create a new order"""
+        self._write([order.to_dict()])
+        logger.info("Created order: %s", order.order_id)
+        return order
+
+    @timed
+    def create_orders(self, orders: List[Order]) -> Tuple[List[Order], List[Order]]:
+        """Create orders in bulk (one transaction), returns (created, failed)"""
+        try:
+            self._write([order.to_dict() for order in orders])
+        except sqlite3.Error as e:
+            logger.error("Error creating orders batch: %s", e)
+            return [], list(orders)
+        logger.info("Created %s orders in bulk, 0 failed", len(orders))
+        return list(orders), []
+
+    @timed
+    def get_order(self, order_id: str, fields: Optional[Iterable[str]] = None) -> Optional[Order]:
+        """Get order by ID, always whole (fields only trims the response)"""
+        rows = self._query("SELECT data FROM orders WHERE order_id = ?", (order_id,))
+        if not rows:
+            logger.warning("Order not found: %s", order_id)
+            return None
+        return self._to_order(rows[0][0])
+
+    @timed
+    def get_orders(self, order_ids: List[str]) -> Dict[str, Optional[Order]]:
+        """Get many orders by ID, keyed in request order with None for misses"""
+        results: Dict[str, Optional[Order]] = dict.fromkeys(order_ids)
+        unique_ids = list(results)
+        for start in range(0, len(unique_ids), SQLITE_IN_CHUNK):
+            chunk = unique_ids[start:start + SQLITE_IN_CHUNK]
+            rows = self._query(
+                f"SELECT order_id, data FROM orders WHERE order_id IN ({', '.join('?' * len(chunk))})",
+                tuple(chunk)
+            )
+            for order_id, data in rows:
+                results[order_id] = self._to_order(data)
+        return results
+
+    @timed
+    def list_orders_page(
+        self,
+        customer_id: Optional[str] = None,
+        limit: int = 50,
+        next_token: Optional[str] = None,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        ascending: bool = False,
+        fields: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Order], Optional[str]]:
+        """List one page of orders and the token to fetch the next one"""
+        # Same token scope as the DynamoDB repository
+        scope = page_scope(customer_id, status, created_from, created_to, ascending)
+        rows, last_key = self._page(
+            limit, decode_token(next_token, scope),
+            customer_id=customer_id, status=status,
+            created_from=created_from, created_to=created_to, ascending=ascending
+        )
+        orders = [self._to_order(data) for data in rows]
+        logger.info("Listed %s orders", len(orders))
+        return orders, encode_token(last_key, scope)
+
+    def _page(
+        self,
+        limit: int,
+        start_key: Optional[Dict[str, Any]],
+        customer_id: Optional[str] = None,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        ascending: bool = False
+    ) -> Tuple[List[str], Optional[Dict[str, Any]]]:
+        """JSON records of one page and the key of the last one, None on the last page"""
+        conditions, params = [], []
+        if customer_id:
+            conditions.append("customer_id = ?")
+            params.append(customer_id)
+        if status:
+            conditions.append("status = ?")
+            params.append(OrderStatus(status).value)
+        indexed = bool(conditions)
+        if created_from:
+            conditions.append("created_at >= ?")
+            params.append(created_from)
+        if created_to:
+            conditions.append("created_at <= ?")
+            params.append(created_to)
+
+        if indexed:
+            # Served by the (customer_id|status, created_at) indexes
+            if start_key:
+                conditions.append(f"(created_at, order_id) {'>' if ascending else '<'} (?, ?)")
+                params.extend((start_key['created_at'], start_key['order_id']))
+            direction = "ASC" if ascending else "DESC"
+            order_by = f"created_at {direction}, order_id {direction}"
+        else:
+            if start_key:
+                conditions.append("order_id > ?")
+                params.append(start_key['order_id'])
+            order_by = "order_id"
+
+        sql = "SELECT order_id, created_at, data FROM orders"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        # One extra row tells whether another page follows
+        rows = self._query(f"{sql} ORDER BY {order_by} LIMIT ?", tuple(params) + (limit + 1,))
+
+        if len(rows) <= limit or not limit:
+            return [data for _, _, data in rows[:limit]], None
+        rows = rows[:limit]
+        order_id, created_at, _ = rows[-1]
+        return [data for _, _, data in rows], {'order_id': order_id, 'created_at': created_at}
+
+    def scan_orders(self, *args, **kwargs) -> Iterator[Order]:
+        """Yield every order, segment options are accepted and ignored"""
+        for (data,) in self._query("SELECT data FROM orders"):
+            yield self._to_order(data)
+
+    @timed
+    def update_order(self, order: Order) -> Order:
+        """Update an order"""
+        self._write([order.to_dict()])
+        logger.info("Updated order: %s", order.order_id)
+        return order
+
+    @timed
+    def update_order_fields(
+        self,
+        order_id: str,
+        updates: dict,
+        expected_version: Optional[int] = None
+    ) -> Order:
+        """Update specific fields of an order, checking the version"""
+        try:
+            with self._lock:
+                # BEGIN IMMEDIATE takes the write lock before reading, so the
+                # version check holds against other connections to the file
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._conn.execute(
+                        "SELECT data FROM orders WHERE order_id = ?", (order_id,)
+                    ).fetchone()
+                    record = apply_updates(
+                        order_id, json.loads(row[0]) if row else None, updates, expected_version
+                    )
+                    self._conn.execute(_UPSERT, self._row(record))
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                self._conn.execute("COMMIT")
+        except (OrderNotFoundError, OrderConflictError) as e:
+            logger.warning("%s", e)
+            raise
+
+        order = Order.from_dict(record)
+        logger.info("Updated order: %s to version %s", order_id, order.version)
+        return order
+
+    @timed
+    def delete_order(self, order_id: str, return_order: bool = False) -> Union[bool, Order]:
+        """Delete an order, optionally returning what was deleted"""
+        # DELETE ... RETURNING (SQLite 3.35+) checks and deletes in one statement
+        rows = self._query("DELETE FROM orders WHERE order_id = ? RETURNING data", (order_id,))
+
+        if not rows:
+            logger.warning("Order not found: %s", order_id)
+            raise OrderNotFoundError(order_id)
+
+        logger.info("Deleted order: %s", order_id)
+        return self._to_order(rows[0][0]) if return_order else True
+
+    @timed
+    def get_orders_by_customer(
+        self,
+        customer_id: str,
+        limit: int = 100,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> list:
+        """Get the orders of a customer, optionally only those created in a range"""
+        rows, _ = self._page(
+            limit, None, customer_id=customer_id, created_from=created_from, created_to=created_to
+        )
+        logger.info("Retrieved %s orders for customer: %s", len(rows), customer_id)
+        return [self._to_order(data) for data in rows]
@@ -0,0 +1,153 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, List, Tuple, Dict, Iterator, Iterable, Union, Any
+
+try:
+    from orders.models import Order, OrderStatus, OrderItem
+    from orders.exceptions import OrderNotFoundError, OrderConflictError
+except ImportError:
+    # For Lambda execution environment
+    from models import Order, OrderStatus, OrderItem
+    from exceptions import OrderNotFoundError, OrderConflictError
+
+
+class OrderStore(ABC):
+    """
+    Storage interface the handler works against.
+
+    OrderRepository stores orders in DynamoDB; the in-memory and SQLite
+    stores implement the same contract (errors, versioning, page tokens)
+    for local load tests and profiling without storage emulation.
+    """
+
+    # Optional EMF recorder, read by @timed
+    metrics = None
+
+    @abstractmethod
+    def create_order(self, order: Order) -> Order:
+        """Create (or overwrite) an order"""
+
+    @abstractmethod
+    def create_orders(self, orders: List[Order]) -> Tuple[List[Order], List[Order]]:
+        """Create orders in bulk, returns (created, failed)"""
+
+    @abstractmethod
+    def get_order(self, order_id: str, fields: Optional[Iterable[str]] = None) -> Optional[Order]:
+        """
+        Get order by ID, None when it does not exist. `fields` are the
+        attributes the caller needs; stores may return more.
+        """
+
+    @abstractmethod
+    def get_orders(self, order_ids: List[str]) -> Dict[str, Optional[Order]]:
+        """Get many orders by ID, keyed in request order with None for misses"""
+
+    @abstractmethod
+    def list_orders_page(
+        self,
+        customer_id: Optional[str] = None,
+        limit: int = 50,
+        next_token: Optional[str] = None,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        ascending: bool = False,
+        fields: Optional[Iterable[str]] = None
+    ) -> Tuple[List[Order], Optional[str]]:
+        """
+        List one page of orders and the next token, optionally only one
+        customer's and/or one status, created within [created_from, created_to].
+        Customer and status pages are sorted by created_at, newest first
+        unless ascending. `fields` works as in get_order.
+        """
+
+    @abstractmethod
+    def scan_orders(self, *args, **kwargs) -> Iterator[Order]:
+        """Yield every order"""
+
+    @abstractmethod
+    def update_order(self, order: Order) -> Order:
+        """Overwrite an order"""
+
+    @abstractmethod
+    def update_order_fields(
+        self,
+        order_id: str,
+        updates: dict,
+        expected_version: Optional[int] = None
+    ) -> Order:
+        """
+        Update status, total_amount and/or items, bumping the version.
+
+        Raises OrderNotFoundError when the order does not exist and
+        OrderConflictError when it is not at expected_version.
+        """
+
+    @abstractmethod
+    def delete_order(self, order_id: str, return_order: bool = False) -> Union[bool, Order]:
+        """Delete an order, raises OrderNotFoundError when it does not exist"""
+
+    @abstractmethod
+    def get_orders_by_customer(
+        self,
+        customer_id: str,
+        limit: int = 100,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ) -> list:
+        """Get the orders of a customer, optionally only those created in a range"""
+
+    def list_orders(self, customer_id: Optional[str] = None, limit: int = 50) -> List[Order]:
+        """List orders, optionally filtered by customer"""
+        orders, _ = self.list_orders_page(customer_id=customer_id, limit=limit)
+        return orders
+
+
+def page_scope(
+    customer_id: Optional[str],
+    status: Optional[str],
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+    ascending: bool = False
+) -> str:
+    """Scope that binds a page token to the query it came from"""
+    scope = customer_id or ''
+    if status:
+        scope += f'|{OrderStatus(status).value}'
+    # Plain listings keep their scope, so their tokens stay valid
+    if created_from or created_to or ascending:
+        scope += f"|{created_from or ''}..{created_to or ''}|{'asc' if ascending else 'desc'}"
+    return scope
+
+
+def apply_updates(
+    order_id: str,
+    record: Optional[Dict[str, Any]],
+    updates: dict,
+    expected_version: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Apply update_order_fields to a stored Order.to_dict() record and return
+    the new record, with the same checks as the DynamoDB conditional update.
+    """
+    if record is None:
+        raise OrderNotFoundError(order_id)
+
+    # Records written before versioning have no version
+    current_version = int(record.get('version') or 0)
+    if expected_version is not None and expected_version != current_version:
+        raise OrderConflictError(order_id, expected_version, current_version)
+
+    record = dict(record)
+    for key, value in updates.items():
+        if key == 'total_amount':
+            record[key] = Decimal(str(value))
+        elif key == 'status':
+            record[key] = OrderStatus(value).value
+        elif key == 'items':
+            record[key] = [item.to_dict() if isinstance(item, OrderItem) else item for item in value]
+
+    record['updated_at'] = datetime.utcnow().isoformat()
+    record['version'] = current_version + 1
+    return record
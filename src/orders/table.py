@@ -0,0 +1,218 @@
+import os
+from typing import Any, Dict, Optional
+
+import boto3
+from botocore.config import Config
+from boto3.dynamodb.conditions import ConditionBase, ConditionExpressionBuilder
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+
+try:
+    from orders.metrics import MetricsRecorder, measure, consumed_capacity
+except ImportError:
+    # For Lambda execution environment
+    from metrics import MetricsRecorder, measure, consumed_capacity
+
+# Request/response fields holding keys and whole items in AttributeValue form
+_KEY_PARAMS = ('Key', 'ExclusiveStartKey')
+_ITEM_RESPONSES = ('Item', 'Attributes')
+_CONDITION_PARAMS = ('KeyConditionExpression', 'ConditionExpression', 'FilterExpression')
+
+# Keep connections warm between invocations and fail fast instead of
+# hanging on the default 60s timeouts
+CLIENT_CONFIG = Config(
+    connect_timeout=float(os.getenv("DYNAMODB_CONNECT_TIMEOUT", "2")),
+    read_timeout=float(os.getenv("DYNAMODB_READ_TIMEOUT", "5")),
+    retries={'mode': 'standard', 'max_attempts': 3},
+    tcp_keepalive=True
+)
+
+
+def create_client(region_name: Optional[str] = None):
+    """Create the low-level DynamoDB client used by the repositories"""
+    return boto3.client('dynamodb', region_name=region_name, config=CLIENT_CONFIG)
+
+
+class DynamoTable:
+    """
+    Table-scoped wrapper over a low-level DynamoDB client.
+
+    Accepts and returns plain Python values like boto3's Table resource does,
+    but without loading the resource model or building resource objects,
+    which is a noticeable share of a cold start.
+
+    With raw_items=True whole items (Item, Items, Attributes, batch items)
+    are passed through as AttributeValue maps for callers with their own
+    codec. Keys and expression values are still converted.
+
+    With a metrics recorder every call asks for ReturnConsumedCapacity and
+    is recorded as a DynamoDB.<Operation> metric.
+    """
+
+    def __init__(
+        self,
+        client,
+        table_name: str,
+        raw_items: bool = False,
+        metrics: Optional[MetricsRecorder] = None
+    ):
+        self.client = client
+        self.name = table_name
+        self.raw_items = raw_items
+        self.metrics = metrics
+        self._serializer = TypeSerializer()
+        self._deserializer = TypeDeserializer()
+
+    def get_item(self, **kwargs) -> Dict[str, Any]:
+        return self._call('GetItem', self.client.get_item, kwargs)
+
+    def put_item(self, **kwargs) -> Dict[str, Any]:
+        return self._call('PutItem', self.client.put_item, kwargs)
+
+    def update_item(self, **kwargs) -> Dict[str, Any]:
+        return self._call('UpdateItem', self.client.update_item, kwargs)
+
+    def delete_item(self, **kwargs) -> Dict[str, Any]:
+        return self._call('DeleteItem', self.client.delete_item, kwargs)
+
+    def query(self, **kwargs) -> Dict[str, Any]:
+        return self._call('Query', self.client.query, kwargs)
+
+    def scan(self, **kwargs) -> Dict[str, Any]:
+        return self._call('Scan', self.client.scan, kwargs)
+
+    def batch_write_item(self, **kwargs) -> Dict[str, Any]:
+        """BatchWriteItem with RequestItems/UnprocessedItems in Python types"""
+        kwargs['RequestItems'] = {
+            table: [self._map_request(request, self._encode_item, self.serialize) for request in requests]
+            for table, requests in kwargs['RequestItems'].items()
+        }
+        response = self._send('BatchWriteItem', self.client.batch_write_item, kwargs)
+        response['UnprocessedItems'] = {
+            table: [self._map_request(request, self._decode_item, self.deserialize) for request in requests]
+            for table, requests in response.get('UnprocessedItems', {}).items()
+        }
+        return response
+
+    def batch_get_item(self, **kwargs) -> Dict[str, Any]:
+        """BatchGetItem with Keys/Responses/UnprocessedKeys in Python types"""
+        kwargs['RequestItems'] = {
+            table: dict(spec, Keys=[self.serialize(key) for key in spec['Keys']])
+            for table, spec in kwargs['RequestItems'].items()
+        }
+        response = self._send('BatchGetItem', self.client.batch_get_item, kwargs)
+        response['Responses'] = {
+            table: [self._decode_item(item) for item in items]
+            for table, items in response.get('Responses', {}).items()
+        }
+        response['UnprocessedKeys'] = {
+            table: dict(spec, Keys=[self.deserialize(key) for key in spec['Keys']])
+            for table, spec in response.get('UnprocessedKeys', {}).items()
+        }
+        return response
+
+    def transact_write_items(self, **kwargs) -> Dict[str, Any]:
+        """
+        TransactWriteItems on this table, each Put/Update/Delete/ConditionCheck
+        given like the single-item calls (Python values, condition objects)
+        """
+        kwargs['TransactItems'] = [
+            {action: self._prepare(dict(params)) for action, params in entry.items()}
+            for entry in kwargs['TransactItems']
+        ]
+        return self._send('TransactWriteItems', self.client.transact_write_items, kwargs)
+
+    def serialize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Python dict to AttributeValue map"""
+        serialize = self._serializer.serialize
+        return {key: serialize(value) for key, value in item.items()}
+
+    def deserialize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """AttributeValue map to Python dict"""
+        deserialize = self._deserializer.deserialize
+        return {key: deserialize(value) for key, value in item.items()}
+
+    def _encode_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return item if self.raw_items else self.serialize(item)
+
+    def _decode_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        return item if self.raw_items else self.deserialize(item)
+
+    @staticmethod
+    def _map_request(request: Dict[str, Any], convert_item, convert_key) -> Dict[str, Any]:
+        if 'PutRequest' in request:
+            return {'PutRequest': {'Item': convert_item(request['PutRequest']['Item'])}}
+        return {'DeleteRequest': {'Key': convert_key(request['DeleteRequest']['Key'])}}
+
+    def _send(self, name: str, operation, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Make the API call, recording latency, capacity and item count"""
+        if self.metrics is None:
+            return operation(**params)
+
+        params.setdefault('ReturnConsumedCapacity', 'TOTAL')
+        with measure(self.metrics, f'DynamoDB.{name}') as measurement:
+            response = operation(**params)
+            measurement.capacity = consumed_capacity(response)
+            measurement.items = _item_count(name, params, response)
+        if measurement.capacity:
+            self.metrics.add_capacity(measurement.capacity)
+        return response
+
+    def _call(self, name: str, operation, params: Dict[str, Any]) -> Dict[str, Any]:
+        response = self._send(name, operation, self._prepare(params))
+
+        if 'LastEvaluatedKey' in response:
+            response['LastEvaluatedKey'] = self.deserialize(response['LastEvaluatedKey'])
+        if self.raw_items:
+            return response
+        for key in _ITEM_RESPONSES:
+            if key in response:
+                response[key] = self.deserialize(response[key])
+        if 'Items' in response:
+            deserialize = self.deserialize
+            response['Items'] = [deserialize(item) for item in response['Items']]
+        return response
+
+    def _prepare(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Request parameters of one call on this table in AttributeValue form"""
+        params['TableName'] = self.name
+
+        # Build condition objects (Key('a').eq(1)) into expression strings
+        builder = None
+        names = params.get('ExpressionAttributeNames') or {}
+        values = params.get('ExpressionAttributeValues') or {}
+        for param in _CONDITION_PARAMS:
+            condition = params.get(param)
+            if isinstance(condition, ConditionBase):
+                builder = builder or ConditionExpressionBuilder()
+                built = builder.build_expression(condition, is_key_condition=param == 'KeyConditionExpression')
+                params[param] = built.condition_expression
+                names = {**names, **built.attribute_name_placeholders}
+                values = {**values, **built.attribute_value_placeholders}
+        if names:
+            params['ExpressionAttributeNames'] = names
+        if values:
+            params['ExpressionAttributeValues'] = self.serialize(values)
+
+        for param in _KEY_PARAMS:
+            if param in params:
+                params[param] = self.serialize(params[param])
+        if 'Item' in params:
+            params['Item'] = self._encode_item(params['Item'])
+        return params
+
+
+def _item_count(name: str, params: Dict[str, Any], response: Dict[str, Any]) -> int:
+    """Items read or written by a call"""
+    if 'Count' in response:
+        return response['Count']
+    if 'Responses' in response:
+        return sum(len(items) for items in response['Responses'].values())
+    if 'RequestItems' in params:
+        sent = sum(len(requests) for requests in params['RequestItems'].values())
+        return sent - sum(len(requests) for requests in response.get('UnprocessedItems', {}).values())
+    if name == 'GetItem':
+        return int('Item' in response)
+    if 'TransactItems' in params:
+        return len(params['TransactItems'])
+    # PutItem, UpdateItem and DeleteItem touch a single item
+    return 1
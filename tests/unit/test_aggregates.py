@@ -0,0 +1,187 @@
+"""
+Unit tests for the per-customer summaries kept from the orders stream.
+
+Stream records are built from codec.order_to_item images; the summary
+table is mocked with moto.
+"""
+import pytest
+import json
+from decimal import Decimal
+from unittest.mock import Mock, patch
+from moto import mock_dynamodb
+import boto3
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.aggregates import CustomerSummaryStore, stream_deltas
+from orders.codec import order_to_item
+from orders.handler import lambda_handler, stream_handler
+from orders.models import Order, OrderStatus
+
+
+def make_order(status=OrderStatus.PENDING, total='50.00', customer_id='customer-1',
+               created_at='2024-01-01T10:00:00', order_id='order-1'):
+    return Order(order_id, customer_id, Decimal(total), status, created_at=created_at)
+
+
+def stream_record(event_id, old=None, new=None, sequence='100'):
+    """A DynamoDB Streams record with NEW_AND_OLD_IMAGES"""
+    event_name = 'MODIFY' if old and new else 'INSERT' if new else 'REMOVE'
+    images = {'SequenceNumber': sequence, 'StreamViewType': 'NEW_AND_OLD_IMAGES'}
+    if old:
+        images['OldImage'] = order_to_item(old)
+    if new:
+        images['NewImage'] = order_to_item(new)
+    return {'eventID': event_id, 'eventName': event_name, 'eventSource': 'aws:dynamodb', 'dynamodb': images}
+
+
+@pytest.fixture
+def store():
+    """CustomerSummaryStore on a mock table."""
+    with mock_dynamodb():
+        boto3.client('dynamodb', region_name='eu-west-1').create_table(
+            TableName='test-summary-table',
+            KeySchema=[{'AttributeName': 'pk', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'pk', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        yield CustomerSummaryStore(
+            table_name='test-summary-table',
+            client=boto3.client('dynamodb', region_name='eu-west-1')
+        )
+
+
+class TestStreamDeltas:
+    """Test what each kind of stream record changes."""
+
+    def test_insert(self):
+        assert stream_deltas(stream_record('e1', new=make_order())) == {
+            'customer-1': {'order_count': 1, 'status_PENDING': 1, 'total_spend': Decimal('50.00')}
+        }
+
+    def test_status_change_moves_the_count(self):
+        record = stream_record('e1', old=make_order(), new=make_order(OrderStatus.SHIPPED))
+
+        assert stream_deltas(record) == {'customer-1': {'status_PENDING': -1, 'status_SHIPPED': 1}}
+
+    def test_cancel_removes_the_spend(self):
+        record = stream_record('e1', old=make_order(), new=make_order(OrderStatus.CANCELLED))
+
+        assert stream_deltas(record) == {
+            'customer-1': {'status_PENDING': -1, 'status_CANCELLED': 1, 'total_spend': Decimal('-50.00')}
+        }
+
+    def test_remove(self):
+        assert stream_deltas(stream_record('e1', old=make_order())) == {
+            'customer-1': {'order_count': -1, 'status_PENDING': -1, 'total_spend': Decimal('-50.00')}
+        }
+
+    def test_customer_change(self):
+        record = stream_record('e1', old=make_order(), new=make_order(customer_id='customer-2'))
+
+        deltas = stream_deltas(record)
+
+        assert deltas['customer-1']['order_count'] == -1
+        assert deltas['customer-2']['order_count'] == 1
+
+    def test_unrelated_update_changes_nothing(self):
+        old = make_order()
+        new = make_order()
+        new.version = 2
+
+        assert stream_deltas(stream_record('e1', old=old, new=new)) == {}
+
+
+class TestCustomerSummaryStore:
+    """Test summaries against the table."""
+
+    def test_unknown_customer_has_zeros(self, store):
+        summary = store.get_summary('customer-1')
+
+        assert summary['order_count'] == 0
+        assert summary['total_spend'] == 0
+        assert summary['orders_by_status'] == {}
+        assert summary['last_order_at'] is None
+
+    def test_lifecycle(self, store):
+        first = make_order(created_at='2024-01-02T10:00:00')
+        second = make_order(total='20.00', order_id='order-2', created_at='2024-01-01T10:00:00')
+        store.apply_record(stream_record('e1', new=first))
+        store.apply_record(stream_record('e2', new=second))
+        store.apply_record(stream_record('e3', old=second, new=make_order(
+            OrderStatus.CANCELLED, total='20.00', order_id='order-2', created_at='2024-01-01T10:00:00'
+        )))
+
+        summary = store.get_summary('customer-1')
+
+        assert summary['order_count'] == 2
+        assert summary['total_spend'] == Decimal('50.00')
+        assert summary['orders_by_status'] == {'PENDING': 1, 'CANCELLED': 1}
+        # The older order arrived later and did not move last_order_at back
+        assert summary['last_order_at'] == '2024-01-02T10:00:00'
+
+    def test_replay_is_not_counted_twice(self, store):
+        record = stream_record('e1', new=make_order())
+
+        assert store.apply_record(record) is True
+        assert store.apply_record(record) is False
+
+        summary = store.get_summary('customer-1')
+        assert summary['order_count'] == 1
+        assert summary['total_spend'] == Decimal('50.00')
+
+    def test_remove_drops_the_status(self, store):
+        store.apply_record(stream_record('e1', new=make_order()))
+        store.apply_record(stream_record('e2', old=make_order()))
+
+        summary = store.get_summary('customer-1')
+        assert summary['order_count'] == 0
+        assert summary['orders_by_status'] == {}
+
+
+class TestStreamHandler:
+    """Test the stream entry point and the summary endpoint."""
+
+    def test_applies_batch(self, store):
+        records = [
+            stream_record(f'e{i}', new=make_order(order_id=f'order-{i}'), sequence=str(i)) for i in range(3)
+        ]
+        with patch('orders.handler.get_summary_store', return_value=store):
+            response = stream_handler({'Records': records}, Mock())
+
+        assert response == {'batchItemFailures': []}
+        assert store.get_summary('customer-1')['order_count'] == 3
+
+    def test_stops_at_first_failure(self):
+        store = Mock()
+        store.apply_record.side_effect = [True, Exception('boom'), True]
+        records = [stream_record(f'e{i}', new=make_order(), sequence=str(100 + i)) for i in range(3)]
+
+        with patch('orders.handler.get_summary_store', return_value=store):
+            response = stream_handler({'Records': records}, Mock())
+
+        assert response == {'batchItemFailures': [{'itemIdentifier': '101'}]}
+        assert store.apply_record.call_count == 2
+
+    def test_summary_endpoint(self, store):
+        store.apply_record(stream_record('e1', new=make_order()))
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/customers/customer-1/summary',
+            'pathParameters': {'id': 'customer-1'},
+            'requestContext': {}
+        }
+
+        with patch('orders.handler.get_summary_store', return_value=store), \
+                patch.object(store.table, 'query') as query:
+            response = lambda_handler(event, Mock())
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['customer_id'] == 'customer-1'
+        assert body['order_count'] == 1
+        assert body['orders_by_status'] == {'PENDING': 1}
+        assert not query.called
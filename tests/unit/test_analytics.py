@@ -0,0 +1,107 @@
+"""
+Unit tests for the NumPy queries over columnar snapshots.
+"""
+import pytest
+from decimal import Decimal
+import random
+import sys
+import os
+
+np = pytest.importorskip('numpy')
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.analytics import Snapshot
+from orders.export import export_snapshot
+
+
+def row(customer_id, status, total_amount, created_at):
+    return {
+        'order_id': f'{customer_id}-{created_at}',
+        'customer_id': customer_id,
+        'status': status,
+        'total_amount': Decimal(total_amount),
+        'created_at': created_at
+    }
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = str(tmp_path / 'snapshot')
+    export_snapshot(iter([
+        [
+            row('customer-1', 'PENDING', '59.98', '2024-01-01T10:00:00'),
+            row('customer-2', 'SHIPPED', '10.00', '2024-01-01T23:59:59')
+        ],
+        [
+            row('customer-1', 'SHIPPED', '0.01', '2024-01-03T00:00:00'),
+            row('customer-3', 'PENDING', '100.00', '2024-01-03T12:00:00')
+        ]
+    ]), path)
+    return Snapshot(path)
+
+
+def reference(rows, key):
+    """group_by computed row by row with Decimals"""
+    groups = {}
+    for item in rows:
+        label = item['created_at'][:10] if key == 'day' else item[key]
+        group = groups.setdefault(label, {'count': 0, 'total_amount': Decimal('0.00')})
+        group['count'] += 1
+        group['total_amount'] += item['total_amount']
+    return groups
+
+
+class TestSnapshotGroupBy:
+    """Test vectorized group-by and sum."""
+
+    def test_by_status(self, snapshot):
+        assert snapshot.group_by('status') == {
+            'PENDING': {'count': 2, 'total_amount': Decimal('159.98')},
+            'SHIPPED': {'count': 2, 'total_amount': Decimal('10.01')}
+        }
+
+    def test_by_customer(self, snapshot):
+        assert snapshot.group_by('customer_id') == {
+            'customer-1': {'count': 2, 'total_amount': Decimal('59.99')},
+            'customer-2': {'count': 1, 'total_amount': Decimal('10.00')},
+            'customer-3': {'count': 1, 'total_amount': Decimal('100.00')}
+        }
+
+    def test_by_day_skips_empty_days(self, snapshot):
+        assert snapshot.group_by('day') == {
+            '2024-01-01': {'count': 2, 'total_amount': Decimal('69.98')},
+            '2024-01-03': {'count': 2, 'total_amount': Decimal('100.01')}
+        }
+
+    def test_filters(self, snapshot):
+        assert snapshot.group_by('customer_id', status='SHIPPED', created_from='2024-01-02T00:00:00') == {
+            'customer-1': {'count': 1, 'total_amount': Decimal('0.01')}
+        }
+        assert snapshot.group_by('status', created_to='2024-01-01T12:00:00') == {
+            'PENDING': {'count': 1, 'total_amount': Decimal('59.98')}
+        }
+
+    def test_unknown_key_is_rejected(self, snapshot):
+        with pytest.raises(ValueError):
+            snapshot.group_by('product_id')
+
+    def test_empty_snapshot(self, tmp_path):
+        path = str(tmp_path / 'snapshot')
+        export_snapshot(iter([]), path)
+
+        assert Snapshot(path).group_by('day') == {}
+
+    @pytest.mark.parametrize('key', ['status', 'customer_id', 'day'])
+    def test_chunks_match_row_by_row_sums(self, tmp_path, key):
+        rng = random.Random(7)
+        rows = [
+            row(f'customer-{rng.randrange(50)}', rng.choice(['PENDING', 'SHIPPED', 'CANCELLED']),
+                f'{rng.randrange(1, 100000) / 100:.2f}', f'2024-0{rng.randrange(1, 4)}-1{rng.randrange(10)}T10:00:00')
+            for _ in range(2000)
+        ]
+        path = str(tmp_path / 'snapshot')
+        export_snapshot((rows[start:start + 300] for start in range(0, len(rows), 300)), path)
+
+        assert Snapshot(path).group_by(key, chunk_rows=128) == reference(rows, key)
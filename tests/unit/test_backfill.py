@@ -0,0 +1,23 @@
+"""
+Unit tests for the StatusIndex backfill command.
+"""
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.backfill import main
+
+
+def test_backfill_runs_on_the_table(capsys):
+    repository = Mock()
+    repository.backfill_status_index.return_value = {'scanned': 10, 'updated': 4, 'skipped': 1}
+
+    with patch('orders.repository.CodecOrderRepository', return_value=repository) as repository_class:
+        main(['--table', 'orders-prod', '--segments', '4'])
+
+    repository_class.assert_called_once_with(table_name='orders-prod')
+    repository.backfill_status_index.assert_called_once_with(total_segments=4)
+    assert 'Scanned 10 orders: 4 updated, 1 changed meanwhile and skipped' in capsys.readouterr().out
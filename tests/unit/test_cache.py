@@ -0,0 +1,92 @@
+"""
+Unit tests for OrderCache.
+
+Uses a fake clock so TTL expiry is deterministic.
+"""
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.cache import OrderCache
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOrderCache:
+    """Test LRU + TTL behaviour and counters."""
+
+    def test_hit_and_miss_counters(self):
+        """Test hits and misses are counted."""
+        cache = OrderCache(max_entries=2, ttl_seconds=10)
+
+        assert cache.get("order-1") is None
+        cache.put("order-1", {"order_id": "order-1"})
+        assert cache.get("order-1") == {"order_id": "order-1"}
+
+        assert cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1}
+
+    def test_entries_expire_after_ttl(self):
+        """Test entries older than the TTL are treated as misses."""
+        clock = FakeClock()
+        cache = OrderCache(max_entries=2, ttl_seconds=5, clock=clock)
+        cache.put("order-1", "item")
+
+        clock.now = 4.9
+        assert cache.get("order-1") == "item"
+        clock.now = 5.0
+        assert cache.get("order-1") is None
+        assert cache.stats()['size'] == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the LRU entry goes first when the cache is full."""
+        cache = OrderCache(max_entries=2, ttl_seconds=10)
+        cache.put("order-1", 1)
+        cache.put("order-2", 2)
+        cache.get("order-1")
+        cache.put("order-3", 3)
+
+        assert cache.get("order-2") is None
+        assert cache.get("order-1") == 1
+        assert cache.get("order-3") == 3
+        assert cache.evictions == 1
+
+    def test_invalidate(self):
+        """Test invalidate drops a single entry."""
+        cache = OrderCache(max_entries=2, ttl_seconds=10)
+        cache.put("order-1", 1)
+        cache.put("order-2", 2)
+
+        cache.invalidate("order-1")
+        cache.invalidate("missing")
+
+        assert cache.get("order-1") is None
+        assert cache.get("order-2") == 2
+
+    def test_from_env_disabled_by_default(self, monkeypatch):
+        """Test the cache is off unless ORDER_CACHE_MAX_ENTRIES is set."""
+        monkeypatch.delenv("ORDER_CACHE_MAX_ENTRIES", raising=False)
+        assert OrderCache.from_env() is None
+
+        monkeypatch.setenv("ORDER_CACHE_MAX_ENTRIES", "100")
+        monkeypatch.setenv("ORDER_CACHE_TTL_SECONDS", "2.5")
+        cache = OrderCache.from_env()
+        assert cache.max_entries == 100
+        assert cache.ttl_seconds == 2.5
+
+    def test_invalid_configuration(self):
+        """Test nonsensical sizes are rejected."""
+        with pytest.raises(ValueError):
+            OrderCache(max_entries=0)
+        with pytest.raises(ValueError):
+            OrderCache(ttl_seconds=0)
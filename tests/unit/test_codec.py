@@ -0,0 +1,85 @@
+"""
+Unit tests for the AttributeValue codec.
+"""
+import pytest
+from decimal import Decimal
+from datetime import datetime
+from boto3.dynamodb.types import TypeSerializer
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.codec import order_to_item, item_to_order, item_order_id
+from orders.repository import OrderRepository
+from orders.models import Order, OrderStatus, OrderItem
+
+
+@pytest.fixture
+def order():
+    """Order with items and a price that does not survive a float round trip."""
+    return Order(
+        order_id="order-123",
+        customer_id="customer-456",
+        total_amount=Decimal("12345678901234.10"),
+        status=OrderStatus.SHIPPED,
+        items=[OrderItem("prod-1", 3, Decimal("0.10")), OrderItem("prod-2", 1, Decimal("19.99"))],
+        created_at=datetime(2026, 1, 1, 12, 0, 0),
+        version=4
+    )
+
+
+class TestCodec:
+    """Test the direct Order <-> AttributeValue conversion."""
+
+    def test_round_trip(self, order):
+        """Test encode then decode gives back the same order."""
+        decoded = item_to_order(order_to_item(order))
+
+        assert decoded.to_dict() == order.to_dict()
+        assert decoded.total_amount == Decimal("12345678901234.10")
+        assert decoded.items[0].price == Decimal("0.10")
+        assert decoded.version == 4
+
+    def test_wire_format_matches_type_serializer(self, order):
+        """Test items are byte-for-byte what the boto3 repository writes."""
+        # The boto3 path goes through float, so use an amount it keeps intact
+        order.total_amount = Decimal("59.98")
+        serializer = TypeSerializer()
+        expected = {
+            key: serializer.serialize(value)
+            for key, value in OrderRepository._order_to_item(order).items()
+        }
+
+        assert order_to_item(order) == expected
+
+    def test_timestamps_written_verbatim(self, order):
+        """Test stored timestamp strings are written as given, 'Z' suffix included."""
+        order = Order(
+            "order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING,
+            created_at="2026-01-01T12:00:00Z", updated_at="2026-01-02T08:30:00.123456Z"
+        )
+
+        item = order_to_item(order)
+
+        assert item['created_at'] == {'S': "2026-01-01T12:00:00Z"}
+        assert item['updated_at'] == {'S': "2026-01-02T08:30:00.123456Z"}
+
+    def test_decode_item_without_version(self, order):
+        """Test items written before versioning decode with version 0."""
+        item = order_to_item(order)
+        del item['version']
+
+        assert item_to_order(item).version == 0
+
+    def test_decode_numeric_price(self, order):
+        """Test line prices stored as numbers are accepted too."""
+        item = order_to_item(order)
+        item['items']['L'][0]['M']['price'] = {'N': '0.10'}
+
+        assert item_to_order(item).items[0].price == Decimal("0.10")
+
+    def test_item_order_id(self, order):
+        """Test the order id is read from the encoded key."""
+        assert item_order_id(order_to_item(order)) == "order-123"
@@ -0,0 +1,114 @@
+"""
+Unit tests for response compression.
+"""
+import base64
+import gzip
+import json
+import pytest
+from unittest.mock import patch
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders import compression
+
+LARGE_BODY = json.dumps({'orders': [{'order_id': f'order-{i}', 'status': 'PENDING'} for i in range(100)]})
+
+
+def make_response(body=LARGE_BODY):
+    return {'statusCode': 200, 'headers': {'Content-Type': 'application/json'}, 'body': body}
+
+
+class TestChooseEncoding:
+    """Accept-Encoding negotiation."""
+
+    @pytest.mark.parametrize('header, expected', [
+        (None, None),
+        ('', None),
+        ('identity', None),
+        ('gzip', 'gzip'),
+        ('GZIP, deflate', 'gzip'),
+        ('gzip;q=0', None),
+        ('*', 'gzip'),
+        ('*, gzip;q=0', None),
+    ])
+    def test_gzip_negotiation(self, header, expected):
+        with patch.object(compression, 'ENCODINGS', ('gzip',)):
+            assert compression.choose_encoding(header) == expected
+
+    def test_parses_q_values(self):
+        assert compression.parse_accept_encoding('gzip;q=0.5, br, x;q=bad') == \
+            {'gzip': 0.5, 'br': 1.0, 'x': 0.0}
+
+    def test_higher_q_wins(self):
+        with patch.object(compression, 'ENCODINGS', ('br', 'gzip')):
+            assert compression.choose_encoding('gzip, br;q=0.5') == 'gzip'
+            assert compression.choose_encoding('gzip, br') == 'br'
+
+
+class TestCompressResponse:
+    """compress_response on API Gateway proxy responses."""
+
+    def test_gzip_round_trip(self):
+        with patch.object(compression, 'ENCODINGS', ('gzip',)):
+            response = compression.compress_response(make_response(), 'gzip')
+
+        assert response['isBase64Encoded'] is True
+        assert response['headers']['Content-Encoding'] == 'gzip'
+        assert response['headers']['Content-Type'] == 'application/json'
+        assert gzip.decompress(base64.b64decode(response['body'])).decode() == LARGE_BODY
+
+    def test_output_is_deterministic(self):
+        first = compression.compress_response(make_response(), 'gzip')
+        second = compression.compress_response(make_response(), 'gzip')
+
+        assert first['body'] == second['body']
+
+    def test_original_response_is_untouched(self):
+        original = make_response()
+
+        compression.compress_response(original, 'gzip')
+
+        assert original == make_response()
+
+    def test_below_threshold_is_unchanged(self):
+        response = make_response('{"ok": true}')
+
+        assert compression.compress_response(response, 'gzip') is response
+
+    def test_threshold_can_be_overridden(self):
+        response = compression.compress_response(make_response(), 'gzip', min_bytes=len(LARGE_BODY) + 1)
+
+        assert 'isBase64Encoded' not in response
+
+    def test_incompressible_body_is_unchanged(self):
+        # gzip framing makes a tiny body bigger
+        response = make_response('{"ok": true}')
+
+        assert compression.compress_response(response, 'gzip', min_bytes=0) is response
+
+    def test_brotli(self):
+        brotli = pytest.importorskip('brotli')
+        with patch.object(compression, 'ENCODINGS', ('br', 'gzip')):
+            response = compression.compress_response(make_response(), 'gzip, br')
+
+        assert response['headers']['Content-Encoding'] == 'br'
+        assert brotli.decompress(base64.b64decode(response['body'])).decode() == LARGE_BODY
+
+
+class TestRequestBody:
+    """request_body decodes base64 bodies."""
+
+    def test_plain_body(self):
+        assert compression.request_body({'body': '{"a": 1}'}) == '{"a": 1}'
+
+    def test_base64_body(self):
+        event = {'body': base64.b64encode(b'{"a": 1}').decode(), 'isBase64Encoded': True}
+
+        assert compression.request_body(event) == '{"a": 1}'
+
+    def test_missing_body_uses_default(self):
+        assert compression.request_body({'isBase64Encoded': True}, '{}') == '{}'
+        assert compression.request_body({'body': None}) is None
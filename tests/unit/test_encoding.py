@@ -0,0 +1,111 @@
+"""
+Unit tests for the response encoders.
+"""
+import json
+import pytest
+from datetime import datetime
+from decimal import Decimal
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders import encoding
+from orders.models import Order, OrderStatus, OrderItem
+
+ENCODERS = [pytest.param(encoding.dumps_stdlib, id='stdlib')]
+if encoding.orjson is not None:
+    ENCODERS.append(pytest.param(encoding.dumps_orjson, id='orjson'))
+
+
+@pytest.mark.parametrize('dumps', ENCODERS)
+class TestEncoders:
+    """Both encoders must produce the same JSON values."""
+
+    def test_order_round_trip(self, dumps):
+        """Test orders encode with their amounts as JSON numbers."""
+        order = Order(
+            "order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING,
+            items=[OrderItem("prod-1", 2, Decimal("29.99"))],
+            created_at=datetime(2026, 1, 29, 12, 0, 0)
+        )
+
+        body = json.loads(dumps({'orders': [order.to_dict()]}), parse_float=Decimal)
+
+        encoded = body['orders'][0]
+        assert encoded['total_amount'] == Decimal("59.98")
+        assert encoded['status'] == "PENDING"
+        assert encoded['created_at'] == "2026-01-29T12:00:00"
+        assert encoded['items'][0]['price'] == "29.99"
+
+    def test_decimals_are_exact(self, dumps):
+        """Test amounts never lose digits through float."""
+        body = json.loads(dumps({
+            'big': Decimal("12345678901234567.89"),
+            'whole': Decimal("100"),
+            'small': Decimal("0.10")
+        }), parse_float=Decimal)
+
+        assert Decimal(str(body['big'])) == Decimal("12345678901234567.89")
+        assert body['whole'] == 100
+        assert body['small'] == Decimal("0.10")
+
+    def test_sixteen_digit_amounts_stay_exact_numbers(self, dumps):
+        """Test amounts float cannot hold keep every digit and stay numbers."""
+        encoded = dumps({'amount': Decimal("9999999999999999"), 'cents': Decimal("99999999999999.99")})
+
+        assert encoded == '{"amount":9999999999999999,"cents":99999999999999.99}'
+
+    def test_decimals_keep_their_digits(self, dumps):
+        """Test trailing zeros and exponents are written as the Decimal has them."""
+        assert dumps([Decimal("19.90"), Decimal("100"), Decimal("-0.10"), Decimal("1E+2")]) == \
+            '[19.90,100,-0.10,1E+2]'
+
+    def test_strings_that_look_marked_stay_strings(self, dumps):
+        """Test a string shaped like the stdlib encoder's internal marker is left alone."""
+        body = json.loads(dumps({'note': "\x0012.5", 'amount': Decimal("12.5")}))
+
+        assert body == {'note': "\x0012.5", 'amount': 12.5}
+
+    def test_non_finite_decimal_rejected(self, dumps):
+        """Test NaN cannot slip into a response."""
+        with pytest.raises((ValueError, TypeError)):
+            dumps({'amount': Decimal("NaN")})
+
+    def test_unknown_types_fall_back_to_str(self, dumps):
+        """Test unknown objects are encoded with str() like before."""
+        class Custom:
+            def __str__(self):
+                return "custom"
+
+        assert json.loads(dumps({'value': Custom()})) == {'value': "custom"}
+
+
+def test_orjson_keeps_decimal_digits():
+    """Test orjson writes Decimal digits verbatim."""
+    pytest.importorskip('orjson')
+    if not hasattr(encoding.orjson, 'Fragment'):
+        pytest.skip("orjson.Fragment needs orjson 3.9+")
+
+    assert encoding.dumps_orjson({'amount': Decimal("10.00")}) == '{"amount":10.00}'
+
+
+def test_encoders_produce_the_same_bytes():
+    """Test stdlib and orjson responses are byte-for-byte identical."""
+    pytest.importorskip('orjson')
+    if encoding.orjson is None:
+        pytest.skip("orjson.Fragment needs orjson 3.9+")
+    data = {
+        'orders': [
+            Order(
+                f"order-{i}", "customer-456", Decimal(amount), OrderStatus.PENDING,
+                items=[OrderItem("prod-1", 2, Decimal("9.95"))],
+                created_at=datetime(2026, 1, 29, 12, 0, i)
+            ).to_dict()
+            for i, amount in enumerate(["19.90", "10", "9999999999999999", "0.01", "12345678901234567.89"])
+        ],
+        'note': "\x00marked"
+    }
+
+    assert encoding.dumps_stdlib(data) == encoding.dumps_orjson(data)
@@ -0,0 +1,128 @@
+"""
+Unit tests for the columnar snapshot export.
+"""
+import pytest
+import json
+from array import array
+from decimal import Decimal
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.export import (
+    SnapshotWriter, export_snapshot, amount_cents, epoch_us, STATUSES, EXPORT_FIELDS, main
+)
+
+
+def row(customer_id='customer-1', status='PENDING', total_amount='59.98', created_at='2024-01-01T10:00:00'):
+    return {
+        'order_id': f'order-{customer_id}-{created_at}',
+        'customer_id': customer_id,
+        'status': status,
+        'total_amount': Decimal(total_amount),
+        'created_at': created_at
+    }
+
+
+def read_column(path, filename, typecode):
+    values = array(typecode)
+    with open(os.path.join(path, filename), 'rb') as f:
+        values.frombytes(f.read())
+    return list(values)
+
+
+class TestConversions:
+    """Test the column encodings."""
+
+    @pytest.mark.parametrize('value, expected', [
+        (Decimal('59.98'), 5998),
+        (Decimal('0.005'), 0),
+        (Decimal('0.015'), 2),
+        ('12', 1200),
+        (59.98, 5998)
+    ])
+    def test_amount_cents(self, value, expected):
+        assert amount_cents(value) == expected
+
+    def test_epoch_us_naive_is_utc(self):
+        assert epoch_us('1970-01-02T00:00:00.000001') == 86_400_000_001
+
+    def test_epoch_us_with_offset(self):
+        assert epoch_us('2024-01-01T10:00:00+02:00') == epoch_us('2024-01-01T08:00:00')
+        assert epoch_us('2024-01-01T08:00:00Z') == epoch_us('2024-01-01T08:00:00')
+
+
+class TestSnapshotWriter:
+    """Test snapshots are written column by column, page by page."""
+
+    def test_columns_and_manifest(self, tmp_path):
+        path = str(tmp_path / 'snapshot')
+        pages = [
+            [row('customer-1'), row('customer-2', 'SHIPPED', '10.00', '2024-01-03T00:00:00')],
+            [row('customer-1', 'CANCELLED', '5.50', '2023-12-31T23:59:59')]
+        ]
+
+        manifest = export_snapshot(iter(pages), path)
+
+        assert manifest['rows'] == 3
+        assert manifest['customers'] == 2
+        assert manifest['created_at_us'] == {
+            'min': epoch_us('2023-12-31T23:59:59'), 'max': epoch_us('2024-01-03T00:00:00')
+        }
+        assert read_column(path, 'amount_cents.bin', 'q') == [5998, 1000, 550]
+        assert read_column(path, 'customer.bin', 'I') == [0, 1, 0]
+        assert [STATUSES[code] for code in read_column(path, 'status.bin', 'B')] == \
+            ['PENDING', 'SHIPPED', 'CANCELLED']
+        with open(os.path.join(path, 'customers.json')) as f:
+            assert json.load(f) == ['customer-1', 'customer-2']
+        with open(os.path.join(path, 'manifest.json')) as f:
+            assert json.load(f)['rows'] == 3
+        assert not os.path.exists(path + '.partial')
+
+    def test_empty_export(self, tmp_path):
+        path = str(tmp_path / 'snapshot')
+
+        manifest = export_snapshot(iter([]), path)
+
+        assert manifest['rows'] == 0
+        assert manifest['created_at_us'] == {'min': None, 'max': None}
+        assert read_column(path, 'amount_cents.bin', 'q') == []
+
+    def test_failed_export_leaves_nothing(self, tmp_path):
+        path = str(tmp_path / 'snapshot')
+
+        def pages():
+            yield [row()]
+            raise RuntimeError("scan failed")
+
+        with pytest.raises(RuntimeError):
+            export_snapshot(pages(), path)
+
+        assert os.listdir(tmp_path) == []
+
+    def test_refuses_to_overwrite(self, tmp_path):
+        with pytest.raises(FileExistsError):
+            SnapshotWriter(str(tmp_path))
+
+    def test_unknown_status_is_rejected(self, tmp_path):
+        with pytest.raises(KeyError):
+            export_snapshot(iter([[row(status='LOST')]]), str(tmp_path / 'snapshot'))
+
+
+class TestExportCli:
+    """Test the command line entry point."""
+
+    def test_exports_the_table(self, tmp_path, capsys):
+        repository = Mock()
+        repository.scan_pages.return_value = iter([[row(f'customer-{i % 3}') for i in range(10)]])
+
+        with patch('orders.repository.CodecOrderRepository', return_value=repository) as repository_class:
+            main(['--output', str(tmp_path / 'snapshot'), '--table', 'orders', '--segments', '2'])
+
+        repository_class.assert_called_once_with(table_name='orders')
+        repository.scan_pages.assert_called_once_with(EXPORT_FIELDS, total_segments=2)
+        assert 'Exported 10 orders of 3 customers' in capsys.readouterr().out
+        assert sum(read_column(str(tmp_path / 'snapshot'), 'amount_cents.bin', 'q')) == 59980
@@ -4,6 +4,8 @@ Unit tests for Lambda handler.
 Tests HTTP routing and business logic with mocked repository.
 """
 import pytest
+import base64
+import gzip
 import json
 from decimal import Decimal
 from unittest.mock import Mock, patch
@@ -15,6 +17,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 
 from orders.handler import lambda_handler
 from orders.models import Order, OrderStatus, OrderItem
+from orders.exceptions import OrderNotFoundError, OrderConflictError, RepositoryThrottledError
 
 
 @pytest.fixture
@@ -130,6 +133,125 @@ class TestHandlerPOST:
         assert response['statusCode'] == 400
 
 
+    def test_post_orders_mistyped_item(self, mock_repository, api_context):
+        """Test a wrong JSON type in a line item is a 400, not a failed write."""
+        event = {
+            'httpMethod': 'POST',
+            'path': '/v1/orders',
+            'body': json.dumps({
+                'total_amount': 59.98,
+                'items': [{'product_id': 'prod-1', 'quantity': 'two', 'price': 29.99}]
+            }),
+            'requestContext': {'authorizer': {'claims': {'sub': 'user-123'}}}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+        assert 'quantity must be an integer' in json.loads(response['body'])['error']
+        assert not mock_repository.create_order.called
+
+class TestHandlerBatchPOST:
+    """Test POST /v1/orders:batch endpoint."""
+
+    def test_batch_create_all_valid(self, mock_repository, api_context):
+        """Test a fully valid batch returns 201 with every order."""
+        mock_repository.create_orders.side_effect = lambda orders: (orders, [])
+
+        event = {
+            'httpMethod': 'POST',
+            'path': '/v1/orders:batch',
+            'body': json.dumps({'orders': [
+                {'customer_id': 'customer-1', 'total_amount': 10.5},
+                {'customer_id': 'customer-2', 'total_amount': 20,
+                 'items': [{'product_id': 'prod-1', 'quantity': 1, 'price': 20}]}
+            ]}),
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 201
+        body = json.loads(response['body'])
+        assert body['created'] == 2
+        assert [r['status'] for r in body['results']] == ['CREATED', 'CREATED']
+        assert body['results'][1]['order']['customer_id'] == 'customer-2'
+        assert mock_repository.create_orders.call_count == 1
+
+    def test_batch_create_partial_failure(self, mock_repository, api_context):
+        """Test invalid and unwritten orders are reported per order with 207."""
+        mock_repository.create_orders.side_effect = lambda orders: (orders[:1], orders[1:])
+
+        event = {
+            'httpMethod': 'POST',
+            'path': '/v1/orders:batch',
+            'body': json.dumps({'orders': [
+                {'customer_id': 'customer-1', 'total_amount': 10},
+                {'customer_id': 'customer-1'},
+                {'customer_id': 'customer-1', 'total_amount': 30}
+            ]}),
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 207
+        body = json.loads(response['body'])
+        assert [r['status'] for r in body['results']] == ['CREATED', 'FAILED', 'FAILED']
+        assert 'total_amount' in body['results'][1]['error']
+        assert body['created'] == 1
+        assert body['failed'] == 2
+
+    def test_batch_create_mistyped_order_fails_alone(self, mock_repository, api_context):
+        """Test a mistyped order is rejected up front and never reaches the batch write."""
+        mock_repository.create_orders.side_effect = lambda orders: (orders, [])
+        valid = {'customer_id': 'customer-1', 'total_amount': 10,
+                 'items': [{'product_id': 'prod-1', 'quantity': 1, 'price': 10}]}
+        mistyped = dict(valid, items=[{'product_id': 'prod-1', 'quantity': 'two', 'price': 10}])
+
+        event = {
+            'httpMethod': 'POST',
+            'path': '/v1/orders:batch',
+            'body': json.dumps({'orders': [valid, mistyped, valid]}),
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 207
+        body = json.loads(response['body'])
+        assert [r['status'] for r in body['results']] == ['CREATED', 'FAILED', 'CREATED']
+        assert 'quantity must be an integer' in body['results'][1]['error']
+        assert len(mock_repository.create_orders.call_args.args[0]) == 2
+
+    def test_batch_create_too_many_orders(self, mock_repository, api_context):
+        """Test batches above the limit are rejected before any write."""
+        event = {
+            'httpMethod': 'POST',
+            'path': '/v1/orders:batch',
+            'body': json.dumps({'orders': [{'customer_id': 'c', 'total_amount': 1}] * 101}),
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+        assert not mock_repository.create_orders.called
+
+    def test_batch_create_empty(self, mock_repository, api_context):
+        """Test an empty batch is rejected."""
+        event = {
+            'httpMethod': 'POST',
+            'path': '/v1/orders:batch',
+            'body': json.dumps({'orders': []}),
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+
+
 class TestHandlerGET:
     """Test GET endpoints."""
 
@@ -139,7 +261,7 @@ class TestHandlerGET:
             Order("order-1", "customer-1", Decimal("59.98"), OrderStatus.PENDING),
             Order("order-2", "customer-2", Decimal("79.98"), OrderStatus.CONFIRMED)
         ]
-        mock_repository.list_orders.return_value = mock_orders
+        mock_repository.list_orders_page.return_value = (mock_orders, None)
 
         event = {
             'httpMethod': 'GET',
@@ -158,14 +280,28 @@ class TestHandlerGET:
         body = json.loads(response['body'])
         assert 'orders' in body
         assert len(body['orders']) == 2
-        assert mock_repository.list_orders.called
+        assert mock_repository.list_orders_page.called
+
+    def test_get_orders_trailing_slash(self, mock_repository, api_context):
+        """Test /v1/orders/ is an order without an id, not the list route."""
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders/',
+            'queryStringParameters': None,
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+        assert not mock_repository.list_orders_page.called
 
     def test_get_orders_by_customer(self, mock_repository, api_context):
         """Test getting orders filtered by customer."""
         mock_orders = [
             Order("order-1", "customer-123", Decimal("59.98"), OrderStatus.PENDING)
         ]
-        mock_repository.list_orders.return_value = mock_orders
+        mock_repository.list_orders_page.return_value = (mock_orders, None)
 
         event = {
             'httpMethod': 'GET',
@@ -185,6 +321,198 @@ class TestHandlerGET:
         assert len(body['orders']) == 1
         assert body['orders'][0]['customer_id'] == 'customer-123'
 
+    def test_get_orders_paginated(self, mock_repository, api_context):
+        """Test next_token is passed through and returned."""
+        mock_orders = [
+            Order("order-1", "customer-123", Decimal("59.98"), OrderStatus.PENDING)
+        ]
+        mock_repository.list_orders_page.return_value = (mock_orders, "token-2")
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {'limit': '1', 'next_token': 'token-1'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert body['next_token'] == 'token-2'
+        mock_repository.list_orders_page.assert_called_with(
+            customer_id=None, limit=1, next_token='token-1', status=None,
+            created_from=None, created_to=None, ascending=False, fields=None
+        )
+
+    def test_get_orders_by_status(self, mock_repository, api_context):
+        """Test the status filter is normalised and passed to the repository."""
+        mock_repository.list_orders_page.return_value = ([], None)
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {'status': 'pending'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 200
+        mock_repository.list_orders_page.assert_called_with(
+            customer_id=None, limit=50, next_token=None, status='PENDING',
+            created_from=None, created_to=None, ascending=False, fields=None
+        )
+
+    def test_get_orders_date_range(self, mock_repository, api_context):
+        """Test from/to are normalised to the stored created_at format."""
+        mock_repository.list_orders_page.return_value = ([], None)
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {
+                'customer_id': 'customer-123',
+                'from': '2024-01-01T12:00:00+02:00',
+                'to': '2024-01-07',
+                'order': 'asc'
+            },
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 200
+        mock_repository.list_orders_page.assert_called_with(
+            customer_id='customer-123', limit=50, next_token=None, status=None,
+            created_from='2024-01-01T10:00:00', created_to='2024-01-07T23:59:59.999999', ascending=True,
+            fields=None
+        )
+
+    @pytest.mark.parametrize('params', [
+        {'from': '2024-01-01'},
+        {'status': 'DELIVERED', 'from': '2024-01-01'},
+        {'customer_id': 'customer-123', 'from': '2024-02-01', 'to': '2024-01-01'},
+        {'customer_id': 'customer-123', 'from': 'last week'},
+        {'customer_id': 'customer-123', 'order': 'sideways'}
+    ])
+    def test_get_orders_invalid_range(self, mock_repository, api_context, params):
+        """Test unindexed, inverted or malformed ranges are rejected."""
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': params,
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+        assert not mock_repository.list_orders_page.called
+
+    @pytest.mark.parametrize('status, terminal_indexed, expected', [
+        ('PENDING', False, 200),
+        ('DELIVERED', False, 400),
+        ('DELIVERED', True, 200)
+    ])
+    def test_get_orders_status_range_needs_the_index(
+        self, mock_repository, api_context, status, terminal_indexed, expected
+    ):
+        """Test a status range is only served when that status is in StatusIndex."""
+        mock_repository.list_orders_page.return_value = ([], None)
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {'status': status, 'from': '2024-01-01'},
+            'requestContext': {}
+        }
+
+        with patch('orders.codec.STATUS_INDEX_TERMINAL', terminal_indexed):
+            response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == expected
+        assert mock_repository.list_orders_page.called == (expected == 200)
+
+    def test_get_orders_unknown_status(self, mock_repository, api_context):
+        """Test an unknown status is rejected before querying."""
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {'status': 'LOST'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+        assert not mock_repository.list_orders_page.called
+
+    def test_get_orders_invalid_token(self, mock_repository, api_context):
+        """Test a rejected next_token returns 400."""
+        mock_repository.list_orders_page.side_effect = ValueError("next_token is invalid or expired")
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {'next_token': 'forged'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+
+    def test_get_orders_limit_too_large(self, mock_repository, api_context):
+        """Test limit above the maximum page size is rejected."""
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {'limit': '100000'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+        assert not mock_repository.list_orders_page.called
+
+    def test_get_orders_by_ids(self, mock_repository, api_context):
+        """Test multi-get keeps request order and lists misses."""
+        mock_repository.get_orders.return_value = {
+            'order-2': Order("order-2", "customer-1", Decimal("10.00"), OrderStatus.PENDING),
+            'order-x': None,
+            'order-1': Order("order-1", "customer-1", Decimal("20.00"), OrderStatus.PENDING)
+        }
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {'ids': 'order-2,order-x,order-1'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 200
+        body = json.loads(response['body'])
+        assert [o['order_id'] for o in body['orders']] == ['order-2', 'order-1']
+        assert body['missing'] == ['order-x']
+        mock_repository.get_orders.assert_called_with(['order-2', 'order-x', 'order-1'])
+        assert not mock_repository.list_orders_page.called
+
+    def test_get_orders_by_ids_too_many(self, mock_repository, api_context):
+        """Test asking for more than 100 ids is rejected."""
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {'ids': ','.join(f'order-{i}' for i in range(101))},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+
     def test_get_order_by_id_found(self, mock_repository, api_context):
         """Test getting specific order by ID."""
         mock_order = Order(
@@ -213,6 +541,198 @@ class TestHandlerGET:
         assert body['order_id'] == 'order-123'
         mock_repository.get_order.assert_called_with('order-123')
 
+    def test_get_order_sparse_fields(self, mock_repository, api_context):
+        """Test fields= is passed down and trims the response."""
+        mock_repository.get_order.return_value = Order(
+            "order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING
+        )
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'queryStringParameters': {'fields': 'status,total_amount'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body']) == {'order_id': 'order-123', 'status': 'PENDING', 'total_amount': 59.98}
+        mock_repository.get_order.assert_called_with(
+            'order-123', fields={'order_id', 'status', 'total_amount', 'updated_at', 'version'}
+        )
+
+    def test_get_order_sets_etag(self, mock_repository, api_context):
+        """Test order responses carry the order's ETag."""
+        order = Order("order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING, version=3)
+        mock_repository.get_order.return_value = order
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['headers']['ETag'] == order.etag
+
+    @pytest.mark.parametrize('if_none_match', ['{etag}', 'W/{etag}', '"0-0", {etag}', '*'])
+    def test_get_order_not_modified(self, mock_repository, api_context, if_none_match):
+        """Test a matching If-None-Match gets 304 after a version-only read."""
+        order = Order("order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING, version=3)
+        mock_repository.get_order.return_value = order
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'headers': {'If-None-Match': if_none_match.format(etag=order.etag)},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 304
+        assert response['body'] == ''
+        assert response['headers']['ETag'] == order.etag
+        mock_repository.get_order.assert_called_once_with('order-123', fields=('order_id', 'updated_at', 'version'))
+
+    def test_get_order_without_version_not_modified(self, mock_repository, api_context):
+        """Test orders stored before versioning (read as version 0) still revalidate."""
+        order = Order("order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING,
+                      updated_at="2023-01-02T10:00:00", version=0)
+        # The projected read of such an item has no version attribute at all
+        mock_repository.get_order.return_value = Order.from_partial(
+            {'order_id': 'order-123', 'updated_at': '2023-01-02T10:00:00'}
+        )
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'headers': {'If-None-Match': order.etag},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 304
+
+    def test_get_order_modified_since_etag(self, mock_repository, api_context):
+        """Test a stale If-None-Match gets the full order."""
+        order = Order("order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING, version=4)
+        mock_repository.get_order.return_value = order
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'headers': {'if-none-match': '"3-00000000"'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['version'] == 4
+        assert response['headers']['ETag'] == order.etag
+        mock_repository.get_order.assert_called_with('order-123')
+
+    @staticmethod
+    def projecting(*orders):
+        """get_order side effect that returns partial orders for fields, like DynamoDB"""
+        by_id = {order.order_id: order for order in orders}
+
+        def get_order(order_id, fields=None):
+            order = by_id[order_id]
+            if fields is None:
+                return order
+            return Order.from_partial({k: v for k, v in order.to_dict().items() if k in fields})
+        return get_order
+
+    def test_sparse_get_etag_tracks_order_and_fieldset(self, mock_repository, api_context):
+        """Test sparse responses get the order's version in a fieldset-specific ETag."""
+        first = Order("order-1", "customer-456", Decimal("1"), OrderStatus.PENDING,
+                      updated_at="2024-01-01T10:00:00", version=3)
+        second = Order("order-2", "customer-456", Decimal("1"), OrderStatus.PENDING,
+                       updated_at="2024-01-02T10:00:00", version=7)
+        mock_repository.get_order.side_effect = self.projecting(first, second)
+
+        def get(order_id, fields):
+            return lambda_handler({
+                'httpMethod': 'GET',
+                'path': f'/v1/orders/{order_id}',
+                'pathParameters': {'id': order_id},
+                'queryStringParameters': {'fields': fields},
+                'requestContext': {}
+            }, api_context)
+
+        etags = {get(order_id, 'status')['headers']['ETag'] for order_id in ('order-1', 'order-2')}
+        status_etag = get('order-1', 'status')['headers']['ETag']
+        amount_etag = get('order-1', 'total_amount')['headers']['ETag']
+
+        assert len(etags) == 2
+        assert len({status_etag, amount_etag, first.etag}) == 3
+        assert json.loads(get('order-1', 'status')['body']) == {'order_id': 'order-1', 'status': 'PENDING'}
+        assert status_etag.startswith('"3-')
+
+    def test_sparse_get_revalidates_only_its_own_etag(self, mock_repository, api_context):
+        """Test 304 for the sparse ETag, but not for the full order's ETag."""
+        order = Order("order-1", "customer-456", Decimal("1"), OrderStatus.PENDING,
+                      updated_at="2024-01-01T10:00:00", version=3)
+        mock_repository.get_order.side_effect = self.projecting(order)
+
+        def get(if_none_match=None):
+            return lambda_handler({
+                'httpMethod': 'GET',
+                'path': '/v1/orders/order-1',
+                'pathParameters': {'id': 'order-1'},
+                'queryStringParameters': {'fields': 'status'},
+                'headers': {'If-None-Match': if_none_match} if if_none_match else {},
+                'requestContext': {}
+            }, api_context)
+
+        sparse_etag = get()['headers']['ETag']
+
+        assert get(sparse_etag)['statusCode'] == 304
+        assert get(order.etag)['statusCode'] == 200
+
+    def test_get_order_unknown_field(self, mock_repository, api_context):
+        """Test unknown fields are rejected before reading."""
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'queryStringParameters': {'fields': 'status,password'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+        assert not mock_repository.get_order.called
+
+    def test_list_orders_sparse_fields(self, mock_repository, api_context):
+        """Test fields= applies to every order of a listing."""
+        mock_repository.list_orders_page.return_value = (
+            [Order("order-1", "customer-456", Decimal("1"), OrderStatus.PENDING)], None
+        )
+
+        event = {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': {'customer_id': 'customer-456', 'fields': 'status'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert json.loads(response['body'])['orders'] == [{'order_id': 'order-1', 'status': 'PENDING'}]
+        assert mock_repository.list_orders_page.call_args.kwargs['fields'] == ('order_id', 'status')
+
     def test_get_order_by_id_not_found(self, mock_repository, api_context):
         """Test getting non-existent order."""
         mock_repository.get_order.return_value = None
@@ -240,18 +760,14 @@ class TestHandlerPUT:
 
     def test_put_order_success(self, mock_repository, api_context):
         """Test updating an order."""
-        existing_order = Order(
+        updated_order = Order(
             "order-123",
             "customer-456",
             Decimal("59.98"),
-            OrderStatus.PENDING
+            OrderStatus.CONFIRMED,
+            version=2
         )
-        mock_repository.get_order.return_value = existing_order
-
-        # Mock update to return the order with updated status
-        def update_side_effect(order):
-            return order
-        mock_repository.update_order.side_effect = update_side_effect
+        mock_repository.update_order_fields.return_value = updated_order
 
         event = {
             'httpMethod': 'PUT',
@@ -272,11 +788,16 @@ class TestHandlerPUT:
         assert response['statusCode'] == 200
         body = json.loads(response['body'])
         assert body['status'] == 'CONFIRMED'
-        assert mock_repository.update_order.called
+        assert body['version'] == 2
+        mock_repository.update_order_fields.assert_called_with(
+            'order-123', {'status': OrderStatus.CONFIRMED}, expected_version=None
+        )
+        # Single round trip, no pre-read
+        assert not mock_repository.get_order.called
 
     def test_put_order_not_found(self, mock_repository, api_context):
         """Test updating non-existent order."""
-        mock_repository.get_order.return_value = None
+        mock_repository.update_order_fields.side_effect = OrderNotFoundError('non-existent')
 
         event = {
             'httpMethod': 'PUT',
@@ -294,6 +815,127 @@ class TestHandlerPUT:
 
         assert response['statusCode'] == 404
 
+    def test_put_order_stale_version(self, mock_repository, api_context):
+        """Test a stale If-Match version returns 409."""
+        mock_repository.update_order_fields.side_effect = OrderConflictError('order-123', 1, 2)
+
+        event = {
+            'httpMethod': 'PUT',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'headers': {'if-match': '"1"'},
+            'body': json.dumps({'status': 'SHIPPED'}),
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 409
+        assert mock_repository.update_order_fields.call_args.kwargs['expected_version'] == 1
+
+    def test_put_order_if_match_etag(self, mock_repository, api_context):
+        """Test the ETag of a GET works as If-Match and the PUT returns the new one."""
+        current = Order("order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING, version=3)
+        updated = Order("order-123", "customer-456", Decimal("59.98"), OrderStatus.SHIPPED, version=4)
+        mock_repository.update_order_fields.return_value = updated
+
+        event = {
+            'httpMethod': 'PUT',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'headers': {'If-Match': current.etag},
+            'body': json.dumps({'status': 'SHIPPED'}),
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 200
+        assert response['headers']['ETag'] == updated.etag
+        assert mock_repository.update_order_fields.call_args.kwargs['expected_version'] == 3
+
+    def test_put_order_if_match_any(self, mock_repository, api_context):
+        """Test If-Match: * updates any existing order without a version check."""
+        mock_repository.update_order_fields.return_value = Order(
+            "order-123", "customer-456", Decimal("59.98"), OrderStatus.SHIPPED, version=4
+        )
+
+        event = {
+            'httpMethod': 'PUT',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'headers': {'If-Match': '*'},
+            'body': json.dumps({'status': 'SHIPPED'}),
+            'requestContext': {}
+        }
+
+        assert lambda_handler(event, api_context)['statusCode'] == 200
+        assert mock_repository.update_order_fields.call_args.kwargs['expected_version'] is None
+
+        mock_repository.update_order_fields.side_effect = OrderNotFoundError('order-123')
+        assert lambda_handler(event, api_context)['statusCode'] == 404
+
+    @pytest.mark.parametrize('if_match, expected', [
+        ('W/"3-1a2b3c4d"', 412),
+        ('3-1a2b3c4d', 400),
+        ('"three"', 400)
+    ])
+    def test_put_order_if_match_rejected(self, mock_repository, api_context, if_match, expected):
+        """Test weak or malformed If-Match values never reach the write."""
+        event = {
+            'httpMethod': 'PUT',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'headers': {'If-Match': if_match},
+            'body': json.dumps({'status': 'SHIPPED'}),
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == expected
+        assert 'invalid literal' not in json.loads(response['body'])['error']
+        assert not mock_repository.update_order_fields.called
+
+    def test_put_order_invalid_fields(self, mock_repository, api_context):
+        """Test invalid or empty updates are rejected before writing."""
+        for body in ({'status': 'UNKNOWN'}, {'total_amount': 0}, {'notes': 'x'}):
+            event = {
+                'httpMethod': 'PUT',
+                'path': '/v1/orders/order-123',
+                'pathParameters': {'id': 'order-123'},
+                'body': json.dumps(body),
+                'requestContext': {}
+            }
+
+            response = lambda_handler(event, api_context)
+
+            assert response['statusCode'] == 400
+        assert not mock_repository.update_order_fields.called
+
+
+    @pytest.mark.parametrize('body, message', [
+        ({'total_amount': True}, 'total_amount must be a number'),
+        ({'total_amount': 'abc'}, 'total_amount must be a number'),
+        ({'total_amount': 'NaN'}, 'total_amount must be a finite number'),
+        ({'status': 7}, 'status must be a string'),
+        ({'items': [{'product_id': 'p1', 'quantity': 1}]}, 'price must be a number')
+    ])
+    def test_put_order_field_types(self, mock_repository, api_context, body, message):
+        """Test PUT checks field types with the same messages as POST."""
+        event = {
+            'httpMethod': 'PUT',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'body': json.dumps(body),
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 400
+        assert json.loads(response['body'])['error'].endswith(message)
+        assert not mock_repository.update_order_fields.called
 
 class TestHandlerDELETE:
     """Test DELETE /v1/orders/{id} endpoint."""
@@ -319,6 +961,59 @@ class TestHandlerDELETE:
         mock_repository.delete_order.assert_called_with('order-123')
 
 
+    def test_delete_order_not_found(self, mock_repository, api_context):
+        """Test deleting a missing order returns 404 in one call."""
+        mock_repository.delete_order.side_effect = OrderNotFoundError('missing')
+
+        event = {
+            'httpMethod': 'DELETE',
+            'path': '/v1/orders/missing',
+            'pathParameters': {'id': 'missing'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 404
+        assert not mock_repository.get_order.called
+
+    def test_delete_order_return_representation(self, mock_repository, api_context):
+        """Test Prefer: return=representation returns the deleted order."""
+        mock_repository.delete_order.return_value = Order(
+            "order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING
+        )
+
+        event = {
+            'httpMethod': 'DELETE',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'headers': {'Prefer': 'return=representation'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 200
+        assert json.loads(response['body'])['order_id'] == 'order-123'
+        mock_repository.delete_order.assert_called_with('order-123', return_order=True)
+
+    def test_delete_order_throttled(self, mock_repository, api_context):
+        """Test throttling surfaces as 503 with Retry-After."""
+        mock_repository.delete_order.side_effect = RepositoryThrottledError('DeleteItem')
+
+        event = {
+            'httpMethod': 'DELETE',
+            'path': '/v1/orders/order-123',
+            'pathParameters': {'id': 'order-123'},
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 503
+        assert response['headers']['Retry-After'] == '1'
+
+
 class TestHandlerErrors:
     """Test error handling."""
 
@@ -337,10 +1032,31 @@ class TestHandlerErrors:
         response = lambda_handler(event, api_context)
 
         assert response['statusCode'] == 405
+        assert response['headers']['Allow'] == 'GET, POST'
+
+    def test_unknown_endpoint(self, mock_repository, api_context):
+        """Test paths without a route return 404."""
+        event = {'httpMethod': 'GET', 'path': '/v1/unknown', 'requestContext': {}}
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 404
+
+    def test_path_parameters_from_path(self, mock_repository, api_context):
+        """Test the order id is taken from the path when pathParameters is missing."""
+        mock_repository.get_order.return_value = Order(
+            "order-123", "customer-456", Decimal("10.00"), OrderStatus.PENDING
+        )
+        event = {'httpMethod': 'GET', 'path': '/v1/orders/order-123', 'requestContext': {}}
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 200
+        mock_repository.get_order.assert_called_once_with('order-123')
 
     def test_missing_authorization(self, mock_repository, api_context):
         """Test request without authorization - handler still processes but with no customer_id."""
-        mock_repository.list_orders.return_value = []
+        mock_repository.list_orders_page.return_value = ([], None)
 
         event = {
             'httpMethod': 'GET',
@@ -353,11 +1069,11 @@ class TestHandlerErrors:
 
         # Handler processes request even without auth (API Gateway should handle auth)
         assert response['statusCode'] == 200
-        assert mock_repository.list_orders.called
+        assert mock_repository.list_orders_page.called
 
     def test_internal_server_error(self, mock_repository, api_context):
         """Test handling of unexpected errors."""
-        mock_repository.list_orders.side_effect = Exception("Database error")
+        mock_repository.list_orders_page.side_effect = Exception("Database error")
 
         event = {
             'httpMethod': 'GET',
@@ -374,3 +1090,90 @@ class TestHandlerErrors:
         assert response['statusCode'] == 500
         body = json.loads(response['body'])
         assert 'error' in body
+
+    def test_response_headers_are_not_shared(self, mock_repository, api_context):
+        """Test headers added to one response do not leak into the next."""
+        mock_repository.delete_order.side_effect = RepositoryThrottledError('DeleteItem')
+        event = {
+            'httpMethod': 'DELETE',
+            'path': '/v1/orders/order-1',
+            'pathParameters': {'id': 'order-1'},
+            'requestContext': {}
+        }
+
+        throttled = lambda_handler(event, api_context)
+        mock_repository.delete_order.side_effect = OrderNotFoundError('order-1')
+        not_found = lambda_handler(event, api_context)
+
+        assert throttled['headers']['Retry-After'] == '1'
+        assert 'Retry-After' not in not_found['headers']
+
+
+class TestHandlerCompression:
+    """Test response compression and base64 request bodies."""
+
+    def list_event(self, accept_encoding=None):
+        return {
+            'httpMethod': 'GET',
+            'path': '/v1/orders',
+            'queryStringParameters': None,
+            'headers': {'Accept-Encoding': accept_encoding} if accept_encoding else {},
+            'requestContext': {}
+        }
+
+    def test_large_list_is_gzipped(self, mock_repository, api_context):
+        """Test a large listing is gzipped when the client accepts it."""
+        mock_repository.list_orders_page.return_value = ([
+            Order(f"order-{i}", "customer-1", Decimal("59.98"), OrderStatus.PENDING) for i in range(50)
+        ], None)
+
+        response = lambda_handler(self.list_event('gzip, deflate'), api_context)
+
+        assert response['statusCode'] == 200
+        assert response['isBase64Encoded'] is True
+        assert response['headers']['Content-Encoding'] == 'gzip'
+        assert response['headers']['Vary'] == 'Accept-Encoding'
+        body = json.loads(gzip.decompress(base64.b64decode(response['body'])))
+        assert len(body['orders']) == 50
+
+    def test_without_accept_encoding_body_is_plain(self, mock_repository, api_context):
+        """Test clients that do not ask for compression get plain JSON."""
+        mock_repository.list_orders_page.return_value = ([
+            Order(f"order-{i}", "customer-1", Decimal("59.98"), OrderStatus.PENDING) for i in range(50)
+        ], None)
+
+        response = lambda_handler(self.list_event(), api_context)
+
+        assert 'isBase64Encoded' not in response
+        assert 'Content-Encoding' not in response['headers']
+        assert len(json.loads(response['body'])['orders']) == 50
+
+    def test_small_response_is_not_compressed(self, mock_repository, api_context):
+        """Test responses under the threshold are sent as they are."""
+        mock_repository.list_orders_page.return_value = ([], None)
+
+        response = lambda_handler(self.list_event('gzip'), api_context)
+
+        assert 'Content-Encoding' not in response['headers']
+        assert json.loads(response['body'])['orders'] == []
+
+    def test_base64_request_body_is_decoded(self, mock_repository, api_context):
+        """Test bodies API Gateway passes base64-encoded are decoded."""
+        mock_repository.create_order.side_effect = lambda order: order
+        payload = json.dumps({
+            'customer_id': 'customer-123',
+            'total_amount': 59.98,
+            'items': [{'product_id': 'prod-1', 'quantity': 2, 'price': 29.99}]
+        })
+        event = {
+            'httpMethod': 'POST',
+            'path': '/v1/orders',
+            'body': base64.b64encode(payload.encode()).decode(),
+            'isBase64Encoded': True,
+            'requestContext': {}
+        }
+
+        response = lambda_handler(event, api_context)
+
+        assert response['statusCode'] == 201
+        assert json.loads(response['body'])['customer_id'] == 'customer-123'
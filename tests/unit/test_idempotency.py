@@ -0,0 +1,236 @@
+"""
+Unit tests for IdempotencyStore and Idempotency-Key handling.
+
+Uses moto to mock the idempotency table.
+"""
+import pytest
+import json
+from unittest.mock import Mock, patch
+from moto import mock_dynamodb
+import boto3
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.idempotency import IdempotencyStore, fingerprint, COMPLETED, IN_PROGRESS
+from orders.exceptions import IdempotencyKeyReusedError, IdempotencyInProgressError
+from orders.handler import lambda_handler
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def store(clock):
+    """IdempotencyStore on a mock table."""
+    with mock_dynamodb():
+        boto3.client('dynamodb', region_name='eu-west-1').create_table(
+            TableName='test-idempotency-table',
+            KeySchema=[{'AttributeName': 'idempotency_key', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'idempotency_key', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        yield IdempotencyStore(
+            table_name='test-idempotency-table',
+            client=boto3.client('dynamodb', region_name='eu-west-1'),
+            ttl_seconds=3600,
+            lock_seconds=30,
+            clock=clock
+        )
+
+
+RESPONSE = {'statusCode': 201, 'headers': {'Content-Type': 'application/json'}, 'body': '{"order_id": "order-1"}'}
+
+
+class TestIdempotencyStore:
+    """Test the record lifecycle."""
+
+    def test_first_request_takes_the_key(self, store):
+        assert store.replay('key-1', 'hash-1') is None
+
+        record = store.get('key-1')
+        assert record['state'] == IN_PROGRESS
+        assert record['expires_at'] == 1_700_000_030
+
+    def test_retry_gets_stored_response(self, store):
+        store.replay('key-1', 'hash-1')
+        store.complete('key-1', 'hash-1', RESPONSE)
+
+        with patch.object(store.table, 'put_item') as put_item:
+            assert store.replay('key-1', 'hash-1') == RESPONSE
+        # Served by the read alone
+        assert not put_item.called
+        assert store.get('key-1')['state'] == COMPLETED
+
+    def test_different_body_is_rejected(self, store):
+        store.replay('key-1', 'hash-1')
+        store.complete('key-1', 'hash-1', RESPONSE)
+
+        with pytest.raises(IdempotencyKeyReusedError):
+            store.replay('key-1', 'hash-2')
+
+    def test_concurrent_retry_waits(self, store):
+        store.replay('key-1', 'hash-1')
+
+        with pytest.raises(IdempotencyInProgressError):
+            store.replay('key-1', 'hash-1')
+
+    def test_lost_read_race_returns_holder(self, store):
+        """Test a retry that missed the record on read still sees the holder."""
+        store.replay('key-1', 'hash-1')
+
+        record = store.lock('key-1', 'hash-1')
+
+        assert record['state'] == IN_PROGRESS
+        assert record['fingerprint'] == 'hash-1'
+
+    def test_expired_lock_can_be_taken_again(self, store, clock):
+        store.replay('key-1', 'hash-1')
+        clock.now += 31
+
+        assert store.replay('key-1', 'hash-1') is None
+
+    def test_expired_response_is_not_replayed(self, store, clock):
+        store.replay('key-1', 'hash-1')
+        store.complete('key-1', 'hash-1', RESPONSE)
+        clock.now += 3601
+
+        assert store.get('key-1') is None
+        assert store.replay('key-1', 'hash-2') is None
+
+    def test_release_frees_the_key(self, store):
+        store.replay('key-1', 'hash-1')
+        store.release('key-1')
+
+        assert store.replay('key-1', 'hash-1') is None
+
+    def test_from_env(self):
+        with patch.dict(os.environ, {'IDEMPOTENCY_TABLE': ''}):
+            assert IdempotencyStore.from_env() is None
+
+    def test_fingerprint(self):
+        assert fingerprint('{"a": 1}') == fingerprint('{"a": 1}')
+        assert fingerprint('{"a": 1}') != fingerprint('{"a": 2}')
+        assert fingerprint(None) == fingerprint('')
+
+
+@pytest.fixture
+def mock_repository():
+    """Mock repository that echoes created orders."""
+    with patch('orders.handler.get_repository') as mock:
+        repo_instance = Mock()
+        repo_instance.create_order.side_effect = lambda order: order
+        mock.return_value = repo_instance
+        yield repo_instance
+
+
+@pytest.fixture
+def handler_store(store):
+    with patch('orders.handler.get_idempotency_store', return_value=store):
+        yield store
+
+
+def create_event(key='key-1', body=None, customer='user-123'):
+    return {
+        'httpMethod': 'POST',
+        'path': '/v1/orders',
+        'headers': {'Idempotency-Key': key} if key else {},
+        'body': json.dumps(body or {
+            'customer_id': 'customer-123',
+            'total_amount': 59.98,
+            'items': [{'product_id': 'prod-1', 'quantity': 2, 'price': 29.99}]
+        }),
+        'requestContext': {'authorizer': {'claims': {'sub': customer}}}
+    }
+
+
+class TestHandlerIdempotency:
+    """Test POST /v1/orders with an Idempotency-Key."""
+
+    def test_retry_replays_the_201(self, mock_repository, handler_store):
+        first = lambda_handler(create_event(), Mock())
+        retry = lambda_handler(create_event(), Mock())
+
+        assert first['statusCode'] == retry['statusCode'] == 201
+        assert retry['body'] == first['body']
+        assert retry['headers']['Idempotent-Replayed'] == 'true'
+        assert 'Idempotent-Replayed' not in first['headers']
+        assert mock_repository.create_order.call_count == 1
+
+    def test_keys_are_per_customer(self, mock_repository, handler_store):
+        lambda_handler(create_event(customer='user-1'), Mock())
+        other = lambda_handler(create_event(customer='user-2'), Mock())
+
+        assert 'Idempotent-Replayed' not in other['headers']
+        assert mock_repository.create_order.call_count == 2
+
+    def test_reused_key_with_other_body(self, mock_repository, handler_store):
+        lambda_handler(create_event(), Mock())
+        response = lambda_handler(create_event(body={
+            'total_amount': 10, 'items': [{'product_id': 'prod-2', 'quantity': 1, 'price': 10}]
+        }), Mock())
+
+        assert response['statusCode'] == 422
+        assert mock_repository.create_order.call_count == 1
+
+    def test_in_progress_key(self, mock_repository, handler_store):
+        handler_store.lock('user-123#key-1', fingerprint(create_event()['body']))
+
+        response = lambda_handler(create_event(), Mock())
+
+        assert response['statusCode'] == 409
+        assert response['headers']['Retry-After'] == '1'
+        assert not mock_repository.create_order.called
+
+    def test_server_error_releases_the_key(self, mock_repository, handler_store):
+        calls = []
+
+        def create_order(order):
+            calls.append(order)
+            if len(calls) == 1:
+                raise Exception('boom')
+            return order
+        mock_repository.create_order.side_effect = create_order
+
+        failed = lambda_handler(create_event(), Mock())
+        retry = lambda_handler(create_event(), Mock())
+
+        assert failed['statusCode'] == 500
+        assert retry['statusCode'] == 201
+        assert 'Idempotent-Replayed' not in retry['headers']
+
+    def test_validation_error_is_stored(self, mock_repository, handler_store):
+        event = create_event(body={
+            'total_amount': 0, 'items': [{'product_id': 'prod-1', 'quantity': 1, 'price': 10}]
+        })
+
+        first = lambda_handler(event, Mock())
+        retry = lambda_handler(event, Mock())
+
+        assert first['statusCode'] == retry['statusCode'] == 400
+        assert retry['headers']['Idempotent-Replayed'] == 'true'
+
+    def test_key_too_long(self, mock_repository, handler_store):
+        response = lambda_handler(create_event(key='k' * 256), Mock())
+
+        assert response['statusCode'] == 400
+        assert not mock_repository.create_order.called
+
+    def test_without_key_or_store(self, mock_repository):
+        with patch('orders.handler.get_idempotency_store', return_value=None):
+            responses = [lambda_handler(create_event(), Mock()) for _ in range(2)]
+
+        assert [r['statusCode'] for r in responses] == [201, 201]
+        assert mock_repository.create_order.call_count == 2
@@ -0,0 +1,139 @@
+"""
+Unit tests for the SQS ingestion entry point.
+
+Runs sqs_handler on generated SQS events against the in-memory store.
+"""
+import pytest
+import json
+from decimal import Decimal
+from unittest.mock import Mock, patch
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.handler import sqs_handler
+from orders.memory_store import InMemoryOrderRepository
+from orders.models import Order
+
+
+def sqs_event(bodies):
+    """SQS event as Lambda receives it, message ids msg-0, msg-1, ..."""
+    return {'Records': [
+        {
+            'messageId': f'msg-{i}',
+            'receiptHandle': f'handle-{i}',
+            'body': body if isinstance(body, str) else json.dumps(body),
+            'attributes': {'ApproximateReceiveCount': '1'},
+            'messageAttributes': {},
+            'eventSource': 'aws:sqs',
+            'eventSourceARN': 'arn:aws:sqs:eu-west-1:123456789012:orders-ingest'
+        }
+        for i, body in enumerate(bodies)
+    ]}
+
+
+def payload(customer_id='customer-1', total_amount=59.98):
+    return {
+        'customer_id': customer_id,
+        'total_amount': total_amount,
+        'items': [{'product_id': 'prod-1', 'quantity': 2, 'price': 29.99}]
+    }
+
+
+@pytest.fixture
+def store():
+    repository = InMemoryOrderRepository()
+    with patch('orders.handler.get_repository', return_value=repository):
+        yield repository
+
+
+class TestSqsHandler:
+    """Test batch ingestion with partial batch failures."""
+
+    def test_valid_batch_is_written(self, store):
+        response = sqs_handler(sqs_event([payload(f'customer-{i}') for i in range(30)]), Mock())
+
+        assert response == {'batchItemFailures': []}
+        assert len(list(store.scan_orders())) == 30
+        assert store.get_orders_by_customer('customer-7')[0].total_amount == Decimal('59.98')
+
+    def test_only_invalid_messages_fail(self, store):
+        event = sqs_event([
+            payload(),
+            'not json',
+            payload(total_amount=0),
+            {'total_amount': 10},
+            [1, 2],
+            payload('customer-2')
+        ])
+
+        response = sqs_handler(event, Mock())
+
+        assert response['batchItemFailures'] == [
+            {'itemIdentifier': 'msg-1'},
+            {'itemIdentifier': 'msg-2'},
+            {'itemIdentifier': 'msg-3'},
+            {'itemIdentifier': 'msg-4'}
+        ]
+        assert sorted(o.customer_id for o in store.scan_orders()) == ['customer-1', 'customer-2']
+
+    @pytest.mark.parametrize('bad', [
+        dict(payload(), customer_id=123),
+        dict(payload(), items=[{'product_id': 'prod-1', 'quantity': 'two', 'price': 29.99}]),
+        dict(payload(), items=[{'product_id': 7, 'quantity': 1, 'price': 29.99}]),
+        dict(payload(), items=[{'product_id': 'prod-1', 'quantity': 1, 'price': 'NaN'}]),
+        dict(payload(), items={'product_id': 'prod-1'}),
+        dict(payload(), total_amount=True)
+    ])
+    def test_mistyped_message_fails_alone(self, store, bad):
+        """A wrong JSON type is rejected up front instead of failing the write of its chunk"""
+        response = sqs_handler(sqs_event([payload(), payload(), bad, payload(), payload()]), Mock())
+
+        assert response == {'batchItemFailures': [{'itemIdentifier': 'msg-2'}]}
+        assert len(list(store.scan_orders())) == 4
+
+    def test_duplicate_message_ids_in_one_batch(self, store):
+        event = sqs_event([payload(), payload('customer-2')])
+        event['Records'].append(dict(event['Records'][0]))
+
+        response = sqs_handler(event, Mock())
+
+        assert response == {'batchItemFailures': []}
+        assert len(list(store.scan_orders())) == 2
+
+    def test_redelivery_does_not_duplicate(self, store):
+        event = sqs_event([payload()])
+
+        sqs_handler(event, Mock())
+        sqs_handler(event, Mock())
+
+        assert len(list(store.scan_orders())) == 1
+
+    def test_unwritten_orders_fail(self):
+        repository = Mock()
+
+        def create_orders(orders):
+            return orders[:1], orders[1:]
+        repository.create_orders.side_effect = create_orders
+
+        with patch('orders.handler.get_repository', return_value=repository):
+            response = sqs_handler(sqs_event([payload(), 'bad', payload(), payload()]), Mock())
+
+        assert [f['itemIdentifier'] for f in response['batchItemFailures']] == ['msg-1', 'msg-2', 'msg-3']
+        # One batched write for the whole SQS batch
+        assert repository.create_orders.call_count == 1
+        assert all(isinstance(order, Order) for order in repository.create_orders.call_args.args[0])
+
+    def test_write_error_fails_every_message(self):
+        repository = Mock()
+        repository.create_orders.side_effect = Exception('boom')
+
+        with patch('orders.handler.get_repository', return_value=repository):
+            response = sqs_handler(sqs_event([payload(), payload()]), Mock())
+
+        assert [f['itemIdentifier'] for f in response['batchItemFailures']] == ['msg-0', 'msg-1']
+
+    def test_empty_event(self, store):
+        assert sqs_handler({'Records': []}, Mock()) == {'batchItemFailures': []}
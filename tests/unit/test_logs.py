@@ -0,0 +1,142 @@
+"""
+Unit tests for sampled structured logging.
+"""
+import json
+import logging
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders import logs
+from orders.logs import (
+    RequestSampler, SamplingFilter, JsonFormatter, parse_sample_rates, redact_event, REDACTED
+)
+
+
+def make_record(level=logging.INFO, msg="Created order: %s", args=("order-1",), **extra):
+    record = logging.LogRecord('root', level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+@pytest.fixture
+def sampler():
+    """Restore the shared sampler after each test."""
+    rates, event_rate = logs.sampler.rates, logs.sampler.event_rate
+    yield logs.sampler
+    logs.sampler.rates, logs.sampler.event_rate = rates, event_rate
+    logs.sampler.draw = 0.0
+
+
+class TestSampling:
+    """Test per-request, per-level sampling."""
+
+    def test_parse_sample_rates(self):
+        """Test env values map to level numbers and are clamped."""
+        assert parse_sample_rates("DEBUG=0.01, info=0.1,WARNING=2") == {
+            logging.DEBUG: 0.01, logging.INFO: 0.1, logging.WARNING: 1.0
+        }
+        assert parse_sample_rates("") == {}
+        with pytest.raises(ValueError):
+            parse_sample_rates("VERBOSE=1")
+
+    def test_levels_share_one_draw(self):
+        """Test a request sampled at DEBUG is also sampled at INFO."""
+        sampler = RequestSampler({logging.DEBUG: 0.1, logging.INFO: 0.5}, random_source=lambda: 0.05)
+        sampler.start("req-1")
+        assert sampler.sampled(logging.DEBUG) and sampler.sampled(logging.INFO)
+
+        sampler._random = lambda: 0.3
+        sampler.start("req-2")
+        assert not sampler.sampled(logging.DEBUG)
+        assert sampler.sampled(logging.INFO)
+        assert sampler.sampled(logging.ERROR)
+
+    def test_filter_drops_unsampled_records(self):
+        """Test the filter tags request ids and honours pre-sampled records."""
+        sampler = RequestSampler({logging.INFO: 0.1}, random_source=lambda: 0.5)
+        sampler.start("req-1")
+        log_filter = SamplingFilter(sampler)
+
+        info = make_record()
+        assert not log_filter.filter(info)
+        assert info.request_id == "req-1"
+        assert log_filter.filter(make_record(sampled=True))
+        assert log_filter.filter(make_record(level=logging.ERROR))
+
+    def test_messages_are_formatted_lazily(self):
+        """Test filtered records never format their arguments."""
+        class Expensive:
+            def __str__(self):
+                raise AssertionError("formatted a dropped record")
+
+        logger = logging.getLogger('orders.test.lazy')
+        sampler = RequestSampler({logging.INFO: 0.0})
+        sampler.start()
+        logger.addFilter(SamplingFilter(sampler))
+        try:
+            logger.info("Order: %s", Expensive())
+        finally:
+            logger.filters.clear()
+
+
+class TestFormatting:
+    """Test JSON output and redaction."""
+
+    def test_json_formatter(self):
+        """Test extra fields become top-level keys."""
+        entry = json.loads(JsonFormatter().format(make_record(order_id="order-1", request_id="req-1")))
+
+        assert entry['level'] == 'INFO'
+        assert entry['message'] == "Created order: order-1"
+        assert entry['order_id'] == "order-1"
+        assert entry['request_id'] == "req-1"
+
+    def test_redact_event(self):
+        """Test secrets, bodies and extra claims are removed."""
+        event = {
+            'httpMethod': 'POST',
+            'path': '/v1/orders',
+            'headers': {'Authorization': 'Bearer secret', 'Content-Type': 'application/json'},
+            'multiValueHeaders': {'Cookie': ['a=b']},
+            'body': '{"total_amount": 10}',
+            'requestContext': {'authorizer': {'claims': {'sub': 'user-1', 'email': 'a@b.c'}}}
+        }
+
+        redacted = redact_event(event)
+
+        assert redacted['headers'] == {'Authorization': REDACTED, 'Content-Type': 'application/json'}
+        assert redacted['multiValueHeaders'] == {'Cookie': REDACTED}
+        assert 'total_amount' not in redacted['body']
+        assert redacted['requestContext']['authorizer']['claims'] == {'sub': 'user-1'}
+        assert event['headers']['Authorization'] == 'Bearer secret'
+
+
+class TestLogRequest:
+    """Test the per-request summary line."""
+
+    EVENT = {'httpMethod': 'GET', 'path': '/v1/orders', 'headers': {'Authorization': 'secret'}}
+
+    def test_event_only_for_sampled_requests(self, sampler, caplog):
+        """Test unsampled requests log the summary without the event."""
+        sampler.event_rate = 0.0
+        sampler.start()
+        with caplog.at_level(logging.INFO):
+            logs.log_request(logging.getLogger(), self.EVENT, 200, 1.5)
+
+        assert caplog.records[-1].status == 200
+        assert not hasattr(caplog.records[-1], 'event')
+
+    def test_event_logged_for_errors(self, sampler, caplog):
+        """Test server errors always include the redacted event."""
+        sampler.event_rate = 0.0
+        sampler.start()
+        with caplog.at_level(logging.INFO):
+            logs.log_request(logging.getLogger(), self.EVENT, 500, 1.5)
+
+        record = caplog.records[-1]
+        assert record.levelno == logging.ERROR
+        assert record.event['headers']['Authorization'] == REDACTED
@@ -0,0 +1,128 @@
+"""
+Unit tests for Embedded Metric Format metrics.
+"""
+import json
+import pytest
+from decimal import Decimal
+from moto import mock_dynamodb
+import boto3
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.metrics import MetricsRecorder, Measurement, measure, consumed_capacity, MAX_VALUES_PER_LINE
+from orders.repository import OrderRepository
+from orders.cache import OrderCache
+from orders.models import Order, OrderStatus
+
+
+@pytest.fixture
+def lines():
+    return []
+
+
+@pytest.fixture
+def recorder(lines):
+    return MetricsRecorder('OrdersApi/test', write=lines.append, clock=lambda: 1700000000.0)
+
+
+def by_operation(lines):
+    return {entry['Operation']: entry for entry in map(json.loads, lines)}
+
+
+class TestMetricsRecorder:
+    """Test EMF output."""
+
+    def test_flush_writes_one_line_per_operation(self, recorder, lines):
+        """Test values of an operation are batched into arrays."""
+        for latency in (1.0, 2.0):
+            measurement = Measurement('DynamoDB.GetItem')
+            measurement.capacity = 0.5
+            measurement.items = 1
+            recorder.record(measurement, latency)
+        recorder.record(Measurement('GET /v1/orders'), 3.0)
+
+        assert recorder.flush() == 2
+        entries = by_operation(lines)
+
+        get_item = entries['DynamoDB.GetItem']
+        assert get_item['_aws']['Timestamp'] == 1700000000000
+        assert get_item['_aws']['CloudWatchMetrics'][0]['Namespace'] == 'OrdersApi/test'
+        assert get_item['_aws']['CloudWatchMetrics'][0]['Dimensions'] == [['Operation']]
+        assert get_item['Latency'] == [1.0, 2.0]
+        assert get_item['ConsumedCapacity'] == [0.5, 0.5]
+        assert get_item['ItemCount'] == [1, 1]
+        # Only metrics with values are declared
+        declared = [metric['Name'] for metric in entries['GET /v1/orders']['_aws']['CloudWatchMetrics'][0]['Metrics']]
+        assert declared == ['Latency']
+
+    def test_flush_splits_long_series(self, recorder, lines):
+        """Test no line carries more than 100 values per metric."""
+        for _ in range(MAX_VALUES_PER_LINE + 1):
+            recorder.record(Measurement('DynamoDB.Query'), 1.0)
+
+        assert recorder.flush() == 2
+        assert [len(json.loads(line)['Latency']) for line in lines] == [MAX_VALUES_PER_LINE, 1]
+        assert recorder.flush() == 0
+
+    def test_measure_charges_nested_capacity(self, recorder, lines):
+        """Test outer operations get the capacity consumed inside them."""
+        with measure(recorder, 'GET /v1/orders/{id}'):
+            recorder.add_capacity(0.5)
+            recorder.add_capacity(1.0)
+        with measure(None, 'disabled'):
+            pass
+
+        recorder.flush()
+        assert by_operation(lines)['GET /v1/orders/{id}']['ConsumedCapacity'] == [1.5]
+
+    def test_consumed_capacity(self):
+        """Test single and batch ConsumedCapacity shapes."""
+        assert consumed_capacity({}) is None
+        assert consumed_capacity({'ConsumedCapacity': {'CapacityUnits': 0.5}}) == 0.5
+        assert consumed_capacity({'ConsumedCapacity': [{'CapacityUnits': 1}, {'CapacityUnits': 2}]}) == 3.0
+
+    def test_from_env(self, monkeypatch):
+        """Test metrics are off unless METRICS_NAMESPACE is set."""
+        monkeypatch.delenv('METRICS_NAMESPACE', raising=False)
+        assert MetricsRecorder.from_env() is None
+
+        monkeypatch.setenv('METRICS_NAMESPACE', 'OrdersApi/dev')
+        assert MetricsRecorder.from_env().namespace == 'OrdersApi/dev'
+
+
+class TestRepositoryMetrics:
+    """Test repository and DynamoDB calls are recorded."""
+
+    @pytest.fixture
+    def repository(self, recorder):
+        with mock_dynamodb():
+            boto3.client('dynamodb', region_name='eu-west-1').create_table(
+                TableName='test-orders-table',
+                KeySchema=[{'AttributeName': 'order_id', 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': 'order_id', 'AttributeType': 'S'}],
+                BillingMode='PAY_PER_REQUEST'
+            )
+            yield OrderRepository(table_name='test-orders-table', cache=OrderCache(), metrics=recorder)
+
+    def test_operations_recorded(self, repository, recorder, lines):
+        """Test latency, capacity, item counts and cache hits are recorded."""
+        repository.create_order(Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING))
+        repository.get_order("order-1")
+        repository.get_order("order-1")
+        repository.get_orders(["order-1", "missing"])
+
+        recorder.flush()
+        entries = by_operation(lines)
+
+        assert entries['DynamoDB.PutItem']['ConsumedCapacity'][0] > 0
+        assert entries['DynamoDB.GetItem']['ItemCount'] == [1]
+        assert (
+            entries['OrderRepository.create_order']['ConsumedCapacity']
+            == entries['DynamoDB.PutItem']['ConsumedCapacity']
+        )
+        assert entries['OrderRepository.get_order']['ItemCount'] == [1, 1]
+        assert entries['OrderCache.get']['CacheHit'] == [0, 1]
+        assert entries['OrderRepository.get_orders']['ItemCount'] == [1]
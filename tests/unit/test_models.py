@@ -12,7 +12,7 @@ import os
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
 
-from orders.models import Order, OrderStatus, OrderItem
+from orders.models import Order, OrderStatus, OrderItem, ORDER_FIELDS, ETAG_FIELDS
 
 
 class TestOrderStatus:
@@ -145,7 +145,7 @@ class TestOrder:
 
         assert order_dict["order_id"] == "order-123"
         assert order_dict["customer_id"] == "customer-456"
-        assert order_dict["total_amount"] == 59.98
+        assert order_dict["total_amount"] == Decimal("59.98")
         assert order_dict["status"] == "PENDING"
         assert len(order_dict["items"]) == 1
         assert isinstance(order_dict["created_at"], str)
@@ -214,3 +214,132 @@ class TestOrder:
                 total_amount=Decimal("59.98"),
                 status=OrderStatus.PENDING
             )
+
+    def test_order_from_request(self):
+        """Test building a new order from a request body."""
+        order = Order.from_request({
+            'customer_id': 'customer-from-body',
+            'total_amount': 29.99,
+            'items': [{'product_id': 'prod-1', 'quantity': 1, 'price': 29.99}]
+        }, customer_id='customer-from-token')
+
+        assert order.order_id
+        assert order.customer_id == 'customer-from-token'
+        assert order.status == OrderStatus.PENDING
+        assert order.total_amount == Decimal("29.99")
+        assert isinstance(order.items[0], OrderItem)
+
+    def test_order_from_request_rejects_bad_input(self):
+        """Test malformed request bodies raise ValueError."""
+        with pytest.raises(ValueError, match="total_amount"):
+            Order.from_request({'customer_id': 'customer-456'})
+        with pytest.raises(ValueError, match="customer_id is required"):
+            Order.from_request({'total_amount': 10})
+        with pytest.raises(ValueError):
+            Order.from_request({'customer_id': 'c', 'total_amount': 'abc'})
+        with pytest.raises(ValueError):
+            Order.from_request({'customer_id': 'c', 'total_amount': 10, 'items': [{'quantity': 1}]})
+
+    @pytest.mark.parametrize('body, message', [
+        ({'customer_id': 123, 'total_amount': 10}, "customer_id must be a string"),
+        ({'customer_id': 'c', 'total_amount': [10]}, "total_amount must be a number"),
+        ({'customer_id': 'c', 'total_amount': 10, 'status': 1}, "status must be a string"),
+        ({'customer_id': 'c', 'total_amount': 10, 'items': 'prod-1'}, "items must be a list"),
+        ({'customer_id': 'c', 'total_amount': 10,
+          'items': [{'product_id': 'p', 'quantity': 'two', 'price': 1}]}, "quantity must be an integer"),
+        ({'customer_id': 'c', 'total_amount': 10,
+          'items': [{'product_id': 'p', 'quantity': True, 'price': 1}]}, "quantity must be an integer"),
+        ({'customer_id': 'c', 'total_amount': 10,
+          'items': [{'product_id': 'p', 'quantity': 1, 'price': 'Infinity'}]}, "price must be a finite number")
+    ])
+    def test_order_from_request_checks_types(self, body, message):
+        """Test JSON types DynamoDB would reject are caught before the write."""
+        with pytest.raises(ValueError, match=message):
+            Order.from_request(body)
+
+    def test_order_item_from_request_accepts_price_strings(self):
+        """Test prices as returned by to_dict() are accepted back."""
+        item = OrderItem.from_request({'product_id': 'p', 'quantity': 2, 'price': '29.99'})
+
+        assert item.price == Decimal('29.99')
+
+    def test_order_timestamps_parsed_lazily(self):
+        """Test from_dict keeps the stored strings until the timestamps are read."""
+        data = {
+            "order_id": "order-123",
+            "customer_id": "customer-456",
+            "total_amount": "59.98",
+            "status": "PENDING",
+            "created_at": "2026-01-29T12:00:00Z"
+        }
+
+        order = Order.from_dict(data)
+
+        assert order.to_dict()["created_at"] == "2026-01-29T12:00:00Z"
+        assert order.created_at.tzinfo is not None
+        assert order.updated_at == order.created_at
+
+    def test_order_decimals_kept_as_is(self):
+        """Test Decimal amounts are not rebuilt through str()."""
+        amount = Decimal("59.98")
+        order = Order.from_dict({
+            "order_id": "order-123",
+            "customer_id": "customer-456",
+            "total_amount": amount,
+            "status": "PENDING"
+        })
+
+        assert order.total_amount is amount
+
+    def test_models_are_slotted(self):
+        """Test orders and items carry no per-instance __dict__."""
+        order = Order("order-123", "customer-456", Decimal("1"), OrderStatus.PENDING,
+                      items=[OrderItem("prod-1", 1, Decimal("1"))])
+
+        assert not hasattr(order, '__dict__')
+        assert not hasattr(order.items[0], '__dict__')
+        with pytest.raises(AttributeError):
+            order.unknown = 1
+
+    def test_order_to_dict_sparse_fields(self):
+        """Test to_dict(fields) only serializes the requested attributes."""
+        order = Order("order-123", "customer-456", Decimal("59.98"), OrderStatus.SHIPPED,
+                      items=[OrderItem("prod-1", 2, Decimal("29.99"))])
+
+        assert order.to_dict(('order_id', 'status')) == {'order_id': 'order-123', 'status': 'SHIPPED'}
+        assert order.to_dict(ORDER_FIELDS) == order.to_dict()
+
+    def test_order_from_partial(self):
+        """Test a projected read becomes an Order with only those attributes."""
+        order = Order.from_partial({
+            "order_id": "order-123",
+            "status": "PENDING",
+            "total_amount": "12.50",
+            "created_at": "2024-01-01T10:00:00"
+        })
+
+        assert order.status == OrderStatus.PENDING
+        assert order.total_amount == Decimal("12.50")
+        assert order.to_dict(('order_id', 'total_amount', 'created_at')) == {
+            'order_id': 'order-123',
+            'total_amount': Decimal("12.50"),
+            'created_at': "2024-01-01T10:00:00"
+        }
+        with pytest.raises(AttributeError):
+            order.items
+
+    def test_order_etag(self):
+        """Test the ETag changes with each write and survives a projected read."""
+        order = Order("order-123", "customer-456", Decimal("59.98"), OrderStatus.PENDING,
+                      updated_at="2024-01-01T10:00:00", version=3)
+        partial = Order.from_partial({name: order.to_dict()[name] for name in ETAG_FIELDS})
+        parsed = Order.from_dict(order.to_dict())
+        parsed.updated_at
+
+        assert order.etag.startswith('"3-') and order.etag.endswith('"')
+        assert partial.etag == order.etag == parsed.etag
+
+        order.updated_at = "2024-01-01T10:00:01"
+        assert order.etag != partial.etag
+        order.version = 4
+        assert order.etag.startswith('"4-')
@@ -4,8 +4,10 @@ Unit tests for OrderRepository.
 Uses moto to mock DynamoDB operations.
 """
 import pytest
+import zlib
 from decimal import Decimal
 from datetime import datetime
+from unittest.mock import patch
 from moto import mock_dynamodb
 import boto3
 import sys
@@ -14,8 +16,11 @@ import os
 # Add src to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
 
-from orders.repository import OrderRepository
-from orders.models import Order, OrderStatus, OrderItem
+from orders.repository import OrderRepository, CodecOrderRepository
+from orders.cache import OrderCache
+from orders.exceptions import OrderNotFoundError, OrderConflictError, RepositoryThrottledError
+from botocore.exceptions import ClientError
+from orders.models import Order, OrderStatus, OrderItem, ETAG_FIELDS
 
 
 @pytest.fixture
@@ -33,13 +38,24 @@ def dynamodb_table():
             ],
             AttributeDefinitions=[
                 {'AttributeName': 'order_id', 'AttributeType': 'S'},
-                {'AttributeName': 'customer_id', 'AttributeType': 'S'}
+                {'AttributeName': 'customer_id', 'AttributeType': 'S'},
+                {'AttributeName': 'gsi_status', 'AttributeType': 'S'},
+                {'AttributeName': 'created_at', 'AttributeType': 'S'}
             ],
             GlobalSecondaryIndexes=[
                 {
                     'IndexName': 'CustomerIndex',
                     'KeySchema': [
-                        {'AttributeName': 'customer_id', 'KeyType': 'HASH'}
+                        {'AttributeName': 'customer_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'}
+                },
+                {
+                    'IndexName': 'StatusIndex',
+                    'KeySchema': [
+                        {'AttributeName': 'gsi_status', 'KeyType': 'HASH'},
+                        {'AttributeName': 'created_at', 'KeyType': 'RANGE'}
                     ],
                     'Projection': {'ProjectionType': 'ALL'}
                 }
@@ -180,6 +196,61 @@ class TestOrderRepository:
 
         assert len(orders) <= 2
 
+    def test_list_orders_page_walks_all_orders(self, repository):
+        """Test next_token walks the whole table without repeats."""
+        for i in range(5):
+            repository.create_order(Order(
+                order_id=f"order-{i}",
+                customer_id="customer-456",
+                total_amount=Decimal("59.98"),
+                status=OrderStatus.PENDING
+            ))
+
+        seen = []
+        next_token = None
+        while True:
+            orders, next_token = repository.list_orders_page(limit=2, next_token=next_token)
+            seen.extend(o.order_id for o in orders)
+            if not next_token:
+                break
+
+        assert sorted(seen) == [f"order-{i}" for i in range(5)]
+
+    def test_list_orders_page_by_customer(self, repository):
+        """Test pagination through the CustomerIndex query."""
+        for i in range(3):
+            repository.create_order(Order(
+                order_id=f"order-{i}",
+                customer_id="customer-aaa",
+                total_amount=Decimal("59.98"),
+                status=OrderStatus.PENDING
+            ))
+
+        first, token = repository.list_orders_page(customer_id="customer-aaa", limit=2)
+        second, last_token = repository.list_orders_page(
+            customer_id="customer-aaa", limit=2, next_token=token
+        )
+
+        assert len(first) == 2
+        assert token is not None
+        assert {o.order_id for o in first + second} == {"order-0", "order-1", "order-2"}
+
+    def test_list_orders_page_rejects_tampered_token(self, repository):
+        """Test forged or cross-query tokens are rejected."""
+        for i in range(3):
+            repository.create_order(Order(
+                order_id=f"order-{i}",
+                customer_id="customer-aaa",
+                total_amount=Decimal("59.98"),
+                status=OrderStatus.PENDING
+            ))
+        _, token = repository.list_orders_page(limit=1)
+
+        with pytest.raises(ValueError):
+            repository.list_orders_page(limit=1, next_token=token[:-2] + "xx")
+        with pytest.raises(ValueError):
+            repository.list_orders_page(customer_id="customer-aaa", limit=1, next_token=token)
+
     def test_get_orders_by_customer(self, repository):
         """Test getting orders by customer ID."""
         # Create orders for different customers
@@ -229,3 +300,677 @@ class TestOrderRepository:
         assert len(retrieved.items) == 2
         assert retrieved.items[0].product_id == "prod-1"
         assert retrieved.items[1].quantity == 1
+
+
+class TestOrderRepositoryBatchWrite:
+    """Test bulk order creation."""
+
+    def test_create_orders_in_chunks(self, repository):
+        """Test more than 25 orders are split across BatchWriteItem calls."""
+        orders = [
+            Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(30)
+        ]
+
+        created, failed = repository.create_orders(orders)
+
+        assert len(created) == 30
+        assert failed == []
+        assert repository.get_order("order-29").total_amount == Decimal("10.00")
+
+    def test_create_orders_retries_unprocessed(self, repository):
+        """Test UnprocessedItems are retried until written."""
+        orders = [
+            Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(3)
+        ]
+        real_batch_write = repository.table.batch_write_item
+        calls = []
+
+        def flaky_batch_write(RequestItems):
+            calls.append(RequestItems)
+            if len(calls) == 1:
+                requests = RequestItems['test-orders-table']
+                real_batch_write(RequestItems={'test-orders-table': requests[:1]})
+                return {'UnprocessedItems': {'test-orders-table': requests[1:]}}
+            return real_batch_write(RequestItems=RequestItems)
+
+        with patch.object(repository.table, 'batch_write_item', side_effect=flaky_batch_write), \
+                patch('orders.repository.time.sleep'):
+            created, failed = repository.create_orders(orders)
+
+        assert len(calls) == 2
+        assert len(calls[1]['test-orders-table']) == 2
+        assert len(created) == 3
+        assert failed == []
+
+    def test_create_orders_reports_failures(self, repository):
+        """Test items still unprocessed after all retries are reported as failed."""
+        orders = [
+            Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(2)
+        ]
+
+        def throttled_batch_write(RequestItems):
+            return {'UnprocessedItems': RequestItems}
+
+        with patch.object(repository.table, 'batch_write_item', side_effect=throttled_batch_write), \
+                patch('orders.repository.time.sleep'):
+            created, failed = repository.create_orders(orders)
+
+        assert created == []
+        assert [o.order_id for o in failed] == ["order-0", "order-1"]
+
+
+    def test_create_orders_isolates_a_rejected_order(self, dynamodb_table):
+        """Test an order DynamoDB rejects fails alone, not with its whole chunk."""
+        repository = CodecOrderRepository(table_name='test-orders-table')
+        orders = [
+            Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(5)
+        ]
+        # Bypasses from_request: the codec encodes it as {'S': 123}, which
+        # botocore refuses with ParamValidationError
+        orders.insert(2, Order("order-bad", 123, Decimal("10.00"), OrderStatus.PENDING))
+
+        created, failed = repository.create_orders(orders)
+
+        assert [o.order_id for o in failed] == ["order-bad"]
+        assert len(created) == 5
+        assert repository.get_order("order-4") is not None
+
+    def test_create_orders_falls_back_on_validation_exception(self, repository):
+        """Test a ValidationException on the batch writes the chunk item by item."""
+        orders = [
+            Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(3)
+        ]
+        orders.insert(1, Order("order-bad", 123, Decimal("10.00"), OrderStatus.PENDING))
+        real_put_item = repository.table.put_item
+        # moto does not check GSI key types, DynamoDB does
+        error = ClientError(
+            {'Error': {'Code': 'ValidationException', 'Message': 'Type mismatch for Index Key'}}, 'PutItem'
+        )
+
+        def put_item(Item, **kwargs):
+            if not isinstance(Item['customer_id'], str):
+                raise error
+            return real_put_item(Item=Item, **kwargs)
+
+        with patch.object(repository.table, 'batch_write_item', side_effect=error), \
+                patch.object(repository.table, 'put_item', side_effect=put_item):
+            created, failed = repository.create_orders(orders)
+
+        assert [o.order_id for o in failed] == ["order-bad"]
+        assert [o.order_id for o in created] == ["order-0", "order-1", "order-2"]
+        assert repository.get_order("order-2") is not None
+
+    def test_create_orders_deduplicates_ids(self, repository):
+        """Test the same order_id twice is written once instead of failing the batch."""
+        orders = [
+            Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING),
+            Order("order-2", "customer-456", Decimal("10.00"), OrderStatus.PENDING),
+            Order("order-1", "customer-456", Decimal("12.00"), OrderStatus.PENDING)
+        ]
+
+        created, failed = repository.create_orders(orders)
+
+        assert failed == []
+        assert len(created) == 3
+        assert repository.get_order("order-1").total_amount == Decimal("12.00")
+
+    def test_create_orders_throttled_chunk_is_not_retried_per_item(self, repository):
+        """Test throttling fails the chunk instead of hammering the table with PutItems."""
+        orders = [Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING) for i in range(3)]
+        error = ClientError({'Error': {'Code': 'ThrottlingException', 'Message': 'slow down'}}, 'BatchWriteItem')
+
+        with patch.object(repository.table, 'batch_write_item', side_effect=error), \
+                patch.object(repository.table, 'put_item') as put_item:
+            created, failed = repository.create_orders(orders)
+
+        assert created == [] and len(failed) == 3
+        assert not put_item.called
+
+
+class TestOrderRepositoryBatchGet:
+    """Test multi-get by order ID."""
+
+    def test_get_orders_in_request_order_with_misses(self, repository):
+        """Test results follow request order, de-duplicated, with explicit misses."""
+        for i in range(3):
+            repository.create_order(
+                Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            )
+
+        results = repository.get_orders(["order-2", "missing", "order-0", "order-2"])
+
+        assert list(results) == ["order-2", "missing", "order-0"]
+        assert results["order-2"].order_id == "order-2"
+        assert results["missing"] is None
+
+    def test_get_orders_more_than_one_batch(self, repository):
+        """Test more than 100 ids are split across BatchGetItem calls."""
+        orders = [
+            Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(110)
+        ]
+        repository.create_orders(orders)
+
+        results = repository.get_orders([o.order_id for o in orders])
+
+        assert len(results) == 110
+        assert all(order is not None for order in results.values())
+
+    def test_get_orders_retries_unprocessed_keys(self, repository):
+        """Test UnprocessedKeys are fetched again."""
+        for i in range(2):
+            repository.create_order(
+                Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            )
+        real_batch_get = repository.table.batch_get_item
+        calls = []
+
+        def flaky_batch_get(RequestItems):
+            calls.append(RequestItems)
+            if len(calls) == 1:
+                keys = RequestItems['test-orders-table']['Keys']
+                response = real_batch_get(RequestItems={'test-orders-table': {'Keys': keys[:1]}})
+                response['UnprocessedKeys'] = {'test-orders-table': {'Keys': keys[1:]}}
+                return response
+            return real_batch_get(RequestItems=RequestItems)
+
+        with patch.object(repository.table, 'batch_get_item', side_effect=flaky_batch_get), \
+                patch('orders.repository.time.sleep'):
+            results = repository.get_orders(["order-0", "order-1"])
+
+        assert len(calls) == 2
+        assert all(order is not None for order in results.values())
+
+
+@pytest.fixture
+def segmented_scan(repository):
+    """moto 4 ignores Segment/TotalSegments, so split scans by key hash like DynamoDB does."""
+    client = repository.table
+    real_scan = client.scan
+
+    def scan(**params):
+        segment = params.pop('Segment', None)
+        total_segments = params.pop('TotalSegments', None)
+        response = real_scan(**params)
+        if total_segments:
+            response['Items'] = [
+                item for item in response['Items']
+                if zlib.crc32(item['order_id'].encode()) % total_segments == segment
+            ]
+        return response
+
+    with patch.object(client, 'scan', side_effect=scan):
+        yield
+
+
+class TestOrderRepositoryParallelScan:
+    """Test the parallel segmented scan."""
+
+    def test_scan_orders_returns_every_order_once(self, repository, segmented_scan):
+        """Test all segments together cover the table exactly once."""
+        orders = [
+            Order(f"order-{i}", f"customer-{i % 7}", Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(60)
+        ]
+        repository.create_orders(orders)
+
+        scanned = list(repository.scan_orders(total_segments=4, max_workers=2, page_size=7))
+
+        assert sorted(o.order_id for o in scanned) == sorted(o.order_id for o in orders)
+        assert all(isinstance(o, Order) for o in scanned)
+
+    def test_scan_orders_stops_early(self, repository, segmented_scan):
+        """Test closing the generator early shuts the workers down."""
+        repository.create_orders([
+            Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(40)
+        ])
+
+        scan = repository.scan_orders(total_segments=4, page_size=2)
+        first = [next(scan) for _ in range(3)]
+        scan.close()
+
+        assert len(first) == 3
+
+    def test_scan_orders_propagates_errors(self, repository):
+        """Test a failing segment raises in the consumer."""
+        with patch.object(repository.table, 'scan', side_effect=RuntimeError("boom")):
+            with pytest.raises(RuntimeError, match="boom"):
+                list(repository.scan_orders(total_segments=2))
+
+
+class TestOrderRepositoryCache:
+    """Test the read-through cache in front of get_order."""
+
+    @pytest.fixture
+    def cached_repository(self, dynamodb_table):
+        return OrderRepository(table_name='test-orders-table', cache=OrderCache(max_entries=10, ttl_seconds=60))
+
+    def test_repeat_reads_hit_the_cache(self, cached_repository):
+        """Test the second read does not reach DynamoDB."""
+        cached_repository.create_order(
+            Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+        )
+        cached_repository.get_order("order-1")
+
+        with patch.object(cached_repository.table, 'get_item') as get_item:
+            order = cached_repository.get_order("order-1")
+
+        assert not get_item.called
+        assert order.total_amount == Decimal("10.00")
+        assert cached_repository.cache.hits == 1
+
+    def test_cached_orders_are_independent_copies(self, cached_repository):
+        """Test mutating a returned order does not leak into the cache."""
+        cached_repository.create_order(
+            Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+        )
+        cached_repository.get_order("order-1").status = OrderStatus.CANCELLED
+
+        assert cached_repository.get_order("order-1").status == OrderStatus.PENDING
+
+    def test_writes_invalidate(self, cached_repository):
+        """Test update and delete drop the cached entry."""
+        order = Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+        cached_repository.create_order(order)
+        cached_repository.get_order("order-1")
+
+        cached_repository.update_order_fields("order-1", {'status': 'SHIPPED'})
+        assert cached_repository.get_order("order-1").status == OrderStatus.SHIPPED
+
+        cached_repository.delete_order("order-1")
+        assert cached_repository.get_order("order-1") is None
+
+
+class TestOrderRepositoryConditionalUpdate:
+    """Test single round-trip versioned updates."""
+
+    def test_update_bumps_version(self, repository):
+        """Test each update increments the version."""
+        repository.create_order(
+            Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+        )
+
+        first = repository.update_order_fields("order-1", {'status': OrderStatus.CONFIRMED})
+        second = repository.update_order_fields(
+            "order-1", {'total_amount': Decimal("12.50")}, expected_version=2
+        )
+
+        assert first.version == 2
+        assert second.version == 3
+        assert second.status == OrderStatus.CONFIRMED
+        assert second.total_amount == Decimal("12.50")
+
+    def test_update_items(self, repository):
+        """Test items are stored as OrderItems."""
+        repository.create_order(
+            Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+        )
+
+        updated = repository.update_order_fields(
+            "order-1", {'items': [OrderItem("prod-1", 2, Decimal("5.00"))]}
+        )
+
+        assert updated.items[0].price == Decimal("5.00")
+
+    def test_update_stale_version_conflicts(self, repository):
+        """Test a stale expected version raises OrderConflictError."""
+        repository.create_order(
+            Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+        )
+        repository.update_order_fields("order-1", {'status': OrderStatus.CONFIRMED})
+
+        with pytest.raises(OrderConflictError) as exc_info:
+            repository.update_order_fields("order-1", {'status': OrderStatus.SHIPPED}, expected_version=1)
+
+        assert exc_info.value.current_version == 2
+        assert repository.get_order("order-1").status == OrderStatus.CONFIRMED
+
+    def test_update_missing_order(self, repository):
+        """Test updating a missing order raises OrderNotFoundError without creating it."""
+        with pytest.raises(OrderNotFoundError):
+            repository.update_order_fields("missing", {'status': OrderStatus.SHIPPED})
+
+        assert repository.get_order("missing") is None
+
+
+class TestOrderRepositoryDelete:
+    """Test single-call conditional deletes."""
+
+    def test_delete_returns_deleted_order(self, repository):
+        """Test ReturnValues=ALL_OLD gives back the deleted order."""
+        repository.create_order(
+            Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+        )
+
+        deleted = repository.delete_order("order-1", return_order=True)
+
+        assert deleted.order_id == "order-1"
+        assert deleted.total_amount == Decimal("10.00")
+        assert repository.get_order("order-1") is None
+
+    def test_delete_missing_order(self, repository):
+        """Test deleting a missing order raises OrderNotFoundError."""
+        with pytest.raises(OrderNotFoundError):
+            repository.delete_order("missing")
+
+    def test_delete_throttled(self, repository):
+        """Test throttling is reported instead of swallowed."""
+        error = ClientError(
+            {'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'slow down'}},
+            'DeleteItem'
+        )
+        with patch.object(repository.table, 'delete_item', side_effect=error):
+            with pytest.raises(RepositoryThrottledError):
+                repository.delete_order("order-1")
+
+    def test_delete_other_errors_propagate(self, repository):
+        """Test unexpected errors are raised, not turned into False."""
+        error = ClientError({'Error': {'Code': 'InternalServerError', 'Message': 'oops'}}, 'DeleteItem')
+        with patch.object(repository.table, 'delete_item', side_effect=error):
+            with pytest.raises(ClientError):
+                repository.delete_order("order-1")
+
+
+class TestOrderRepositoryStatusIndex:
+    """Test listing by status through the sparse StatusIndex."""
+
+    @staticmethod
+    def _create(repository, order_id, status, created_at):
+        repository.create_order(Order(
+            order_id, "customer-456", Decimal("10.00"), status, created_at=created_at
+        ))
+
+    def test_only_open_statuses_are_indexed(self, repository, dynamodb_table):
+        """Test terminal orders carry no StatusIndex key."""
+        self._create(repository, "order-1", OrderStatus.PENDING, "2024-01-01T10:00:00")
+        self._create(repository, "order-2", OrderStatus.DELIVERED, "2024-01-02T10:00:00")
+
+        assert dynamodb_table.get_item(Key={'order_id': 'order-1'})['Item']['gsi_status'] == 'PENDING'
+        assert 'gsi_status' not in dynamodb_table.get_item(Key={'order_id': 'order-2'})['Item']
+
+    def test_list_by_status_pages_newest_first(self, repository):
+        """Test status pages come from the index, newest first."""
+        for i in range(1, 6):
+            self._create(repository, f"order-{i}", OrderStatus.PENDING, f"2024-01-0{i}T10:00:00")
+        self._create(repository, "order-other", OrderStatus.SHIPPED, "2024-01-09T10:00:00")
+
+        with patch.object(repository.table, 'scan', side_effect=AssertionError("scanned")):
+            first, token = repository.list_orders_page(status="PENDING", limit=3)
+            second, _ = repository.list_orders_page(status="PENDING", limit=3, next_token=token)
+
+        assert [o.order_id for o in first + second] == [f"order-{i}" for i in range(5, 0, -1)]
+
+    def test_status_update_moves_order_in_index(self, repository, dynamodb_table):
+        """Test update_order_fields keeps gsi_status in step with status."""
+        self._create(repository, "order-1", OrderStatus.PENDING, "2024-01-01T10:00:00")
+
+        repository.update_order_fields("order-1", {'status': 'SHIPPED'})
+        assert [o.order_id for o in repository.list_orders(limit=10)] == ["order-1"]
+        assert repository.list_orders_page(status="PENDING")[0] == []
+        assert [o.order_id for o in repository.list_orders_page(status="SHIPPED")[0]] == ["order-1"]
+
+        repository.update_order_fields("order-1", {'status': 'DELIVERED'})
+        assert 'gsi_status' not in dynamodb_table.get_item(Key={'order_id': 'order-1'})['Item']
+
+    def test_terminal_status_falls_back_to_filtered_scan(self, repository):
+        """Test statuses left out of the index are still listed."""
+        self._create(repository, "order-1", OrderStatus.CANCELLED, "2024-01-01T10:00:00")
+        self._create(repository, "order-2", OrderStatus.PENDING, "2024-01-02T10:00:00")
+
+        orders, _ = repository.list_orders_page(status="CANCELLED")
+
+        assert [o.order_id for o in orders] == ["order-1"]
+
+    def test_status_token_is_bound_to_status(self, repository):
+        """Test a PENDING token cannot be replayed on another status."""
+        for i in range(3):
+            self._create(repository, f"order-{i}", OrderStatus.PENDING, f"2024-01-0{i + 1}T10:00:00")
+        _, token = repository.list_orders_page(status="PENDING", limit=1)
+
+        with pytest.raises(ValueError):
+            repository.list_orders_page(status="SHIPPED", limit=1, next_token=token)
+
+    @pytest.mark.parametrize('repository_class', [OrderRepository, CodecOrderRepository])
+    def test_backfill_indexes_orders_written_before_the_index(self, dynamodb_table, repository_class):
+        """Test the backfill sets, fixes and removes gsi_status and is idempotent."""
+        repository = repository_class(table_name='test-orders-table')
+        legacy = {'customer_id': 'customer-456', 'total_amount': Decimal('10.00'), 'items': [], 'version': 1}
+        dynamodb_table.put_item(Item=dict(legacy, order_id='old-pending', status='PENDING',
+                                          created_at='2023-01-01T10:00:00'))
+        dynamodb_table.put_item(Item=dict(legacy, order_id='old-delivered', status='DELIVERED',
+                                          gsi_status='SHIPPED', created_at='2023-01-02T10:00:00'))
+        self._create(repository, "new-pending", OrderStatus.PENDING, "2024-01-01T10:00:00")
+        assert [o.order_id for o in repository.list_orders_page(status="PENDING")[0]] == ["new-pending"]
+
+        counts = repository.backfill_status_index(total_segments=1)
+
+        assert counts == {'scanned': 3, 'updated': 2, 'skipped': 0}
+        assert [o.order_id for o in repository.list_orders_page(status="PENDING")[0]] == \
+            ["new-pending", "old-pending"]
+        assert 'gsi_status' not in dynamodb_table.get_item(Key={'order_id': 'old-delivered'})['Item']
+        assert repository.backfill_status_index(total_segments=1)['updated'] == 0
+
+    def test_backfill_skips_orders_changed_meanwhile(self, repository, dynamodb_table):
+        """Test an order whose status changed after the scan keeps the key its own write set."""
+        dynamodb_table.put_item(Item={
+            'order_id': 'old-1', 'customer_id': 'customer-456', 'status': 'PENDING',
+            'total_amount': Decimal('10.00'), 'created_at': '2023-01-01T10:00:00', 'items': []
+        })
+        real_scan = repository.table.scan
+
+        def scan_then_ship(**params):
+            response = real_scan(**params)
+            repository.update_order_fields('old-1', {'status': 'SHIPPED'})
+            return response
+
+        with patch.object(repository.table, 'scan', side_effect=scan_then_ship):
+            counts = repository.backfill_status_index(total_segments=1)
+
+        assert counts == {'scanned': 1, 'updated': 0, 'skipped': 1}
+        assert dynamodb_table.get_item(Key={'order_id': 'old-1'})['Item']['gsi_status'] == 'SHIPPED'
+
+
+class TestOrderRepositoryDateRange:
+    """Test created_at ranges become sort key conditions."""
+
+    @pytest.fixture
+    def week(self, repository):
+        for day in range(1, 8):
+            repository.create_order(Order(
+                f"order-{day}", "customer-456", Decimal("10.00"), OrderStatus.PENDING,
+                created_at=f"2024-01-0{day}T10:00:00"
+            ))
+        return repository
+
+    def test_range_is_a_key_condition(self, week):
+        """Test only orders in the range are read, not filtered afterwards."""
+        with patch.object(week.table, 'query', wraps=week.table.query) as query:
+            orders, _ = week.list_orders_page(
+                customer_id="customer-456",
+                created_from="2024-01-03T00:00:00",
+                created_to="2024-01-05T23:59:59"
+            )
+
+        assert [o.order_id for o in orders] == ["order-5", "order-4", "order-3"]
+        assert 'FilterExpression' not in query.call_args.kwargs
+
+    def test_ascending_pages(self, week):
+        """Test ascending order pages through the range oldest first."""
+        first, token = week.list_orders_page(
+            customer_id="customer-456", created_from="2024-01-02T00:00:00", limit=3, ascending=True
+        )
+        second, _ = week.list_orders_page(
+            customer_id="customer-456", created_from="2024-01-02T00:00:00", limit=3, ascending=True,
+            next_token=token
+        )
+
+        assert [o.order_id for o in first + second] == [f"order-{day}" for day in range(2, 8)]
+
+    def test_range_token_is_bound_to_range(self, week):
+        """Test a token cannot be replayed with another range or order."""
+        _, token = week.list_orders_page(customer_id="customer-456", created_to="2024-01-05T00:00:00", limit=1)
+
+        with pytest.raises(ValueError):
+            week.list_orders_page(customer_id="customer-456", limit=1, next_token=token)
+
+    def test_status_index_range(self, week):
+        """Test ranges also apply to the StatusIndex sort key."""
+        orders, _ = week.list_orders_page(status="PENDING", created_from="2024-01-06T00:00:00")
+
+        assert [o.order_id for o in orders] == ["order-7", "order-6"]
+
+    def test_get_orders_by_customer_range(self, week):
+        """Test get_orders_by_customer takes the same bounds."""
+        orders = week.get_orders_by_customer("customer-456", created_to="2024-01-02T23:59:59")
+
+        assert sorted(o.order_id for o in orders) == ["order-1", "order-2"]
+
+
+class TestOrderRepositoryProjection:
+    """Test sparse fieldsets become a ProjectionExpression."""
+
+    @pytest.fixture(params=['boto3', 'native'])
+    def any_repository(self, request, dynamodb_table):
+        repository_class = OrderRepository if request.param == 'boto3' else CodecOrderRepository
+        repository = repository_class(table_name='test-orders-table')
+        repository.create_order(Order(
+            "order-1", "customer-456", Decimal("59.98"), OrderStatus.PENDING,
+            items=[OrderItem("prod-1", 2, Decimal("29.99"))], created_at="2024-01-01T10:00:00"
+        ))
+        return repository
+
+    def test_get_order_reads_only_fields(self, any_repository):
+        """Test GetItem only returns the projected attributes."""
+        with patch.object(any_repository.client, 'get_item', wraps=any_repository.client.get_item) as get_item:
+            order = any_repository.get_order("order-1", fields=("order_id", "status"))
+
+        assert set(get_item.call_args.kwargs['ExpressionAttributeNames'].values()) == {"order_id", "status"}
+        assert order.to_dict(("order_id", "status")) == {"order_id": "order-1", "status": "PENDING"}
+        with pytest.raises(AttributeError):
+            order.items
+
+    def test_etag_from_projected_read(self, any_repository):
+        """Test the version-only read yields the same ETag as the full order."""
+        assert any_repository.get_order("order-1", fields=ETAG_FIELDS).etag == \
+            any_repository.get_order("order-1").etag
+
+    def test_etag_of_item_without_version(self, any_repository, dynamodb_table):
+        """Test items written before versioning get one ETag from full and projected reads."""
+        dynamodb_table.put_item(Item={
+            'order_id': 'legacy-1', 'customer_id': 'customer-456', 'status': 'PENDING',
+            'total_amount': Decimal('10.00'), 'created_at': '2023-01-01T10:00:00',
+            'updated_at': '2023-01-02T10:00:00', 'items': []
+        })
+
+        full = any_repository.get_order("legacy-1")
+
+        assert full.version == 0
+        assert any_repository.get_order("legacy-1", fields=ETAG_FIELDS).etag == full.etag
+        assert full.etag.startswith('"0-')
+
+    def test_list_page_reads_only_fields(self, any_repository):
+        """Test index queries are projected too and still paginate."""
+        any_repository.create_order(Order(
+            "order-2", "customer-456", Decimal("10.00"), OrderStatus.SHIPPED, created_at="2024-01-02T10:00:00"
+        ))
+
+        first, token = any_repository.list_orders_page(
+            customer_id="customer-456", limit=1, fields=("status", "total_amount")
+        )
+        second, _ = any_repository.list_orders_page(
+            customer_id="customer-456", limit=1, fields=("status", "total_amount"), next_token=token
+        )
+
+        assert [o.to_dict(("order_id", "status", "total_amount")) for o in first + second] == [
+            {"order_id": "order-2", "status": "SHIPPED", "total_amount": Decimal("10.00")},
+            {"order_id": "order-1", "status": "PENDING", "total_amount": Decimal("59.98")}
+        ]
+
+    def test_fields_outside_index_projection_are_rejected(self, any_repository):
+        """Test a GSI read cannot ask for attributes the index does not project."""
+        with patch.dict('orders.repository.INDEX_PROJECTIONS',
+                        {'CustomerIndex': frozenset({'order_id', 'customer_id', 'created_at'})}):
+            with pytest.raises(ValueError):
+                any_repository.list_orders_page(customer_id="customer-456", fields=("items",))
+
+    def test_scan_pages_yield_plain_values(self, any_repository):
+        """Test export scans return projected dicts with Decimal amounts, not Orders."""
+        with patch.object(any_repository.client, 'scan', wraps=any_repository.client.scan) as scan:
+            pages = list(any_repository.scan_pages(("customer_id", "total_amount"), total_segments=1))
+
+        assert set(scan.call_args.kwargs['ExpressionAttributeNames'].values()) == \
+            {"order_id", "customer_id", "total_amount"}
+        assert pages == [[{"order_id": "order-1", "customer_id": "customer-456", "total_amount": Decimal("59.98")}]]
+
+
+class TestCodecOrderRepository:
+    """Test the repository using the direct AttributeValue codec."""
+
+    @pytest.fixture
+    def codec_repository(self, dynamodb_table):
+        return CodecOrderRepository(table_name='test-orders-table')
+
+    def test_create_and_get_order(self, codec_repository):
+        """Test an order round trips without losing precision."""
+        order = Order(
+            "order-1", "customer-456", Decimal("12345678901234.10"), OrderStatus.PENDING,
+            items=[OrderItem("prod-1", 2, Decimal("0.10"))]
+        )
+        codec_repository.create_order(order)
+
+        result = codec_repository.get_order("order-1")
+
+        assert result.total_amount == Decimal("12345678901234.10")
+        assert result.items[0].price == Decimal("0.10")
+        assert result.version == 1
+
+    def test_reads_items_written_by_boto3_repository(self, repository, codec_repository):
+        """Test both implementations share the same item format."""
+        repository.create_order(
+            Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING,
+                  items=[OrderItem("prod-1", 1, Decimal("10.00"))])
+        )
+        codec_repository.create_order(
+            Order("order-2", "customer-456", Decimal("20.00"), OrderStatus.PENDING)
+        )
+
+        assert codec_repository.get_order("order-1").items[0].price == Decimal("10.00")
+        assert repository.get_order("order-2").total_amount == Decimal("20.00")
+
+    def test_batch_list_update_and_delete(self, codec_repository):
+        """Test the rest of the interface works on raw items."""
+        orders = [
+            Order(f"order-{i}", "customer-456", Decimal("10.00"), OrderStatus.PENDING)
+            for i in range(30)
+        ]
+        created, failed = codec_repository.create_orders(orders)
+        assert len(created) == 30 and failed == []
+
+        found = codec_repository.get_orders(["order-0", "order-29", "missing"])
+        assert found["order-29"].order_id == "order-29"
+        assert found["missing"] is None
+
+        page, token = codec_repository.list_orders_page(customer_id="customer-456", limit=10)
+        assert len(page) == 10 and token is not None
+
+        updated = codec_repository.update_order_fields("order-0", {'status': OrderStatus.CONFIRMED})
+        assert updated.version == 2
+        with pytest.raises(OrderConflictError):
+            codec_repository.update_order_fields("order-0", {'status': OrderStatus.SHIPPED}, expected_version=1)
+
+        deleted = codec_repository.delete_order("order-0", return_order=True)
+        assert deleted.status == OrderStatus.CONFIRMED
+
+    def test_list_by_status(self, codec_repository):
+        """Test the codec writes the StatusIndex key too."""
+        codec_repository.create_order(Order("order-1", "customer-456", Decimal("10.00"), OrderStatus.PENDING))
+        codec_repository.create_order(Order("order-2", "customer-456", Decimal("10.00"), OrderStatus.CANCELLED))
+
+        assert [o.order_id for o in codec_repository.list_orders_page(status="PENDING")[0]] == ["order-1"]
+        assert [o.order_id for o in codec_repository.list_orders_page(status="CANCELLED")[0]] == ["order-2"]
@@ -0,0 +1,82 @@
+"""
+Unit tests for the route table.
+"""
+import pytest
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.router import Router
+
+
+def handler(event, params):
+    return params
+
+
+@pytest.fixture
+def router():
+    router = Router()
+    router.add('/v1/orders', {'GET': handler, 'post': handler})
+    router.add('/v1/orders:batch', {'POST': handler})
+    router.add('/v1/orders/{id}', {'GET': handler, 'PUT': handler, 'DELETE': handler})
+    router.add('/v1/customers/{customer_id}/orders/{id}', {'GET': handler})
+    return router
+
+
+class TestRouter:
+    """Test template matching and method dispatch."""
+
+    def test_static_route(self, router):
+        """Test literal templates match and methods are normalised."""
+        route, params = router.resolve('/v1/orders')
+
+        assert route.template == '/v1/orders'
+        assert set(route.handlers) == {'GET', 'POST'}
+        assert params == {}
+
+    def test_literal_beats_parameter(self, router):
+        """Test /v1/orders:batch is not taken for an order id."""
+        route, params = router.resolve('/v1/orders:batch')
+
+        assert route.template == '/v1/orders:batch'
+
+    def test_path_parameters(self, router):
+        """Test parameters are captured by name."""
+        route, params = router.resolve('/v1/customers/c-1/orders/o-1')
+
+        assert route.template == '/v1/customers/{customer_id}/orders/{id}'
+        assert params == {'customer_id': 'c-1', 'id': 'o-1'}
+
+    def test_resource_lookup(self, router):
+        """Test API Gateway's resource template resolves directly."""
+        route, params = router.resolve('/v1/orders/o-1', resource='/v1/orders/{id}')
+
+        assert route.template == '/v1/orders/{id}'
+        assert params == {}
+
+    def test_trailing_slash_is_an_empty_parameter(self, router):
+        """Test /v1/orders/ is not the list route but an order with no id."""
+        route, params = router.resolve('/v1/orders/')
+
+        assert route.template == '/v1/orders/{id}'
+        assert params == {'id': ''}
+
+    @pytest.mark.parametrize('path', [
+        '/', '/v2/orders', '/v1/orders/o-1/items', '/v1//orders', '/v1/customers/c-1/orders/o-1/'
+    ])
+    def test_unknown_paths(self, router, path):
+        """Test unknown paths do not resolve."""
+        assert router.resolve(path) is None
+
+    def test_allow_header(self, router):
+        """Test the Allow value lists the route's methods."""
+        route, _ = router.resolve('/v1/orders/o-1')
+
+        assert route.allow == 'DELETE, GET, PUT'
+
+    def test_duplicate_template_rejected(self, router):
+        """Test a template cannot be registered twice."""
+        with pytest.raises(ValueError):
+            router.add('/v1/orders', {'GET': handler})
@@ -0,0 +1,241 @@
+"""
+Unit tests for the local order stores.
+
+InMemoryOrderRepository and SqliteOrderRepository run the same contract
+tests as they stand in for OrderRepository.
+"""
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+import subprocess
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.memory_store import InMemoryOrderRepository
+from orders.sqlite_store import SqliteOrderRepository
+from orders.store import OrderStore
+from orders.exceptions import OrderNotFoundError, OrderConflictError
+from orders.models import Order, OrderStatus, OrderItem
+from orders import handler
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store(request):
+    if request.param == 'memory':
+        return InMemoryOrderRepository()
+    return SqliteOrderRepository(':memory:')
+
+
+def make_order(order_id, customer_id='customer-1', created_at='2024-01-01T10:00:00'):
+    return Order(
+        order_id=order_id,
+        customer_id=customer_id,
+        total_amount=Decimal('59.98'),
+        status=OrderStatus.PENDING,
+        items=[OrderItem('product-1', 2, Decimal('29.99'))],
+        created_at=created_at
+    )
+
+
+class TestOrderStoreContract:
+    """Behaviour every store shares with the DynamoDB repository"""
+
+    def test_is_an_order_store(self, store):
+        assert isinstance(store, OrderStore)
+
+    def test_create_and_get_round_trip(self, store):
+        store.create_order(make_order('order-1'))
+
+        order = store.get_order('order-1')
+
+        assert order.customer_id == 'customer-1'
+        assert order.total_amount == Decimal('59.98')
+        assert order.items[0].price == Decimal('29.99')
+        assert order.version == 1
+
+    def test_get_missing_order_returns_none(self, store):
+        assert store.get_order('missing') is None
+
+    def test_reads_do_not_share_state(self, store):
+        store.create_order(make_order('order-1'))
+
+        store.get_order('order-1').status = OrderStatus.CANCELLED
+
+        assert store.get_order('order-1').status == OrderStatus.PENDING
+
+    def test_get_orders_keeps_request_order(self, store):
+        store.create_orders([make_order('order-1'), make_order('order-2')])
+
+        results = store.get_orders(['order-2', 'missing', 'order-1', 'order-2'])
+
+        assert list(results) == ['order-2', 'missing', 'order-1']
+        assert results['missing'] is None
+        assert results['order-1'].order_id == 'order-1'
+
+    def test_update_fields_bumps_version(self, store):
+        store.create_order(make_order('order-1'))
+
+        updated = store.update_order_fields('order-1', {'status': 'CONFIRMED'}, expected_version=1)
+
+        assert updated.status == OrderStatus.CONFIRMED
+        assert updated.version == 2
+        assert store.get_order('order-1').version == 2
+
+    def test_update_fields_version_conflict(self, store):
+        store.create_order(make_order('order-1'))
+
+        with pytest.raises(OrderConflictError) as exc_info:
+            store.update_order_fields('order-1', {'status': 'CONFIRMED'}, expected_version=5)
+
+        assert exc_info.value.current_version == 1
+        assert store.get_order('order-1').status == OrderStatus.PENDING
+
+    def test_update_fields_missing_order(self, store):
+        with pytest.raises(OrderNotFoundError):
+            store.update_order_fields('missing', {'status': 'CONFIRMED'})
+
+    def test_delete_returns_deleted_order(self, store):
+        store.create_order(make_order('order-1'))
+
+        deleted = store.delete_order('order-1', return_order=True)
+
+        assert deleted.order_id == 'order-1'
+        assert store.get_order('order-1') is None
+        with pytest.raises(OrderNotFoundError):
+            store.delete_order('order-1')
+
+    def test_customer_pages_newest_first(self, store):
+        store.create_orders([
+            make_order(f'order-{i}', created_at=f'2024-01-0{i}T10:00:00') for i in range(1, 6)
+        ])
+        store.create_order(make_order('other', customer_id='customer-2'))
+
+        first, token = store.list_orders_page(customer_id='customer-1', limit=2)
+        second, token = store.list_orders_page(customer_id='customer-1', limit=2, next_token=token)
+        third, last_token = store.list_orders_page(customer_id='customer-1', limit=2, next_token=token)
+
+        ids = [order.order_id for order in first + second + third]
+        assert ids == ['order-5', 'order-4', 'order-3', 'order-2', 'order-1']
+        assert last_token is None
+
+    def test_scan_pages_cover_every_order(self, store):
+        store.create_orders([make_order(f'order-{i}', customer_id=f'customer-{i % 3}') for i in range(7)])
+
+        ids, token = [], None
+        while True:
+            page, token = store.list_orders_page(limit=3, next_token=token)
+            ids.extend(order.order_id for order in page)
+            if not token:
+                break
+
+        assert sorted(ids) == [f'order-{i}' for i in range(7)]
+
+    def test_status_pages_newest_first(self, store):
+        store.create_orders([
+            make_order(f'order-{i}', customer_id=f'customer-{i % 2}', created_at=f'2024-01-0{i}T10:00:00')
+            for i in range(1, 6)
+        ])
+        store.update_order_fields('order-3', {'status': 'SHIPPED'})
+
+        first, token = store.list_orders_page(status='PENDING', limit=2)
+        second, last_token = store.list_orders_page(status='PENDING', limit=2, next_token=token)
+
+        assert [o.order_id for o in first + second] == ['order-5', 'order-4', 'order-2', 'order-1']
+        assert last_token is None
+        assert [o.order_id for o in store.list_orders_page(status='SHIPPED')[0]] == ['order-3']
+        customer_pending, _ = store.list_orders_page(customer_id='customer-1', status='PENDING')
+        assert [o.order_id for o in customer_pending] == ['order-5', 'order-1']
+
+    def test_date_range_in_both_directions(self, store):
+        store.create_orders([
+            make_order(f'order-{i}', created_at=f'2024-01-0{i}T10:00:00') for i in range(1, 8)
+        ])
+        bounds = {'created_from': '2024-01-02T00:00:00', 'created_to': '2024-01-06T00:00:00'}
+
+        newest, _ = store.list_orders_page(customer_id='customer-1', **bounds)
+        first, token = store.list_orders_page(customer_id='customer-1', limit=2, ascending=True, **bounds)
+        rest, last_token = store.list_orders_page(
+            customer_id='customer-1', limit=5, ascending=True, next_token=token, **bounds
+        )
+
+        assert [o.order_id for o in newest] == ['order-5', 'order-4', 'order-3', 'order-2']
+        assert [o.order_id for o in first + rest] == ['order-2', 'order-3', 'order-4', 'order-5']
+        assert last_token is None
+        assert [o.order_id for o in store.get_orders_by_customer('customer-1', **bounds)] == \
+            ['order-5', 'order-4', 'order-3', 'order-2']
+
+    def test_token_is_bound_to_customer(self, store):
+        store.create_orders([make_order(f'order-{i}') for i in range(3)])
+        _, token = store.list_orders_page(customer_id='customer-1', limit=1)
+
+        with pytest.raises(ValueError):
+            store.list_orders_page(customer_id='customer-2', limit=1, next_token=token)
+
+    def test_overwrite_moves_customer_index_entry(self, store):
+        store.create_order(make_order('order-1'))
+        moved = make_order('order-1', customer_id='customer-2')
+        store.update_order(moved)
+
+        assert store.list_orders(customer_id='customer-1') == []
+        assert [o.order_id for o in store.get_orders_by_customer('customer-2')] == ['order-1']
+
+    def test_scan_orders_yields_everything(self, store):
+        store.create_orders([make_order(f'order-{i}') for i in range(4)])
+
+        assert sorted(order.order_id for order in store.scan_orders()) == [f'order-{i}' for i in range(4)]
+
+
+class TestSqliteOrderRepository:
+    """SQLite specifics"""
+
+    def test_persists_to_file(self, tmp_path):
+        path = str(tmp_path / 'orders.db')
+        SqliteOrderRepository(path).create_order(make_order('order-1'))
+
+        assert SqliteOrderRepository(path).get_order('order-1').total_amount == Decimal('59.98')
+
+    def test_customer_query_uses_index(self):
+        store = SqliteOrderRepository(':memory:')
+
+        plan = store._query(
+            "EXPLAIN QUERY PLAN SELECT data FROM orders WHERE customer_id = ? "
+            "ORDER BY created_at DESC, order_id DESC LIMIT 10",
+            ('customer-1',)
+        )
+
+        assert 'orders_customer_created' in ' '.join(str(row) for row in plan)
+
+
+class TestStoreSelection:
+    """ORDER_STORE picks the backend behind get_repository"""
+
+    @pytest.mark.parametrize('name, expected', [
+        ('memory', InMemoryOrderRepository),
+        ('sqlite', SqliteOrderRepository)
+    ])
+    def test_get_repository_uses_order_store(self, name, expected):
+        with patch.object(handler, 'ORDER_STORE', name), patch.object(handler, '_repository', None):
+            assert isinstance(handler.get_repository(), expected)
+
+    def test_unknown_store_is_rejected(self):
+        with patch.object(handler, 'ORDER_STORE', 'cassandra'), patch.object(handler, '_repository', None):
+            with pytest.raises(ValueError):
+                handler.get_repository()
+
+    def test_local_stores_are_not_imported_on_cold_start(self):
+        # A fresh interpreter, the test session has already imported them
+        code = (
+            "import sys; import orders.handler; "
+            "print(sorted(m for m in ('orders.memory_store', 'orders.sqlite_store', "
+            "'orders.idempotency', 'orders.aggregates') if m in sys.modules))"
+        )
+        src = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src'))
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+            env={**os.environ, 'PYTHONPATH': src}
+        )
+
+        assert result.stdout.strip() == '[]'
@@ -0,0 +1,99 @@
+"""
+Unit tests for the DynamoTable client wrapper.
+
+Uses moto to check Python values survive the AttributeValue round trip.
+"""
+import pytest
+from decimal import Decimal
+from moto import mock_dynamodb
+from boto3.dynamodb.conditions import Key, Attr
+import boto3
+import sys
+import os
+
+# Add src to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
+
+from orders.table import DynamoTable, create_client
+
+
+@pytest.fixture
+def table():
+    """Create a mock table and wrap it."""
+    with mock_dynamodb():
+        boto3.client('dynamodb', region_name='eu-west-1').create_table(
+            TableName='test-orders-table',
+            KeySchema=[{'AttributeName': 'order_id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[
+                {'AttributeName': 'order_id', 'AttributeType': 'S'},
+                {'AttributeName': 'customer_id', 'AttributeType': 'S'}
+            ],
+            GlobalSecondaryIndexes=[
+                {
+                    'IndexName': 'CustomerIndex',
+                    'KeySchema': [{'AttributeName': 'customer_id', 'KeyType': 'HASH'}],
+                    'Projection': {'ProjectionType': 'ALL'}
+                }
+            ],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        yield DynamoTable(create_client(region_name='eu-west-1'), 'test-orders-table')
+
+
+class TestDynamoTable:
+    """Test the Python <-> AttributeValue translation."""
+
+    def test_put_and_get_item(self, table):
+        """Test nested values and Decimals round trip."""
+        item = {
+            'order_id': 'order-1',
+            'customer_id': 'customer-1',
+            'total_amount': Decimal('19.99'),
+            'items': [{'product_id': 'prod-1', 'quantity': 2}]
+        }
+        table.put_item(Item=item)
+
+        assert table.get_item(Key={'order_id': 'order-1'})['Item'] == item
+        assert 'Item' not in table.get_item(Key={'order_id': 'missing'})
+
+    def test_query_with_condition_objects(self, table):
+        """Test Key/Attr conditions are built into expressions."""
+        for i in range(3):
+            table.put_item(Item={'order_id': f'order-{i}', 'customer_id': 'customer-1', 'n': i})
+
+        response = table.query(
+            IndexName='CustomerIndex',
+            KeyConditionExpression=Key('customer_id').eq('customer-1'),
+            FilterExpression=Attr('n').gte(1)
+        )
+
+        assert sorted(item['order_id'] for item in response['Items']) == ['order-1', 'order-2']
+
+    def test_update_merges_expression_values(self, table):
+        """Test explicit expression values and built conditions can be combined."""
+        table.put_item(Item={'order_id': 'order-1', 'customer_id': 'customer-1', 'n': 1})
+
+        response = table.update_item(
+            Key={'order_id': 'order-1'},
+            UpdateExpression='SET #n = :n',
+            ConditionExpression=Attr('n').eq(1),
+            ExpressionAttributeNames={'#n': 'n'},
+            ExpressionAttributeValues={':n': 2},
+            ReturnValues='ALL_NEW'
+        )
+
+        assert response['Attributes']['n'] == Decimal(2)
+
+    def test_batch_write_and_get(self, table):
+        """Test batch operations translate nested request items."""
+        table.batch_write_item(RequestItems={'test-orders-table': [
+            {'PutRequest': {'Item': {'order_id': f'order-{i}', 'customer_id': 'c'}}} for i in range(3)
+        ]})
+
+        response = table.batch_get_item(RequestItems={'test-orders-table': {
+            'Keys': [{'order_id': 'order-0'}, {'order_id': 'order-2'}]
+        }})
+
+        found = sorted(item['order_id'] for item in response['Responses']['test-orders-table'])
+        assert found == ['order-0', 'order-2']
+        assert response['UnprocessedKeys'] == {}